@@ -0,0 +1,202 @@
+# appConfig/asyncclient.py
+
+import asyncio
+
+from kubernetes.client.exceptions import ApiException
+from kubernetes_asyncio import client as async_client, config as async_config
+from kubernetes_asyncio.client.exceptions import ApiException as AsyncApiException
+
+from appConfig.informers import INFORMER_RESOURCES
+from appConfig.pager import HTTP_STATUS_GONE, _inconsistent_continue_token
+from appConfig.rawjson import RawObject, json_loads
+from appConfig.settings import logger, KUBE_ASYNC_POOL_SIZE, KUBE_INFORMERS_ENABLED, KUBE_LIST_PAGE_SIZE, KUBE_RAW_LISTS
+
+# Raised by the informer/sync path and by the asyncio client respectively; async views catch both.
+API_EXCEPTIONS = (ApiException, AsyncApiException)
+
+
+class AsyncClusterClient:
+    """
+    asyncio counterpart of ClusterClient, backed by one aiohttp connection pool.
+    """
+    def __init__(self, name, api_client):
+        self.name = name
+        self.api_client = api_client
+        self.core_v1 = async_client.CoreV1Api(api_client)
+        self.apps_v1 = async_client.AppsV1Api(api_client)
+        self.custom_api = async_client.CustomObjectsApi(api_client)
+        self.networking_v1 = async_client.NetworkingV1Api(api_client)
+        self.storage_v1 = async_client.StorageV1Api(api_client)
+        self.batch_v1 = async_client.BatchV1Api(api_client)
+
+    async def close(self):
+        """
+        Closes the aiohttp session of the ApiClient.
+        """
+        await self.api_client.close()
+        logger.info(f"Closed async ApiClient for cluster '{self.name}'.")
+
+
+async def create_async_cluster_client(cluster_client):
+    """
+    Builds an AsyncClusterClient from the kubeconfig file of a ClusterClient.
+
+    Args:
+        cluster_client (ClusterClient): The ClusterClient to mirror.
+
+    Returns:
+        AsyncClusterClient: The new client.
+    """
+    configuration = async_client.Configuration()
+    await async_config.load_kube_config(
+        config_file=str(cluster_client.kubeconfig_path),
+        client_configuration=configuration,
+        persist_config=False,
+    )
+    configuration.connection_pool_maxsize = KUBE_ASYNC_POOL_SIZE
+    logger.info(f"Created async ApiClient for cluster '{cluster_client.name}'.")
+    return AsyncClusterClient(cluster_client.name, async_client.ApiClient(configuration))
+
+
+async def get_async_client(cluster_client):
+    """
+    Returns the AsyncClusterClient of a ClusterClient, creating it on first use.
+
+    aiohttp sessions are bound to the event loop that created them, so one client is
+    kept per ClusterClient and event loop (normally just the ASGI server's loop).
+    Concurrent first calls share the same creation task.
+
+    Args:
+        cluster_client (ClusterClient): The ClusterClient selected for the request.
+
+    Returns:
+        AsyncClusterClient: The asyncio client for the same kubeconfig.
+    """
+    loop = asyncio.get_running_loop()
+    task = cluster_client.async_clients.get(loop)
+    if task is None:
+        task = loop.create_task(create_async_cluster_client(cluster_client))
+        cluster_client.async_clients[loop] = task
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        # Do not cache a failed load; the next request retries.
+        if cluster_client.async_clients.get(loop) is task:
+            del cluster_client.async_clients[loop]
+        raise
+
+
+def close_async_clients(cluster_client):
+    """
+    Schedules closing of every AsyncClusterClient of a ClusterClient on its event loop.
+
+    Safe to call from any thread, e.g. when the ClusterClientRegistry evicts a client.
+    """
+    for loop, task in list(cluster_client.async_clients.items()):
+        if loop.is_closed():
+            continue
+
+        async def close(task=task):
+            try:
+                client = await task
+            except Exception:
+                return
+            await client.close()
+
+        asyncio.run_coroutine_threadsafe(close(), loop)
+    cluster_client.async_clients.clear()
+
+
+def get_async_list_function(async_cluster_client, resource_type):
+    """
+    Resolves the cluster-wide list coroutine for a resource type.
+    """
+    api_name, method_name = INFORMER_RESOURCES[resource_type]
+    return getattr(getattr(async_cluster_client, api_name), method_name)
+
+
+async def acall_list(list_func, raw=False, **kwargs):
+    """
+    Async variant of call_list.
+
+    With raw the aiohttp response body is decoded straight into a RawObject.
+    """
+    if not raw:
+        return await list_func(**kwargs)
+    response = await list_func(_preload_content=False, **kwargs)
+    try:
+        body = await response.read()
+    finally:
+        response.release()
+    if not 200 <= response.status <= 299:
+        # The generated client only checks the status when it preloads the content.
+        exception = AsyncApiException(status=response.status, reason=response.reason)
+        exception.body = body.decode('utf-8', 'replace')
+        raise exception
+    return RawObject(json_loads(body))
+
+
+async def aiter_list_pages(list_func, page_size=None, resume_expired=True, raw=False, **kwargs):
+    """
+    Async variant of iter_list_pages: yields limit/continue pages of a list coroutine.
+    """
+    page_size = page_size or KUBE_LIST_PAGE_SIZE
+    continue_token = None
+    while True:
+        try:
+            if continue_token:
+                page = await acall_list(list_func, raw=raw, limit=page_size, _continue=continue_token, **kwargs)
+            else:
+                page = await acall_list(list_func, raw=raw, limit=page_size, **kwargs)
+        except AsyncApiException as e:
+            if e.status != HTTP_STATUS_GONE or not continue_token or not resume_expired:
+                raise
+            continue_token = _inconsistent_continue_token(e)
+            if not continue_token:
+                raise
+            logger.warning("List continue token expired; resuming from the latest snapshot.")
+            continue
+
+        yield page
+
+        continue_token = page.metadata._continue
+        if not continue_token:
+            return
+
+
+async def aiter_list_items(list_func, page_size=None, raw=False, **kwargs):
+    """
+    Async variant of iter_list_items.
+    """
+    async for page in aiter_list_pages(list_func, page_size=page_size, raw=raw, **kwargs):
+        for item in page.items or []:
+            yield item
+
+
+async def alist_cached_items(cluster_client, resource_type, limit=None):
+    """
+    Async variant of list_cached_items.
+
+    A synced informer answers from memory; otherwise the list is paged through the
+    asyncio client, so waiting on a slow apiserver does not hold a worker thread.
+
+    Args:
+        cluster_client (ClusterClient): The ClusterClient instance.
+        resource_type (str): A key of INFORMER_RESOURCES (e.g. 'pods').
+        limit (int): Optional maximum number of objects to return.
+
+    Returns:
+        list: The resource objects.
+
+    Raises:
+        ApiException: If the direct call fails (kubernetes_asyncio's ApiException).
+    """
+    if KUBE_INFORMERS_ENABLED:
+        informer = cluster_client.get_informer(resource_type)
+        if informer.has_synced:
+            return informer.list()[:limit]
+    client = await get_async_client(cluster_client)
+    list_func = get_async_list_function(client, resource_type)
+    if limit:
+        return (await acall_list(list_func, raw=KUBE_RAW_LISTS, limit=limit)).items or []
+    return [item async for item in aiter_list_items(list_func, raw=KUBE_RAW_LISTS)]
@@ -0,0 +1,134 @@
+# appConfig/conditional.py
+
+import hashlib
+import time
+from functools import lru_cache, wraps
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from appConfig.kubeconfig import list_kubeconfigs
+from appConfig.settings import KUBE_CONDITIONAL_GET, KUBE_METRICS_SAMPLER_ENABLED
+from appConfig.utils import get_cluster_client
+
+# ETags change at least this often, so relative ages on a page ("3h", "2 days ago") never freeze.
+ETAG_TIME_BUCKET_SECONDS = 60
+
+
+@lru_cache(maxsize=None)
+def template_version():
+    """
+    Returns a fingerprint of the template files, so ETags change when a deploy changes a page.
+    """
+    digest = hashlib.sha1()
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        for path in sorted(Path(directory).rglob('*.html')):
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    return digest.hexdigest()[:12]
+
+
+def metrics_sample_version(cluster_client):
+    """
+    Version for pages showing pod usage: the number of samples taken by the metrics
+    sampler, or None (no ETag) while usage is fetched per request.
+    """
+    sampler = cluster_client.metrics_sampler if KUBE_METRICS_SAMPLER_ENABLED else None
+    if sampler is None or not sampler.has_fresh_sample:
+        return None
+    return f"metrics={sampler.pods.samples}"
+
+
+def list_etag(request, cluster_client, resource_types, extra_versions=()):
+    """
+    Computes the ETag of a page rendered from cluster-wide lists.
+
+    The ETag covers the cluster, the resourceVersion of every list the page reads, the
+    template version, the URL, the kubeconfig files offered in the cluster selector and
+    the current minute (ETAG_TIME_BUCKET_SECONDS). A list's resourceVersion only advances
+    when an object of that type changes, so the ETag stays the same as long as the
+    rendered page would, apart from the ages shown on it.
+
+    Args:
+        request (HttpRequest): The request.
+        cluster_client (ClusterClient): The selected cluster.
+        resource_types (iterable): INFORMER_RESOURCES keys the page is built from.
+        extra_versions (iterable): Further version strings; a None entry disables the ETag.
+
+    Returns:
+        str: A quoted strong ETag, or None if a list is not served from a running,
+        synced informer (its version is then unknown without listing it).
+    """
+    parts = [
+        cluster_client.kubeconfig_file,
+        template_version(),
+        request.get_full_path(),
+        ','.join(kubeconfig_file.name for kubeconfig_file in list_kubeconfigs()),
+        f"t={int(time.time()) // ETAG_TIME_BUCKET_SECONDS}",
+    ]
+    for resource_type in resource_types:
+        # Only informers that are already running count; a page must not start one by itself.
+        informer = cluster_client.informers.get(resource_type)
+        if informer is None or not informer.has_synced or informer.resource_version is None:
+            return None
+        parts.append(f"{resource_type}={informer.resource_version}")
+    for version in extra_versions:
+        if version is None:
+            return None
+        parts.append(version)
+    digest = hashlib.sha1('\n'.join(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_on_lists(*resource_types, extra_versions=None):
+    """
+    Decorator answering If-None-Match with 304 Not Modified without running the view.
+
+    The ETag is computed by list_etag from the selected cluster and the given lists.
+    Responses carry the ETag and Cache-Control: private, no-cache, so browsers revalidate
+    on every visit and a refresh of an unchanged page costs a 304 instead of a render.
+    Works for sync and async views; without an ETag the view runs as before.
+
+    Args:
+        *resource_types (str): INFORMER_RESOURCES keys the view reads.
+        extra_versions (callable): Optional cluster_client -> version str (or None) for
+            data that is not a list, e.g. metrics_sample_version.
+    """
+    def compute_etag(request):
+        if not KUBE_CONDITIONAL_GET or request.method not in ('GET', 'HEAD'):
+            return None
+        cluster, error = get_cluster_client(request)
+        if error:
+            return None
+        extra = (extra_versions(cluster),) if extra_versions else ()
+        return list_etag(request, cluster, resource_types, extra)
+
+    def finish(response, etag):
+        if etag and response.status_code in (200, 304) and not response.streaming:
+            response.headers.setdefault('ETag', etag)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                # The session and kubeconfig are loaded synchronously, as in aget_cluster_client.
+                etag = await sync_to_async(compute_etag)(request)
+                response = get_conditional_response(request, etag=etag) if etag else None
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return finish(response, etag)
+        else:
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                etag = compute_etag(request)
+                response = get_conditional_response(request, etag=etag) if etag else None
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                return finish(response, etag)
+        return inner
+
+    return decorator
@@ -0,0 +1,67 @@
+# appConfig/fanout.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from appConfig.settings import logger, KUBE_FETCH_MAX_WORKERS, KUBE_FETCH_TIMEOUT
+
+# Shared, bounded pool so concurrent page loads cannot spawn unlimited threads.
+fetch_executor = ThreadPoolExecutor(max_workers=KUBE_FETCH_MAX_WORKERS, thread_name_prefix='kube-fetch')
+
+
+def _timed_call(func, request_timeout):
+    start = time.perf_counter()
+    try:
+        return func(request_timeout), None, time.perf_counter() - start
+    except Exception as e:
+        return None, e, time.perf_counter() - start
+
+
+def fetch_concurrently(fetchers, label, timeout=KUBE_FETCH_TIMEOUT):
+    """
+    Runs independent fetches on the shared pool and collects their results.
+
+    Every section is isolated: a failing or timed-out fetch is logged and replaced by
+    its default, while the other sections are still returned.
+
+    Each callable receives the timeout and must pass it to its apiserver calls (as
+    _request_timeout), so a hung apiserver frees the pool worker instead of holding it.
+    The overall wait is only a backstop for fetches that do not honour it.
+
+    Args:
+        fetchers (dict): Maps a section name to a (callable, default) pair; the callable
+            takes the request timeout in seconds.
+        label (str): Used in log messages, usually the kubeconfig file name.
+        timeout (float): Seconds to wait for all sections before giving up on the rest.
+
+    Returns:
+        dict: Section name to fetched value (or its default).
+        dict: Section name to elapsed time in milliseconds.
+    """
+    futures = {name: fetch_executor.submit(_timed_call, func, timeout) for name, (func, _) in fetchers.items()}
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    timings = {}
+    for name, future in futures.items():
+        default = fetchers[name][1]
+        if not future.done():
+            future.cancel()
+            logger.error(f"Timed out after {timeout}s retrieving {name} for kubeconfig '{label}'.")
+            results[name] = default
+            timings[name] = round(timeout * 1000, 1)
+            continue
+
+        value, error, elapsed = future.result()
+        timings[name] = round(elapsed * 1000, 1)
+        if error is not None:
+            logger.error(f"Failed to retrieve {name} for kubeconfig '{label}': {error}")
+            results[name] = default
+        else:
+            results[name] = value
+
+    logger.info(
+        f"Fetched {len(fetchers)} sections for kubeconfig '{label}': "
+        + ", ".join(f"{name}={ms}ms" for name, ms in timings.items())
+    )
+    return results, timings
@@ -0,0 +1,207 @@
+# appConfig/informers.py
+
+import threading
+
+from kubernetes import watch
+from kubernetes.client.exceptions import ApiException
+
+from appConfig.pager import HTTP_STATUS_GONE, iter_list_pages
+from appConfig.rawjson import RawObject
+from appConfig.settings import logger, KUBE_INFORMER_WATCH_TIMEOUT, KUBE_INFORMER_RETRY_SECONDS
+
+# Maps a resource type to the (API attribute on ClusterClient, cluster-wide list method) pair.
+INFORMER_RESOURCES = {
+    'namespaces': ('core_v1', 'list_namespace'),
+    'nodes': ('core_v1', 'list_node'),
+    'pods': ('core_v1', 'list_pod_for_all_namespaces'),
+    'events': ('core_v1', 'list_event_for_all_namespaces'),
+    'services': ('core_v1', 'list_service_for_all_namespaces'),
+    'configmaps': ('core_v1', 'list_config_map_for_all_namespaces'),
+    'secrets': ('core_v1', 'list_secret_for_all_namespaces'),
+    'persistentvolumes': ('core_v1', 'list_persistent_volume'),
+    'persistentvolumeclaims': ('core_v1', 'list_persistent_volume_claim_for_all_namespaces'),
+    'deployments': ('apps_v1', 'list_deployment_for_all_namespaces'),
+    'daemonsets': ('apps_v1', 'list_daemon_set_for_all_namespaces'),
+    'statefulsets': ('apps_v1', 'list_stateful_set_for_all_namespaces'),
+    'jobs': ('batch_v1', 'list_job_for_all_namespaces'),
+    'cronjobs': ('batch_v1', 'list_cron_job_for_all_namespaces'),
+    'ingresses': ('networking_v1', 'list_ingress_for_all_namespaces'),
+    'networkpolicies': ('networking_v1', 'list_network_policy_for_all_namespaces'),
+    'storageclasses': ('storage_v1', 'list_storage_class'),
+}
+
+CLUSTER_SCOPED_RESOURCES = {'namespaces', 'nodes', 'persistentvolumes', 'storageclasses'}
+
+
+def get_list_function(cluster_client, resource_type):
+    """
+    Resolves the cluster-wide list method for a resource type.
+
+    Args:
+        cluster_client (ClusterClient): The ClusterClient instance.
+        resource_type (str): A key of INFORMER_RESOURCES (e.g. 'pods').
+
+    Returns:
+        callable: The bound list method of the matching API client.
+    """
+    api_name, method_name = INFORMER_RESOURCES[resource_type]
+    return getattr(getattr(cluster_client, api_name), method_name)
+
+
+class Informer:
+    """
+    Keeps an in-memory copy of one resource type of a cluster using list+watch.
+
+    The informer lists the resource once, then watches from the list's resourceVersion,
+    applying ADDED/MODIFIED/DELETED events to its store. BOOKMARK events only advance the
+    resourceVersion. When the apiserver answers 410 Gone the informer relists from scratch.
+    With raw the store holds RawObjects built from the JSON instead of kubernetes models.
+    """
+    def __init__(self, cluster_client, resource_type, raw=False):
+        self.cluster_name = cluster_client.name
+        self.resource_type = resource_type
+        self.raw = raw
+        self.list_func = get_list_function(cluster_client, resource_type)
+        self.resource_version = None
+        self._store = {}
+        self._version = 0  # Bumped on every change of the store, see cached_view
+        self._views = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._watch = None
+        self._thread = None
+
+    @property
+    def has_synced(self):
+        """
+        True once the initial list has populated the store.
+        """
+        return self._synced.is_set()
+
+    def start(self):
+        """
+        Starts the background list+watch thread if it is not already running.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"informer-{self.cluster_name}-{self.resource_type}",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"Started {self.resource_type} informer for cluster '{self.cluster_name}'.")
+
+    def stop(self):
+        """
+        Stops the background thread and ends the current watch.
+        """
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+        logger.info(f"Stopped {self.resource_type} informer for cluster '{self.cluster_name}'.")
+
+    def list(self):
+        """
+        Returns a snapshot of all cached objects.
+        """
+        with self._lock:
+            return list(self._store.values())
+
+    def get(self, name, namespace=None):
+        """
+        Returns a cached object by namespace and name, or None.
+        """
+        with self._lock:
+            return self._store.get((namespace, name))
+
+    def cached_view(self, build):
+        """
+        Returns build(objects) for the current store, rebuilt only after the store changed.
+
+        Lets derived structures (e.g. a PodTable) be built once per informer update and
+        shared by every request instead of being rebuilt per request.
+
+        Args:
+            build (callable): Builds the view from a list of the cached objects.
+        """
+        with self._lock:
+            version = self._version
+            cached = self._views.get(build)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            objects = list(self._store.values())
+        view = build(objects)
+        with self._lock:
+            self._views[build] = (version, view)
+        return view
+
+    @staticmethod
+    def _key(obj):
+        return obj.metadata.namespace, obj.metadata.name
+
+    def _relist(self):
+        # A relist must be one consistent snapshot, so an expired continue token raises 410
+        # (handled in _run by relisting again) instead of resuming from a newer snapshot.
+        store = {}
+        resource_version = None
+        for page in iter_list_pages(self.list_func, resume_expired=False, raw=self.raw):
+            for obj in page.items:
+                store[self._key(obj)] = obj
+            resource_version = page.metadata.resource_version
+        with self._lock:
+            self._store = store
+            self._version += 1
+            self.resource_version = resource_version
+        self._synced.set()
+        logger.info(
+            f"Informer for {self.resource_type} on cluster '{self.cluster_name}' synced "
+            f"{len(store)} objects at resourceVersion {self.resource_version}."
+        )
+
+    def _watch_once(self):
+        self._watch = watch.Watch()
+        stream = self._watch.stream(
+            self.list_func,
+            resource_version=self.resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=KUBE_INFORMER_WATCH_TIMEOUT,
+        )
+        for event in stream:
+            if self._stopped.is_set():
+                break
+            event_type = event['type']
+            if event_type == 'BOOKMARK':
+                self.resource_version = event['raw_object']['metadata']['resourceVersion']
+                continue
+            obj = RawObject(event['raw_object']) if self.raw else event['object']
+            key = self._key(obj)
+            with self._lock:
+                if event_type == 'DELETED':
+                    self._store.pop(key, None)
+                else:
+                    self._store[key] = obj
+                self._version += 1
+                self.resource_version = obj.metadata.resource_version
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch_once()
+            except ApiException as e:
+                if e.status == HTTP_STATUS_GONE:
+                    logger.info(
+                        f"resourceVersion {self.resource_version} for {self.resource_type} on cluster "
+                        f"'{self.cluster_name}' expired; relisting."
+                    )
+                    self.resource_version = None
+                    continue
+                logger.error(f"Informer for {self.resource_type} on cluster '{self.cluster_name}' failed: {e}")
+                self._stopped.wait(KUBE_INFORMER_RETRY_SECONDS)
+            except Exception as e:
+                logger.error(f"Informer for {self.resource_type} on cluster '{self.cluster_name}' failed: {e}")
+                self._stopped.wait(KUBE_INFORMER_RETRY_SECONDS)
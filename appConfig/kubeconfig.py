@@ -1,13 +1,26 @@
 # appConfig/kubeconfig.py
 
-from functools import lru_cache
+import itertools
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from pathlib import Path
 
 import yaml
 from kubernetes import client, config
 from kubernetes.client import Configuration
 
-from appConfig.settings import logger
+from appConfig.asyncclient import close_async_clients
+from appConfig.informers import Informer, get_list_function
+from appConfig.metricshistory import MetricsSampler
+from appConfig.pager import call_list, iter_list_items, iter_list_pages, list_all_pages
+from appConfig.settings import logger, KUBECONFIG_DIR, KUBE_CLIENT_CACHE_SIZE, KUBE_INFORMERS_ENABLED, KUBE_RAW_LISTS
+
+
+# Seconds a retired ClusterClient stays open for requests that already hold it.
+CLIENT_CLOSE_GRACE_SECONDS = 60
 
 
 class ClusterClient:
@@ -16,10 +29,11 @@ class ClusterClient:
     """
     def __init__(
         self, name, kubeconfig_file, core_v1, apps_v1, custom_api,
-        metrics_api, networking_v1, storage_v1, rbac_v1, batch_v1, api_client
+        metrics_api, networking_v1, storage_v1, rbac_v1, batch_v1, api_client, kubeconfig_path=None
     ):
         self.name = name
         self.kubeconfig_file = kubeconfig_file
+        self.kubeconfig_path = kubeconfig_path
         self.core_v1 = core_v1
         self.apps_v1 = apps_v1
         self.custom_api = custom_api
@@ -29,11 +43,116 @@ class ClusterClient:
         self.rbac_v1 = rbac_v1
         self.batch_v1 = batch_v1
         self.api_client = api_client  # Keep reference for closing
+        self.informers = {}
+        self._informers_lock = threading.Lock()
+        self.metrics_sampler = None
+        self.async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncClusterClient task (see asyncclient)
+        self._users = 0  # Long-lived users holding the client (see acquire)
+        self._retired = False
+        self._grace_over = False
+        self._closed = False
+
+    def get_informer(self, resource_type):
+        """
+        Returns the informer for a resource type, starting it on first use.
+
+        Args:
+            resource_type (str): A key of INFORMER_RESOURCES (e.g. 'pods').
+
+        Returns:
+            Informer: The running informer for this cluster and resource type.
+        """
+        with self._informers_lock:
+            informer = self.informers.get(resource_type)
+            if informer is None:
+                informer = Informer(self, resource_type, raw=KUBE_RAW_LISTS)
+                self.informers[resource_type] = informer
+                informer.start()
+            return informer
+
+    def stop_informers(self):
+        """
+        Stops all informers started for this cluster.
+        """
+        with self._informers_lock:
+            for informer in self.informers.values():
+                informer.stop()
+            self.informers.clear()
+
+    def get_metrics_sampler(self):
+        """
+        Returns the metrics history sampler of this cluster, starting it on first use.
+
+        Returns:
+            MetricsSampler: The running sampler.
+        """
+        with self._informers_lock:
+            if self.metrics_sampler is None:
+                self.metrics_sampler = MetricsSampler(self)
+                self.metrics_sampler.start()
+            return self.metrics_sampler
+
+    def acquire(self):
+        """
+        Registers a long-lived user, such as a log stream or a shared watch.
+
+        A client retired by the ClusterClientRegistry stays open until every user has
+        called release.
+        """
+        with self._informers_lock:
+            self._users += 1
+
+    def release(self):
+        """
+        Unregisters a user added by acquire; closes a retired client once it is unused.
+        """
+        with self._informers_lock:
+            self._users -= 1
+            idle = self._retired and self._grace_over and not self._users
+        if idle:
+            # ApiClient.close joins its thread pool; the last user may be on the event loop.
+            threading.Thread(target=self.close, name=f"close-{self.name}", daemon=True).start()
+
+    def retire(self, grace_seconds=None):
+        """
+        Closes the client once it is no longer in use, instead of right away.
+
+        Called when the registry drops the client (reload or eviction). Requests that
+        already hold it get grace_seconds to finish, and users registered with acquire
+        keep it open until they release it.
+
+        Args:
+            grace_seconds (float): Defaults to CLIENT_CLOSE_GRACE_SECONDS.
+        """
+        with self._informers_lock:
+            self._retired = True
+        timer = threading.Timer(CLIENT_CLOSE_GRACE_SECONDS if grace_seconds is None else grace_seconds, self._end_grace)
+        timer.daemon = True
+        timer.start()
+
+    def _end_grace(self):
+        with self._informers_lock:
+            self._grace_over = True
+            idle = not self._users
+        if idle:
+            self.close()
+        else:
+            logger.info(f"Keeping retired ClusterClient for cluster '{self.name}' open for {self._users} users.")
 
     def close(self):
         """
         Closes the underlying ApiClient to release resources.
         """
+        with self._informers_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.stop_informers()
+        with self._informers_lock:
+            if self.metrics_sampler is not None:
+                self.metrics_sampler.stop()
+                self.metrics_sampler = None
+        close_async_clients(self)
         try:
             self.api_client.close()
             logger.info(f"Closed ApiClient for cluster '{self.name}'.")
@@ -41,18 +160,17 @@ class ClusterClient:
             logger.error(f"Error closing ApiClient for cluster '{self.name}': {e}")
 
 
-@lru_cache(maxsize=None)
-def load_and_cache_kubeconfig(kubeconfig_path_str):
+def create_cluster_client(kubeconfig_path):
     """
-    Loads a kubeconfig file and caches the ClusterClient instance.
+    Loads a kubeconfig file and builds a new ClusterClient from it.
 
     Args:
-        kubeconfig_path_str (str): Path to the kubeconfig file as a string.
+        kubeconfig_path (Path | str): Path to the kubeconfig file.
 
     Returns:
-        ClusterClient: An instance of ClusterClient.
+        ClusterClient: An instance of ClusterClient, or None if loading failed.
     """
-    kubeconfig_path = Path(kubeconfig_path_str)
+    kubeconfig_path = Path(kubeconfig_path)
     try:
         with open(kubeconfig_path, 'r') as f:
             config_dict = yaml.safe_load(f)
@@ -81,11 +199,12 @@ def load_and_cache_kubeconfig(kubeconfig_path_str):
                 cluster_name = context.get('context', {}).get('cluster', kubeconfig_path.stem)
                 break
 
-        logger.info(f"Successfully loaded and cached cluster '{cluster_name}' from '{kubeconfig_path.name}'.")
+        logger.info(f"Successfully loaded cluster '{cluster_name}' from '{kubeconfig_path.name}'.")
 
         return ClusterClient(
             name=cluster_name,
             kubeconfig_file=kubeconfig_path.name,
+            kubeconfig_path=kubeconfig_path,
             core_v1=core_v1,
             apps_v1=apps_v1,
             custom_api=custom_api,
@@ -102,6 +221,131 @@ def load_and_cache_kubeconfig(kubeconfig_path_str):
         return None
 
 
+class ClusterClientRegistry:
+    """
+    Caches one ClusterClient per kubeconfig file, bounded and kept in LRU order.
+
+    Entries are keyed by the resolved file path and remember the file's mtime and size.
+    When a kubeconfig changes on disk the stale client is retired and rebuilt on the next
+    lookup. Once more than max_size clients are cached, the least recently used one is
+    retired and evicted. Retired clients are closed, releasing their informers and
+    connection pool, once the requests and streams still using them are done (see
+    ClusterClient.retire). Clients are built outside the registry lock, so a slow or
+    broken kubeconfig does not hold up requests for other clusters.
+    """
+    def __init__(self, max_size=KUBE_CLIENT_CACHE_SIZE):
+        self.max_size = max_size
+        self._clients = OrderedDict()  # path -> (fingerprint, ClusterClient)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _fingerprint(path):
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, kubeconfig_path):
+        """
+        Returns the ClusterClient for a kubeconfig file, loading or reloading it as needed.
+
+        Args:
+            kubeconfig_path (Path | str): Path to the kubeconfig file.
+
+        Returns:
+            ClusterClient: The cached or newly built client, or None if loading failed.
+        """
+        path = Path(kubeconfig_path).resolve()
+        try:
+            fingerprint = self._fingerprint(path)
+        except OSError as e:
+            logger.error(f"Failed to stat kubeconfig '{path}': {e}")
+            self.invalidate(path)
+            return None
+
+        with self._lock:
+            entry = self._clients.get(path)
+            if entry and entry[0] == fingerprint:
+                self._clients.move_to_end(path)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        # Failed loads are not cached, so a fixed file is picked up on the next request.
+        cluster_client = create_cluster_client(path)
+        if cluster_client is None:
+            return None
+
+        retired = []
+        with self._lock:
+            entry = self._clients.get(path)
+            if entry and entry[0] == fingerprint:
+                # Another request loaded the same file meanwhile; keep its client.
+                self._clients.move_to_end(path)
+                cluster_client.close()
+                return entry[1]
+            if entry:
+                logger.info(f"Kubeconfig '{path.name}' changed on disk; reloading its ClusterClient.")
+                self._reloads += 1
+                retired.append(entry[1])
+
+            self._clients[path] = (fingerprint, cluster_client)
+            self._clients.move_to_end(path)
+            while len(self._clients) > self.max_size:
+                evicted_path, (_, evicted_client) = self._clients.popitem(last=False)
+                self._evictions += 1
+                logger.info(f"Evicting ClusterClient for '{evicted_path.name}' from the registry.")
+                retired.append(evicted_client)
+        for stale_client in retired:
+            stale_client.retire()
+        return cluster_client
+
+    def invalidate(self, kubeconfig_path):
+        """
+        Retires and forgets the client of one kubeconfig file, if cached.
+
+        Returns:
+            bool: True if a client was removed.
+        """
+        path = Path(kubeconfig_path).resolve()
+        with self._lock:
+            entry = self._clients.pop(path, None)
+        if entry is None:
+            return False
+        entry[1].retire()
+        return True
+
+    def clear(self):
+        """
+        Closes and forgets every cached client.
+        """
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for _, cluster_client in entries:
+            cluster_client.close()
+
+    def stats(self):
+        """
+        Returns cache counters and the kubeconfig files currently cached.
+        """
+        with self._lock:
+            return {
+                'size': len(self._clients),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'reloads': self._reloads,
+                'evictions': self._evictions,
+                'kubeconfigs': [path.name for path in self._clients],
+            }
+
+
+cluster_clients = ClusterClientRegistry()
+
+
 def load_kubeconfig(kubeconfig_path):
     """
     Interface to fetch cached ClusterClient.
@@ -112,62 +356,197 @@ def load_kubeconfig(kubeconfig_path):
     Returns:
         ClusterClient: An instance of ClusterClient.
     """
-    return load_and_cache_kubeconfig(str(kubeconfig_path))
+    return cluster_clients.get(kubeconfig_path)
 
 
 def close_all_cluster_clients():
     """
     Closes all cached ClusterClient ApiClients. To be called on application shutdown.
     """
-    if hasattr(load_and_cache_kubeconfig, 'cache_info'):
-        cache = getattr(load_and_cache_kubeconfig, 'cache_info')()
-        # Note: lru_cache does not expose the actual cache, so we need a workaround
-        # Alternatively, store references elsewhere if needed
-    # Since accessing the actual cache of lru_cache is not straightforward,
-    # we'll iterate over all cached keys manually
-    # However, lru_cache does not provide a direct way to iterate over cached items
-    # Instead, consider using a custom caching mechanism if this is required
-    # For demonstration, we'll assume only one cached kubeconfig
-    try:
-        cluster_clients = load_and_cache_kubeconfig.cache_info().cache  # This line is incorrect
-    except AttributeError:
-        # lru_cache does not expose the cache directly. Alternative approach:
-        # Use internal attributes (not recommended for production)
-        cluster_clients = getattr(load_and_cache_kubeconfig, 'cache', {}).values()
+    cluster_clients.clear()
+    logger.info("All ClusterClients have been closed and cache cleared.")
 
-    if hasattr(load_and_cache_kubeconfig, 'cache'):
-        for cluster_client in load_and_cache_kubeconfig.cache.values():
-            if cluster_client:
-                cluster_client.close()
-    else:
-        logger.warning("Unable to close ClusterClients: cache structure is not accessible.")
 
-    load_and_cache_kubeconfig.cache_clear()
-    logger.info("All ClusterClients have been closed and cache cleared.")
+KUBECONFIG_SUFFIXES = ('.yaml', '.yml')
+KUBECONFIG_RACY_WINDOW_NS = 2_000_000_000
+
+
+class KubeconfigDirectory:
+    """
+    Caches the kubeconfig files of one directory until the directory changes.
+
+    Each lookup costs a single stat of the directory; the directory is only rescanned
+    when its mtime changes (a file was added, removed or replaced by rename). After a
+    rescan, listeners are called with the files that were modified or removed so they
+    can drop state built from them. In-place edits do not touch the directory mtime;
+    the ClusterClientRegistry catches those by checking each file on lookup.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self._mtime = None
+        self._files = []
+        self._fingerprints = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """
+        Registers callback(changed, removed), called with lists of Paths after a rescan.
+        """
+        self._listeners.append(callback)
+
+    def _scan(self):
+        fingerprints = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.name.endswith(KUBECONFIG_SUFFIXES) and entry.is_file():
+                    stat = entry.stat()
+                    fingerprints[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return fingerprints
+
+    def list(self):
+        """
+        Returns the kubeconfig files of the directory, sorted by name.
+        """
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        with self._lock:
+            if mtime is not None and mtime == self._mtime:
+                return list(self._files)
+
+            if mtime is None or not self.path.is_dir():
+                logger.error(f"The path '{self.path}' is not a directory.")
+                fingerprints = {}
+            else:
+                fingerprints = self._scan()
+                if not fingerprints:
+                    logger.warning(f"No kubeconfig files found in '{self.path}'.")
+
+            previous = self._fingerprints
+            changed = [path for path, fingerprint in fingerprints.items()
+                       if path in previous and previous[path] != fingerprint]
+            removed = [path for path in previous if path not in fingerprints]
+
+            # On filesystems with coarse timestamps a change made in the same tick as this
+            # scan would keep the old mtime, so a freshly modified directory is rescanned again.
+            racy = mtime is not None and time.time_ns() - mtime < KUBECONFIG_RACY_WINDOW_NS
+            self._mtime = None if racy else mtime
+            self._fingerprints = fingerprints
+            self._files = sorted(fingerprints, key=lambda path: path.name)
+            files = list(self._files)
 
+        if changed or removed:
+            logger.info(f"Kubeconfig directory '{self.path}' changed: {len(changed)} modified, {len(removed)} removed.")
+            for callback in self._listeners:
+                try:
+                    callback(changed, removed)
+                except Exception as e:
+                    logger.error(f"Kubeconfig change listener failed: {e}")
+        return files
 
-def list_kubeconfigs(kube_configs_dir="kubeConfigs/"):
+
+def _invalidate_cluster_clients(changed, removed):
+    for path in changed + removed:
+        cluster_clients.invalidate(path)
+
+
+_kubeconfig_directories = {}
+_kubeconfig_directories_lock = threading.Lock()
+
+
+def get_kubeconfig_directory(kube_configs_dir=None):
+    """
+    Returns the shared KubeconfigDirectory for a path (KUBECONFIG_DIR by default).
+
+    Every directory is created with a listener that closes the ClusterClients of
+    modified or removed kubeconfig files.
+    """
+    key = Path(kube_configs_dir or KUBECONFIG_DIR).resolve()
+    with _kubeconfig_directories_lock:
+        directory = _kubeconfig_directories.get(key)
+        if directory is None:
+            directory = KubeconfigDirectory(key)
+            directory.add_listener(_invalidate_cluster_clients)
+            _kubeconfig_directories[key] = directory
+        return directory
+
+
+def list_kubeconfigs(kube_configs_dir=None):
     """
     Lists all kubeconfig files in the specified directory.
 
+    The listing is cached until the directory's mtime changes.
+
     Args:
-        kube_configs_dir (str): Directory containing kubeconfig files.
+        kube_configs_dir (str): Directory containing kubeconfig files; defaults to KUBECONFIG_DIR.
 
     Returns:
         List[Path]: A list of Path objects pointing to kubeconfig files.
     """
-    kube_dir = Path(kube_configs_dir)
+    return get_kubeconfig_directory(kube_configs_dir).list()
+
+
+def list_cached_items(cluster_client, resource_type, limit=None, request_timeout=None):
+    """
+    Lists a resource type across the whole cluster, served from the informer cache.
 
-    if not kube_dir.is_dir():
-        logger.error(f"The path '{kube_configs_dir}' is not a directory.")
-        return []
+    The informer is started on first use. Until its initial list has completed, the
+    request falls back to paginated calls against the apiserver. With KUBE_RAW_LISTS the
+    objects are RawObjects decoded from JSON rather than kubernetes models.
 
-    kubeconfig_files = list(kube_dir.glob("*.yaml")) + list(kube_dir.glob("*.yml"))
+    Args:
+        cluster_client (ClusterClient): The ClusterClient instance.
+        resource_type (str): A key of INFORMER_RESOURCES (e.g. 'pods').
+        limit (int): Optional maximum number of objects to return.
+        request_timeout (float): Optional timeout in seconds for each fallback call.
 
-    if not kubeconfig_files:
-        logger.warning(f"No kubeconfig files found in '{kube_configs_dir}'.")
+    Returns:
+        list: The resource objects (e.g. V1Pod instances).
 
-    return kubeconfig_files
+    Raises:
+        ApiException: If the direct fallback call fails.
+    """
+    if KUBE_INFORMERS_ENABLED:
+        informer = cluster_client.get_informer(resource_type)
+        if informer.has_synced:
+            return informer.list()[:limit]
+    list_func = get_list_function(cluster_client, resource_type)
+    timeout_kwargs = {'_request_timeout': request_timeout} if request_timeout else {}
+    if limit:
+        return call_list(list_func, raw=KUBE_RAW_LISTS, limit=limit, **timeout_kwargs).items
+    return list(iter_list_items(list_func, raw=KUBE_RAW_LISTS, **timeout_kwargs))
+
+
+def iter_cached_items(cluster_client, resource_type, request_timeout=None):
+    """
+    Streams a resource type across the whole cluster, one object at a time.
+
+    Served from the informer cache when it has synced; otherwise the objects are
+    fetched in limit/continue pages so that only one page is held in memory. The first
+    page is requested eagerly so that request errors surface here, not mid-iteration.
+
+    Args:
+        cluster_client (ClusterClient): The ClusterClient instance.
+        resource_type (str): A key of INFORMER_RESOURCES (e.g. 'pods').
+        request_timeout (float): Optional timeout in seconds for each page request.
+
+    Returns:
+        iterable: The resource objects (e.g. V1Pod instances).
+
+    Raises:
+        ApiException: If a paginated fallback call fails.
+    """
+    if KUBE_INFORMERS_ENABLED:
+        informer = cluster_client.get_informer(resource_type)
+        if informer.has_synced:
+            return informer.list()
+    timeout_kwargs = {'_request_timeout': request_timeout} if request_timeout else {}
+    pages = iter_list_pages(get_list_function(cluster_client, resource_type), raw=KUBE_RAW_LISTS, **timeout_kwargs)
+    first_page = next(pages)
+    return itertools.chain(first_page.items, (item for page in pages for item in page.items))
 
 
 # =================== Additional Functionalities ===================
@@ -366,7 +745,7 @@ def list_deployments_for_all_namespaces(cluster_client):
         V1DeploymentList: List of deployments.
     """
     try:
-        deployments = cluster_client.apps_v1.list_deployment_for_all_namespaces()
+        deployments = list_all_pages(cluster_client.apps_v1.list_deployment_for_all_namespaces)
         logger.info(f"Retrieved {len(deployments.items)} deployments across all namespaces.")
         return deployments
     except client.exceptions.ApiException as e:
@@ -452,7 +831,7 @@ def list_config_maps_for_all_namespaces(cluster_client):
         V1ConfigMapList: List of ConfigMaps.
     """
     try:
-        config_maps = cluster_client.core_v1.list_config_map_for_all_namespaces()
+        config_maps = list_all_pages(cluster_client.core_v1.list_config_map_for_all_namespaces)
         logger.info(f"Retrieved {len(config_maps.items)} ConfigMaps across all namespaces.")
         return config_maps
     except client.exceptions.ApiException as e:
@@ -513,7 +892,7 @@ def list_secrets_for_all_namespaces(cluster_client):
         V1SecretList: List of Secrets.
     """
     try:
-        secrets = cluster_client.core_v1.list_secret_for_all_namespaces()
+        secrets = list_all_pages(cluster_client.core_v1.list_secret_for_all_namespaces)
         logger.info(f"Retrieved {len(secrets.items)} Secrets across all namespaces.")
         return secrets
     except client.exceptions.ApiException as e:
@@ -574,7 +953,7 @@ def list_daemon_sets_for_all_namespaces(cluster_client):
         V1DaemonSetList: List of DaemonSets.
     """
     try:
-        daemon_sets = cluster_client.apps_v1.list_daemon_set_for_all_namespaces()
+        daemon_sets = list_all_pages(cluster_client.apps_v1.list_daemon_set_for_all_namespaces)
         logger.info(f"Retrieved {len(daemon_sets.items)} DaemonSets across all namespaces.")
         return daemon_sets
     except client.exceptions.ApiException as e:
@@ -635,7 +1014,7 @@ def list_jobs_for_all_namespaces(cluster_client):
         V1JobList: List of Jobs.
     """
     try:
-        jobs = cluster_client.batch_v1.list_job_for_all_namespaces()
+        jobs = list_all_pages(cluster_client.batch_v1.list_job_for_all_namespaces)
         logger.info(f"Retrieved {len(jobs.items)} Jobs across all namespaces.")
         return jobs
     except client.exceptions.ApiException as e:
@@ -696,7 +1075,7 @@ def list_cron_jobs_for_all_namespaces(cluster_client):
         V1CronJobList: List of CronJobs.
     """
     try:
-        cron_jobs = cluster_client.batch_v1.list_cron_job_for_all_namespaces()
+        cron_jobs = list_all_pages(cluster_client.batch_v1.list_cron_job_for_all_namespaces)
         logger.info(f"Retrieved {len(cron_jobs.items)} CronJobs across all namespaces.")
         return cron_jobs
     except client.exceptions.ApiException as e:
@@ -757,7 +1136,7 @@ def list_network_policies_for_all_namespaces(cluster_client):
         V1NetworkPolicyList: List of NetworkPolicies.
     """
     try:
-        network_policies = cluster_client.networking_v1.list_network_policy_for_all_namespaces()
+        network_policies = list_all_pages(cluster_client.networking_v1.list_network_policy_for_all_namespaces)
         logger.info(f"Retrieved {len(network_policies.items)} NetworkPolicies across all namespaces.")
         return network_policies
     except client.exceptions.ApiException as e:
@@ -0,0 +1,988 @@
+# appConfig/logstream.py
+
+import asyncio
+import heapq
+import math
+import re
+import threading
+import weakref
+import zlib
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+
+from kubernetes_asyncio.client.exceptions import ApiException as AsyncApiException
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+from appConfig.rawjson import json_dumps
+from appConfig.settings import (
+    logger, KUBE_LOG_STREAMS_TOTAL, KUBE_LOG_STREAMS_PER_CLUSTER, KUBE_LOG_STREAMS_PER_SESSION,
+    KUBE_LOG_ADMISSION_QUEUE, KUBE_LOG_ADMISSION_TIMEOUT, KUBE_LOG_READ_CHUNK_SIZE, KUBE_LOG_BATCH_MS,
+    KUBE_LOG_BATCH_BYTES, KUBE_LOG_BUFFER_LINES, KUBE_LOG_VIEWER_QUEUE_LINES, KUBE_LOG_MERGE_WINDOW_MS
+)
+
+# SSE framings a log stream can be requested with (?framing=...).
+LOG_FRAMING_LINES = 'lines'
+LOG_FRAMING_BATCH = 'batch'
+LOG_FRAMINGS = (LOG_FRAMING_LINES, LOG_FRAMING_BATCH)
+
+# Bounds for the per-request batch parameters.
+LOG_BATCH_MAX_MS = 5000
+LOG_BATCH_MIN_BYTES = 1024
+LOG_BATCH_MAX_BYTES = 1024 * 1024
+
+# Characters that make an include/exclude pattern a regular expression rather than plain text.
+_REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+LOG_FILTER_MAX_LENGTH = 1000
+# Regular expressions only search this many characters of a line, which bounds the matching time per line.
+LOG_FILTER_MAX_LINE_CHARACTERS = 8192
+
+# Compression level of log downloads; higher levels cost much more CPU for a few percent.
+_GZIP_LEVEL = 6
+
+# Lines read ahead of the SSE writer; a slow client pauses the upstream read beyond this.
+_BATCH_QUEUE_LINES = 10000
+# Lines read ahead per pod of a merged stream; a pod beyond this is not read until the merge catches up.
+_MERGE_QUEUE_LINES = 1000
+_END_OF_STREAM = object()
+# A shared stream's initial tail has been read once the kubelet sends nothing for this long after
+# its first line, or at the latest after _LOG_TAIL_MAX_SECONDS (an empty log sends no line at all);
+# only later lines are fanned out as live lines.
+_LOG_TAIL_QUIET_SECONDS = 0.2
+_LOG_TAIL_MAX_SECONDS = 1.0
+
+
+class _AdmissionWaiter:
+    __slots__ = ('cluster_key', 'session_key', 'streams', 'future', 'admitted')
+
+    def __init__(self, cluster_key, session_key, streams, future):
+        self.cluster_key = cluster_key
+        self.session_key = session_key
+        self.streams = streams
+        self.future = future
+        self.admitted = False
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(True)
+
+
+class LogStreamAdmission:
+    """
+    Admits log streams within a total, a per-cluster and a per-session quota.
+
+    A request that does not fit waits in a bounded queue for up to timeout seconds
+    instead of being refused at once. Waiters are queued per cluster, and freed slots
+    are handed out round-robin between clusters, so a cluster with many waiting viewers
+    cannot take every slot that frees up. Within a cluster the oldest waiter that fits
+    its session's quota goes first. A quota of 0 disables that limit.
+
+    Callable from any thread and event loop; waiters are woken on their own loop.
+    """
+    def __init__(self, total=KUBE_LOG_STREAMS_TOTAL, per_cluster=KUBE_LOG_STREAMS_PER_CLUSTER,
+                 per_session=KUBE_LOG_STREAMS_PER_SESSION, max_waiting=KUBE_LOG_ADMISSION_QUEUE,
+                 timeout=KUBE_LOG_ADMISSION_TIMEOUT):
+        self.total = total
+        self.per_cluster = per_cluster
+        self.per_session = per_session
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._open = 0
+        self._open_per_cluster = {}
+        self._open_per_session = {}
+        # Cluster key -> deque of waiters, in the round-robin order of the clusters.
+        self._waiting = OrderedDict()
+        self._waiting_count = 0
+        self._lock = threading.Lock()
+
+    def _fits(self, cluster_key, session_key, streams):
+        return (
+            (not self.total or self._open + streams <= self.total)
+            and (not self.per_cluster or self._open_per_cluster.get(cluster_key, 0) + streams <= self.per_cluster)
+            and (not self.per_session or self._open_per_session.get(session_key, 0) + streams <= self.per_session)
+        )
+
+    def _reserve(self, cluster_key, session_key, streams):
+        self._open += streams
+        self._open_per_cluster[cluster_key] = self._open_per_cluster.get(cluster_key, 0) + streams
+        self._open_per_session[session_key] = self._open_per_session.get(session_key, 0) + streams
+
+    def _free(self, cluster_key, session_key, streams):
+        self._open -= streams
+        for counts, key in ((self._open_per_cluster, cluster_key), (self._open_per_session, session_key)):
+            count = counts.get(key, 0) - streams
+            if count > 0:
+                counts[key] = count
+            else:
+                counts.pop(key, None)
+
+    def _dequeue(self, waiter):
+        queue = self._waiting[waiter.cluster_key]
+        queue.remove(waiter)
+        self._waiting_count -= 1
+        if not queue:
+            del self._waiting[waiter.cluster_key]
+
+    def _dispatch(self):
+        # Offer free capacity to one waiter per cluster per round, until a round admits nobody.
+        admitted = True
+        while admitted and self._waiting:
+            admitted = False
+            for cluster_key in list(self._waiting):
+                waiter = next(
+                    (waiter for waiter in self._waiting[cluster_key]
+                     if self._fits(cluster_key, waiter.session_key, waiter.streams)),
+                    None,
+                )
+                if waiter is None:
+                    continue
+                self._dequeue(waiter)
+                self._reserve(cluster_key, waiter.session_key, waiter.streams)
+                waiter.admitted = True
+                waiter.future.get_loop().call_soon_threadsafe(_wake, waiter.future)
+                admitted = True
+                if cluster_key in self._waiting:
+                    # The cluster goes to the back of the rotation.
+                    self._waiting.move_to_end(cluster_key)
+
+    async def admit(self, cluster_key, session_key, streams=1):
+        """
+        Waits until streams slots are free for the cluster and session.
+
+        Args:
+            cluster_key (str): The cluster's kubeconfig file.
+            session_key (str): The viewer's session key.
+            streams (int): Number of upstream streams the request will open.
+
+        Returns:
+            str: Why the request was refused, or None once the slots are reserved.
+        """
+        for limit, scope in ((self.total, 'in total'), (self.per_cluster, 'per cluster'),
+                             (self.per_session, 'per session')):
+            if limit and streams > limit:
+                return f"The request needs {streams} log streams, but only {limit} are allowed {scope}."
+
+        with self._lock:
+            if not self._waiting and self._fits(cluster_key, session_key, streams):
+                self._reserve(cluster_key, session_key, streams)
+                return None
+            if self._waiting_count >= self.max_waiting:
+                logger.warning(f"Log stream admission queue is full ({self.max_waiting} waiting).")
+                return "Too many log streams are waiting to start. Please try again later."
+            waiter = _AdmissionWaiter(cluster_key, session_key, streams, asyncio.get_running_loop().create_future())
+            self._waiting.setdefault(cluster_key, deque()).append(waiter)
+            self._waiting_count += 1
+            self._dispatch()
+
+        try:
+            await asyncio.wait_for(waiter.future, self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                # Unless it was admitted just as the wait ran out
+                if not waiter.admitted:
+                    self._dequeue(waiter)
+                    logger.warning(f"Log stream for '{cluster_key}' gave up after waiting {self.timeout}s.")
+                    return "Timed out waiting for a free log stream slot. Please try again later."
+        except asyncio.CancelledError:
+            # The client went away while waiting; hand on slots it may just have been given.
+            with self._lock:
+                if waiter.admitted:
+                    self._free(cluster_key, session_key, streams)
+                    self._dispatch()
+                else:
+                    self._dequeue(waiter)
+            raise
+        return None
+
+    def release(self, cluster_key, session_key, streams=1):
+        """
+        Frees slots reserved by admit and admits waiting requests that now fit.
+        """
+        if not streams:
+            return
+        with self._lock:
+            self._free(cluster_key, session_key, streams)
+            self._dispatch()
+
+    def stats(self):
+        """
+        Returns the current occupancy: open streams in total, per cluster and per session, and queued requests.
+        """
+        with self._lock:
+            return {
+                'open': self._open,
+                'open_per_cluster': dict(self._open_per_cluster),
+                'sessions': len(self._open_per_session),
+                'max_open_per_session': max(self._open_per_session.values(), default=0),
+                'waiting': self._waiting_count,
+                'waiting_per_cluster': {key: len(queue) for key, queue in self._waiting.items()},
+                'limits': {
+                    'total': self.total,
+                    'per_cluster': self.per_cluster,
+                    'per_session': self.per_session,
+                    'queue': self.max_waiting,
+                    'timeout': self.timeout,
+                },
+            }
+
+
+log_stream_admission = LogStreamAdmission()
+
+
+class LogStreamSlots:
+    """
+    Everything a log stream request holds from admission until its response ends.
+
+    That is the quota slots reserved by log_stream_admission.admit, the cluster client
+    (see ClusterClient.acquire) and the upstream responses or viewers the request opened.
+    release frees all of it exactly once, whichever way the request ends: an error or a
+    cancellation while opening, the finally of the streaming generator, or garbage
+    collection of a generator that was never iterated because the client left first
+    (see bind).
+    """
+    def __init__(self, cluster_client, cluster_key, session_key, streams=1):
+        self.cluster_key = cluster_key
+        self.session_key = session_key
+        self.streams = streams
+        self._cluster_client = cluster_client
+        self._resources = []
+        self._released = False
+        cluster_client.acquire()
+
+    def hold(self, resource):
+        """
+        Closes resource (anything with a close method) on release.
+
+        Returns:
+            The resource.
+        """
+        self._resources.append(resource)
+        return resource
+
+    def give_back(self, streams):
+        """
+        Frees slots the request turned out not to need, e.g. for pods whose stream failed to open.
+        """
+        streams = min(streams, self.streams)
+        self.streams -= streams
+        log_stream_admission.release(self.cluster_key, self.session_key, streams)
+
+    def bind(self, stream):
+        """
+        Releases everything when the streaming generator is collected, in case it never runs.
+
+        Returns:
+            The generator.
+        """
+        weakref.finalize(stream, self.release)
+        return stream
+
+    def release(self):
+        """
+        Closes the held resources and frees the slots and the cluster client; later calls do nothing.
+        """
+        if self._released:
+            return
+        self._released = True
+        for resource in self._resources:
+            try:
+                resource.close()
+            except Exception as e:
+                logger.error(f"Error closing log stream of '{self.cluster_key}': {e}")
+        log_stream_admission.release(self.cluster_key, self.session_key, self.streams)
+        self._cluster_client.release()
+
+
+async def raise_for_stream_status(response):
+    """
+    Raises ApiException for an error answer to a call made with _preload_content=False.
+
+    The generated asyncio client only checks the status when it reads the body itself.
+    """
+    if 200 <= response.status <= 299:
+        return
+    try:
+        body = await response.read()
+    finally:
+        response.release()
+    exception = AsyncApiException(status=response.status, reason=response.reason)
+    exception.body = body.decode('utf-8', 'replace')
+    raise exception
+
+
+async def open_pod_log(async_cluster, namespace, pod_name, container_name, follow=True, **options):
+    """
+    Opens a streaming read of a container's log, following it by default.
+
+    Args:
+        async_cluster (AsyncClusterClient): The asyncio client of the cluster.
+        follow (bool): Keep the stream open for new lines.
+        **options: Further read_namespaced_pod_log arguments (tail_lines, timestamps, previous, ...).
+
+    Returns:
+        aiohttp.ClientResponse: The open response; the caller closes it.
+
+    Raises:
+        ApiException: If the kubelet or apiserver refuses the request.
+    """
+    response = await async_cluster.core_v1.read_namespaced_pod_log(
+        name=pod_name,
+        namespace=namespace,
+        container=container_name,
+        follow=follow,
+        _preload_content=False,
+        **options,
+    )
+    await raise_for_stream_status(response)
+    return response
+
+
+async def iter_log_lines(response, chunk_size=KUBE_LOG_READ_CHUNK_SIZE):
+    """
+    Yields decoded lines from a streaming pod log response.
+
+    Reads whatever the kubelet has sent so far instead of waiting for full lines, so
+    arbitrarily long lines do not hit aiohttp's line length limit.
+
+    Args:
+        response (aiohttp.ClientResponse): read_namespaced_pod_log(_preload_content=False).
+        chunk_size (int): Maximum bytes read at once.
+
+    Yields:
+        str: One log line without its trailing newline.
+    """
+    pending = b''
+    async for chunk in response.content.iter_chunked(chunk_size):
+        pending += chunk
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            yield line.decode('utf-8', 'replace').rstrip()
+    if pending:
+        yield pending.decode('utf-8', 'replace').rstrip()
+
+
+async def batch_lines(lines, max_delay, max_bytes):
+    """
+    Coalesces an async stream of lines into lists.
+
+    A batch is emitted once it holds max_bytes of text or max_delay seconds after its
+    first line arrived, whichever comes first, so a quiet stream still shows every line
+    promptly while a chatty one is sent in a few large writes. Lines are read by a
+    separate task so that the time window can expire while a read is pending.
+
+    Args:
+        lines (async iterable): The log lines.
+        max_delay (float): Seconds a line may wait for more lines.
+        max_bytes (int): Characters after which a batch is emitted immediately.
+
+    Yields:
+        list: Consecutive lines, never empty.
+    """
+    queue = asyncio.Queue(maxsize=_BATCH_QUEUE_LINES)
+
+    async def read_lines():
+        try:
+            async for line in lines:
+                await queue.put(line)
+            await queue.put(_END_OF_STREAM)
+        except Exception as e:
+            await queue.put(e)
+
+    reader = asyncio.create_task(read_lines())
+    loop = asyncio.get_running_loop()
+    batch, size, deadline = [], 0, None
+    try:
+        while True:
+            if not queue.empty():
+                # Lines already read are taken without waiting, so a busy stream costs no timers.
+                item = queue.get_nowait()
+            elif deadline is None:
+                item = await queue.get()
+            else:
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    yield batch
+                    batch, size, deadline = [], 0, None
+                    continue
+
+            if item is _END_OF_STREAM:
+                break
+            if isinstance(item, Exception):
+                if batch:
+                    yield batch
+                raise item
+
+            batch.append(item)
+            size += len(item)
+            if deadline is None:
+                deadline = loop.time() + max_delay
+            if size >= max_bytes:
+                yield batch
+                batch, size, deadline = [], 0, None
+        if batch:
+            yield batch
+    finally:
+        reader.cancel()
+
+
+def sse_event(data, event=None):
+    """
+    Formats one Server-Sent Event with a JSON payload.
+    """
+    if event:
+        return f"event: {event}\ndata: {json_dumps(data)}\n\n"
+    return f"data: {json_dumps(data)}\n\n"
+
+
+def parse_log_framing(query_params):
+    """
+    Reads the framing, batch_ms and batch_bytes parameters of a log stream request.
+
+    Returns:
+        tuple: (framing, max_delay in seconds, max_bytes).
+
+    Raises:
+        ValueError: If a parameter is invalid.
+    """
+    framing = query_params.get('framing', LOG_FRAMING_LINES)
+    if framing not in LOG_FRAMINGS:
+        raise ValueError(f"framing must be one of {', '.join(LOG_FRAMINGS)}.")
+    batch_ms = int(query_params.get('batch_ms', KUBE_LOG_BATCH_MS))
+    batch_bytes = int(query_params.get('batch_bytes', KUBE_LOG_BATCH_BYTES))
+    if not 0 <= batch_ms <= LOG_BATCH_MAX_MS:
+        raise ValueError(f"batch_ms must be between 0 and {LOG_BATCH_MAX_MS}.")
+    if not LOG_BATCH_MIN_BYTES <= batch_bytes <= LOG_BATCH_MAX_BYTES:
+        raise ValueError(f"batch_bytes must be between {LOG_BATCH_MIN_BYTES} and {LOG_BATCH_MAX_BYTES}.")
+    return framing, batch_ms / 1000, batch_bytes
+
+
+async def gzip_log_chunks(response, chunk_size=KUBE_LOG_READ_CHUNK_SIZE, level=_GZIP_LEVEL):
+    """
+    Yields a log response body gzip-compressed, one chunk at a time.
+
+    Memory use does not depend on the size of the log. zlib releases the GIL, so each
+    chunk is compressed in a worker thread to keep the event loop free for other streams.
+
+    Args:
+        response (aiohttp.ClientResponse): read_namespaced_pod_log(_preload_content=False).
+        chunk_size (int): Maximum bytes read at once.
+        level (int): zlib compression level.
+
+    Yields:
+        bytes: Parts of a gzip file.
+    """
+    # wbits=31 writes a gzip header and trailer around the deflate stream.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in response.content.iter_chunked(chunk_size):
+        data = await asyncio.to_thread(compressor.compress, chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _backtracks_exponentially(parsed, in_repeat=False):
+    # Variable repeats inside repeats ((a+)+, (a?a?)*), alternations inside repeats ((a|aa)+) and
+    # backreferences can take exponential time on a non-matching line; such patterns are
+    # refused rather than run on the event loop.
+    for opcode, argument in parsed:
+        if opcode in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            minimum, maximum, items = argument
+            if in_repeat and minimum != maximum:
+                return True
+            if _backtracks_exponentially(items, in_repeat or maximum > 1):
+                return True
+        elif opcode in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+            return True
+        elif opcode == sre_constants.SUBPATTERN:
+            if _backtracks_exponentially(argument[-1], in_repeat):
+                return True
+        elif opcode == sre_constants.BRANCH:
+            if in_repeat or any(_backtracks_exponentially(items) for items in argument[1]):
+                return True
+        elif opcode in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            if _backtracks_exponentially(argument[1], in_repeat):
+                return True
+    return False
+
+
+def _line_matcher(pattern, fixed_strings):
+    if fixed_strings or not _REGEX_SPECIAL_CHARACTERS.intersection(pattern):
+        # Plain text is matched with a substring test, several times faster than a regex search.
+        return lambda line: pattern in line
+    if _backtracks_exponentially(sre_parse.parse(pattern)):
+        raise re.error("nested repeats, repeated alternations and backreferences are not supported")
+    search = re.compile(pattern).search
+    return lambda line: search(line, 0, LOG_FILTER_MAX_LINE_CHARACTERS)
+
+
+def compile_log_filter(include=None, exclude=None, fixed_strings=False):
+    """
+    Builds a predicate keeping lines that match include and do not match exclude.
+
+    Filters run on the event loop that serves every log stream, so regular expressions
+    that can backtrack exponentially (nested repeats such as (a+)+, alternations inside a
+    repeat, backreferences) are refused, and a regular expression only searches the first
+    LOG_FILTER_MAX_LINE_CHARACTERS characters of a line. Plain text has no such limits.
+
+    Args:
+        include (str): Regular expression (or text) a line must contain, or None.
+        exclude (str): Regular expression (or text) a line must not contain, or None.
+        fixed_strings (bool): Treat both patterns as plain text.
+
+    Returns:
+        callable: line -> bool, or None if nothing is filtered.
+
+    Raises:
+        re.error: If a pattern is not a valid regular expression or is refused.
+    """
+    include_match = _line_matcher(include, fixed_strings) if include else None
+    exclude_match = _line_matcher(exclude, fixed_strings) if exclude else None
+    if include_match and exclude_match:
+        return lambda line: bool(include_match(line)) and not exclude_match(line)
+    if exclude_match:
+        return lambda line: not exclude_match(line)
+    return include_match
+
+
+def parse_log_filter(query_params):
+    """
+    Reads the include, exclude and match (regex or fixed) parameters of a log stream request.
+
+    Returns:
+        callable: The predicate from compile_log_filter, or None.
+
+    Raises:
+        ValueError: If a parameter is invalid.
+    """
+    include = query_params.get('include') or None
+    exclude = query_params.get('exclude') or None
+    match = query_params.get('match', 'regex')
+    if match not in ('regex', 'fixed'):
+        raise ValueError("match must be regex or fixed.")
+    if max(len(include or ''), len(exclude or '')) > LOG_FILTER_MAX_LENGTH:
+        raise ValueError(f"include and exclude may have at most {LOG_FILTER_MAX_LENGTH} characters.")
+    try:
+        return compile_log_filter(include, exclude, fixed_strings=match == 'fixed')
+    except re.error as e:
+        raise ValueError(f"invalid regular expression: {e}")
+
+
+def parse_log_window(query_params):
+    """
+    Reads the since_seconds, since_time and limit_bytes parameters of a log stream request.
+
+    The log API of the generated client has no sinceTime argument, so since_time
+    (RFC 3339, UTC if no offset is given) is sent as the equivalent since_seconds.
+
+    Returns:
+        dict: read_namespaced_pod_log arguments, empty if none were given.
+
+    Raises:
+        ValueError: If a parameter is invalid.
+    """
+    options = {}
+    since_seconds = query_params.get('since_seconds')
+    since_time = query_params.get('since_time')
+    limit_bytes = query_params.get('limit_bytes')
+    if since_seconds and since_time:
+        raise ValueError("pass either since_seconds or since_time, not both.")
+    if since_seconds:
+        options['since_seconds'] = int(since_seconds)
+        if options['since_seconds'] < 1:
+            raise ValueError("since_seconds must be a positive integer.")
+    if since_time:
+        since = datetime.fromisoformat(since_time.replace('Z', '+00:00'))
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        options['since_seconds'] = max(math.ceil((datetime.now(timezone.utc) - since).total_seconds()), 1)
+    if limit_bytes:
+        options['limit_bytes'] = int(limit_bytes)
+        if options['limit_bytes'] < 1:
+            raise ValueError("limit_bytes must be a positive integer.")
+    return options
+
+
+async def filter_log_lines(lines, line_filter):
+    """
+    Yields the lines for which line_filter returns true.
+    """
+    async for line in lines:
+        if line_filter(line):
+            yield line
+
+
+async def frame_log_lines(lines, framing=LOG_FRAMING_LINES, max_delay=None, max_bytes=None):
+    """
+    Turns log lines into SSE messages.
+
+    With the 'lines' framing every line is its own message ({'log': line}); with 'batch'
+    lines are coalesced by batch_lines and sent as 'logs' events ({'logs': [lines]}).
+    """
+    if framing == LOG_FRAMING_BATCH:
+        max_delay = KUBE_LOG_BATCH_MS / 1000 if max_delay is None else max_delay
+        max_bytes = max_bytes or KUBE_LOG_BATCH_BYTES
+        async for batch in batch_lines(lines, max_delay, max_bytes):
+            yield sse_event({'logs': batch}, event='logs')
+    else:
+        async for line in lines:
+            yield sse_event({'log': line})
+
+
+def _split_timestamp(line):
+    # Lines requested with timestamps=True start with an RFC 3339 UTC timestamp whose
+    # fraction has its trailing zeros removed; padding it makes the keys sort as strings.
+    timestamp, _, message = line.partition(' ')
+    seconds, _, fraction = timestamp.rstrip('Z').partition('.')
+    return f"{seconds}.{fraction:0<9}", message
+
+
+async def merge_log_streams(streams, window=KUBE_LOG_MERGE_WINDOW_MS / 1000):
+    """
+    Merges the timestamped log lines of several pods into one time-ordered stream.
+
+    Each pod is read by its own task into a bounded queue, and a heap holds at most one
+    line per pod, so the oldest line is always sent first and a noisy pod only gets ahead
+    of the others by the size of its queue; beyond that its connection is not read until
+    the merge catches up. A line is sent once every other pod has a newer line pending or
+    after it waited window seconds, so a quiet pod does not hold back the rest.
+
+    Args:
+        streams (dict): Pod name -> async iterable of lines read with timestamps=True.
+        window (float): Seconds a line may wait for lines of other pods.
+
+    Yields:
+        str: '[pod] message', with the timestamp removed.
+    """
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+    queues = {name: asyncio.Queue(maxsize=_MERGE_QUEUE_LINES) for name in streams}
+
+    async def read_lines(name, lines):
+        queue = queues[name]
+        try:
+            async for line in lines:
+                await queue.put((loop.time(), line))
+                ready.set()
+            await queue.put(_END_OF_STREAM)
+        except Exception as e:
+            await queue.put(e)
+        ready.set()
+
+    readers = [asyncio.create_task(read_lines(name, lines)) for name, lines in streams.items()]
+    # Pods that are still streaming and have no line in the heap.
+    waiting = set(streams)
+    heap, sequence = [], 0
+    try:
+        while waiting or heap:
+            ready.clear()
+            for name in [name for name in waiting if not queues[name].empty()]:
+                waiting.discard(name)
+                item = queues[name].get_nowait()
+                if item is _END_OF_STREAM:
+                    continue
+                if isinstance(item, Exception):
+                    logger.error(f"Log stream of pod '{name}' failed: {item}")
+                    yield f"[{name}] Error streaming logs: {item}"
+                    continue
+                received, line = item
+                key, message = _split_timestamp(line)
+                heapq.heappush(heap, (key, sequence, received, name, message))
+                sequence += 1
+
+            if heap and (not waiting or heap[0][2] + window <= loop.time()):
+                _, _, _, name, message = heapq.heappop(heap)
+                waiting.add(name)
+                yield f"[{name}] {message}"
+                continue
+            if not waiting:
+                # Every pod has ended and the heap is empty.
+                break
+
+            timeout = heap[0][2] + window - loop.time() if heap else None
+            try:
+                await asyncio.wait_for(ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        for reader in readers:
+            reader.cancel()
+
+
+class LogViewerOverflow(Exception):
+    """
+    Raised to a viewer that fell more than KUBE_LOG_VIEWER_QUEUE_LINES lines behind.
+    """
+
+
+class LogBroadcaster:
+    """
+    One upstream follow stream of a container's log, shared by every viewer.
+
+    Lines read from the kubelet are appended to a bounded ring buffer and handed to
+    each viewer's queue. A new viewer first gets the buffered lines replayed (the last
+    tail_lines of them) and then the live lines, without a new upstream request. The
+    upstream stream is closed when the last viewer leaves; viewers that cannot keep up
+    are disconnected instead of growing their queue without bound.
+
+    The upstream request asks for the last KUBE_LOG_BUFFER_LINES lines, which arrive in
+    a burst. They are only buffered, and viewers that join meanwhile wait for them, so
+    that the tail is replayed to them like to any later viewer rather than sent as live
+    lines.
+    """
+    def __init__(self, key, cluster_client, response, on_close):
+        self.key = key
+        self.buffer = deque(maxlen=KUBE_LOG_BUFFER_LINES)
+        self.viewers = set()
+        self.tail_read = asyncio.Event()
+        self._cluster_client = cluster_client
+        self._response = response
+        self._on_close = on_close
+        self._closed = False
+        self._waiting_for_tail = []  # Followers registered before the initial tail was read
+        # The upstream connection belongs to the cluster's client, which must stay open until it is closed.
+        cluster_client.acquire()
+        loop = asyncio.get_running_loop()
+        self._opened_at = loop.time()
+        self._last_read_at = None
+        loop.call_later(_LOG_TAIL_QUIET_SECONDS, self._check_tail)
+        self._task = loop.create_task(self._read())
+
+    def _publish(self, item):
+        for queue in list(self.viewers):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.viewers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(LogViewerOverflow("Log viewer fell behind; reconnect to continue."))
+
+    async def _read(self):
+        try:
+            async for line in iter_log_lines(self._response):
+                self.buffer.append(line)
+                if self.tail_read.is_set():
+                    self._publish(line)
+                elif len(self.buffer) == self.buffer.maxlen:
+                    self._end_tail()
+                else:
+                    self._last_read_at = asyncio.get_running_loop().time()
+            self._publish(_END_OF_STREAM)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Log stream {self.key[1:]} failed: {e}")
+            self._publish(e)
+        finally:
+            self.close()
+
+    def _check_tail(self):
+        if self.tail_read.is_set():
+            return
+        now = asyncio.get_running_loop().time()
+        quiet = 0 if self._last_read_at is None else now - self._last_read_at
+        if quiet >= _LOG_TAIL_QUIET_SECONDS or now - self._opened_at >= _LOG_TAIL_MAX_SECONDS:
+            self._end_tail()
+        else:
+            asyncio.get_running_loop().call_later(_LOG_TAIL_QUIET_SECONDS - quiet, self._check_tail)
+
+    def _end_tail(self):
+        """
+        Hands the buffered tail to the waiting followers; lines read from now on are live.
+        """
+        if self.tail_read.is_set():
+            return
+        self.tail_read.set()
+        for follower in self._waiting_for_tail:
+            follower._start_replay()
+        self._waiting_for_tail.clear()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def follow(self, tail_lines=None):
+        """
+        Registers a viewer, which gets the last tail_lines buffered lines, then every new line.
+
+        The viewer counts from this call on, not from its first read, so the stream stays
+        open for a viewer that has not started reading yet.
+
+        Returns:
+            LogFollower: The viewer; the caller must close it.
+        """
+        return LogFollower(self, tail_lines)
+
+    def _remove_viewer(self, queue):
+        self.viewers.discard(queue)
+        if not self.viewers:
+            self.close()
+
+    def close(self):
+        """
+        Stops reading and closes the upstream response.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._end_tail()
+        if not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._response.close()
+        self._cluster_client.release()
+        self._on_close(self)
+
+
+class LogFollower:
+    """
+    One viewer of a LogBroadcaster, iterated for its replayed and live lines.
+
+    Iteration ends when the upstream stream ends. close (or aclose) unregisters the
+    viewer, whether or not it was ever iterated, and closes the broadcaster when it was
+    the last one.
+    """
+    def __init__(self, broadcaster, tail_lines=None):
+        self._broadcaster = broadcaster
+        self._queue = asyncio.Queue(maxsize=KUBE_LOG_VIEWER_QUEUE_LINES)
+        self._tail_lines = tail_lines
+        self._replay = None  # Set once the broadcaster has read its initial tail
+        self._closed = False
+        if broadcaster.closed:
+            self._queue.put_nowait(_END_OF_STREAM)
+        broadcaster.viewers.add(self._queue)
+        if broadcaster.tail_read.is_set():
+            self._start_replay()
+        else:
+            broadcaster._waiting_for_tail.append(self)
+
+    def _start_replay(self):
+        if self._closed:
+            return
+        replay = list(self._broadcaster.buffer)
+        if self._tail_lines is not None:
+            replay = replay[-self._tail_lines:] if self._tail_lines else []
+        self._replay = deque(replay)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._replay is None and not self._closed:
+            await self._broadcaster.tail_read.wait()
+        if self._replay:
+            return self._replay.popleft()
+        if self._closed:
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        if item is _END_OF_STREAM:
+            self.close()
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            self.close()
+            raise item
+        return item
+
+    def close(self):
+        """
+        Unregisters the viewer.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._replay = deque()
+        self._broadcaster._remove_viewer(self._queue)
+
+    async def aclose(self):
+        self.close()
+
+
+class LogBroadcasterRegistry:
+    """
+    Shares LogBroadcasters per (cluster, namespace, pod, container).
+
+    Broadcasters are bound to the event loop that opened them, so the loop is part of
+    the key. Concurrent first viewers wait for the same upstream request.
+    """
+    def __init__(self):
+        self._broadcasters = {}
+        self._waiting = {}  # Upstream request -> viewers waiting for it
+
+    async def open(self, cluster_client, async_cluster, namespace, pod_name, container_name, tail_lines=None):
+        """
+        Follows a container's log through its broadcaster, opening the upstream stream if needed.
+
+        The viewer is registered before this returns (see LogBroadcaster.follow), so
+        another viewer leaving meanwhile cannot close the stream under it.
+
+        Returns:
+            LogFollower: The registered viewer; the caller must close it.
+
+        Raises:
+            ApiException: If the upstream request fails (nothing is cached then).
+        """
+        key = (asyncio.get_running_loop(), cluster_client.kubeconfig_file, namespace, pod_name, container_name)
+        while True:
+            entry = self._broadcasters.get(key)
+            if entry is None:
+                entry = asyncio.ensure_future(
+                    self._start(key, cluster_client, async_cluster, namespace, pod_name, container_name)
+                )
+                self._broadcasters[key] = entry
+            self._waiting[entry] = self._waiting.get(entry, 0) + 1
+            try:
+                broadcaster = await asyncio.shield(entry)
+            except asyncio.CancelledError:
+                if not self._waiting[entry] - 1:
+                    # Nobody is left to follow the stream being opened; close it once it is open.
+                    entry.add_done_callback(self._close_unwatched)
+                raise
+            except Exception:
+                if self._broadcasters.get(key) is entry:
+                    del self._broadcasters[key]
+                raise
+            finally:
+                self._waiting[entry] -= 1
+                if not self._waiting[entry]:
+                    del self._waiting[entry]
+            # The last viewer may have closed it while this request waited; then open a new one.
+            if not broadcaster.closed:
+                return broadcaster.follow(tail_lines)
+
+    async def _start(self, key, cluster_client, async_cluster, namespace, pod_name, container_name):
+        response = await open_pod_log(
+            async_cluster, namespace, pod_name, container_name, tail_lines=KUBE_LOG_BUFFER_LINES
+        )
+        logger.info(f"Opened shared log stream for {key[1:]}.")
+        return LogBroadcaster(key, cluster_client, response, self._remove)
+
+    @staticmethod
+    def _started(entry):
+        if entry.done() and not entry.cancelled() and entry.exception() is None:
+            return entry.result()
+        return None
+
+    def _close_unwatched(self, entry):
+        broadcaster = self._started(entry)
+        if broadcaster is not None and not broadcaster.viewers and entry not in self._waiting:
+            broadcaster.close()
+
+    def _remove(self, broadcaster):
+        entry = self._broadcasters.get(broadcaster.key)
+        if entry is not None and self._started(entry) is broadcaster:
+            del self._broadcasters[broadcaster.key]
+            logger.info(f"Closed shared log stream for {broadcaster.key[1:]}.")
+
+    def stats(self):
+        """
+        Returns the number of viewers per shared log stream.
+        """
+        started = [(key, self._started(entry)) for key, entry in list(self._broadcasters.items())]
+        return {key[1:]: len(broadcaster.viewers) for key, broadcaster in started if broadcaster}
+
+
+log_broadcasters = LogBroadcasterRegistry()
@@ -0,0 +1,122 @@
+# appConfig/metadata.py
+
+import inspect
+
+from appConfig.informers import get_list_function
+from appConfig.pager import iter_list_items
+
+# Asks the apiserver for metadata only (no spec, status or data) of every listed object.
+PARTIAL_OBJECT_METADATA_LIST = 'application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1'
+
+# Cluster-wide list paths, used with clients whose list methods cannot override the Accept header.
+METADATA_LIST_PATHS = {
+    'namespaces': '/api/v1/namespaces',
+    'nodes': '/api/v1/nodes',
+    'pods': '/api/v1/pods',
+    'events': '/api/v1/events',
+    'services': '/api/v1/services',
+    'configmaps': '/api/v1/configmaps',
+    'secrets': '/api/v1/secrets',
+    'persistentvolumes': '/api/v1/persistentvolumes',
+    'persistentvolumeclaims': '/api/v1/persistentvolumeclaims',
+    'deployments': '/apis/apps/v1/deployments',
+    'daemonsets': '/apis/apps/v1/daemonsets',
+    'statefulsets': '/apis/apps/v1/statefulsets',
+    'jobs': '/apis/batch/v1/jobs',
+    'cronjobs': '/apis/batch/v1/cronjobs',
+    'ingresses': '/apis/networking.k8s.io/v1/ingresses',
+    'networkpolicies': '/apis/networking.k8s.io/v1/networkpolicies',
+    'storageclasses': '/apis/storage.k8s.io/v1/storageclasses',
+}
+
+
+def get_metadata_list_function(cluster_client, resource_type):
+    """
+    Returns a list callable that fetches PartialObjectMetadataList pages.
+
+    The callable takes the same limit/_continue/_preload_content/_request_timeout
+    arguments as the generated list methods, so it can be paged with
+    iter_list_pages(raw=True).
+
+    Args:
+        cluster_client (ClusterClient): The ClusterClient instance.
+        resource_type (str): A key of METADATA_LIST_PATHS (e.g. 'configmaps').
+
+    Returns:
+        callable: The metadata list function.
+    """
+    list_func = get_list_function(cluster_client, resource_type)
+    headers = {'Accept': PARTIAL_OBJECT_METADATA_LIST}
+
+    if '_headers' in inspect.signature(list_func).parameters:
+        def list_metadata(**kwargs):
+            return list_func(_headers=headers, **kwargs)
+        return list_metadata
+
+    # Older clients fix the Accept header inside each list method, so the call is made directly.
+    resource_path = METADATA_LIST_PATHS[resource_type]
+
+    def list_metadata(_preload_content=True, _continue=None, _request_timeout=None, **kwargs):
+        query_params = [(key, value) for key, value in kwargs.items() if value is not None]
+        if _continue:
+            query_params.append(('continue', _continue))
+        return cluster_client.api_client.call_api(
+            resource_path, 'GET',
+            query_params=query_params,
+            header_params=dict(headers),
+            response_type=None,
+            auth_settings=['BearerToken'],
+            _return_http_data_only=True,
+            _preload_content=_preload_content,
+            _request_timeout=_request_timeout,
+        )
+    return list_metadata
+
+
+def list_object_metadata(cluster_client, resource_type, page_size=None, request_timeout=None):
+    """
+    Lists only the metadata of a resource type across the whole cluster.
+
+    Use this where a view shows names, namespaces and ages but not the objects' bodies;
+    for ConfigMaps and Secrets the transfer shrinks from the full data to a few hundred
+    bytes per object. The objects are RawObjects with a metadata attribute.
+
+    Args:
+        cluster_client (ClusterClient): The ClusterClient instance.
+        resource_type (str): A key of METADATA_LIST_PATHS (e.g. 'configmaps').
+        page_size (int): Objects per request; defaults to KUBE_LIST_PAGE_SIZE.
+        request_timeout (float): Optional timeout in seconds for each request.
+
+    Returns:
+        list: One PartialObjectMetadata RawObject per object.
+
+    Raises:
+        ApiException: If a list call fails.
+    """
+    list_func = get_metadata_list_function(cluster_client, resource_type)
+    timeout_kwargs = {'_request_timeout': request_timeout} if request_timeout else {}
+    return list(iter_list_items(list_func, page_size=page_size, raw=True, **timeout_kwargs))
+
+
+def count_managed_keys(metadata, field='f:data'):
+    """
+    Counts the keys of a map field (e.g. a ConfigMap's data) from managedFields.
+
+    Every field manager records the keys it set, so the union over all managers
+    gives the key count without downloading the values.
+
+    Args:
+        metadata: Object metadata with managed_fields (model or RawObject).
+        field (str): The managed field set to count, e.g. 'f:data' or 'f:binaryData'.
+
+    Returns:
+        int: The number of keys, or None if the object carries no managedFields.
+    """
+    managed_fields = metadata.managed_fields
+    if not managed_fields:
+        return None
+    keys = set()
+    for entry in managed_fields:
+        fields = entry.fields_v1 or {}
+        keys.update(key for key in (fields.get(field) or {}) if key.startswith('f:'))
+    return len(keys)
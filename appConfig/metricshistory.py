@@ -0,0 +1,270 @@
+# appConfig/metricshistory.py
+
+import sys
+import threading
+import time
+
+import numpy as np
+from kubernetes.client.exceptions import ApiException
+
+from appConfig.quantity import TO_MILLICORES, TO_MIB, parse_quantities, sum_quantities_by
+from appConfig.settings import (
+    logger, KUBE_METRICS_HISTORY_POINTS, KUBE_METRICS_SAMPLE_SECONDS, KUBE_METRICS_SAMPLER_ENABLED
+)
+
+_INITIAL_ROWS = 256
+# A sample older than this many intervals is stale: the sampler has been failing to refresh it.
+_STALE_INTERVALS = 2
+
+
+def summarize_pod_metrics(items):
+    """
+    Sums the container usages of metrics.k8s.io PodMetrics per pod.
+
+    Args:
+        items (list): PodMetrics dicts from list_cluster_custom_object.
+
+    Returns:
+        tuple: (keys, cpu, ram) with interned (namespace, name) keys and float64 arrays of
+        CPU in millicores and memory in MiB, in the order of items.
+    """
+    keys = []
+    container_pods, container_cpu, container_ram = [], [], []
+    for pod_index, metric in enumerate(items):
+        metadata = metric.get('metadata', {})
+        keys.append((sys.intern(metadata.get('namespace', 'default')), sys.intern(metadata.get('name', 'unknown'))))
+        for container in metric.get('containers', []):
+            usage = container.get('usage', {})
+            container_pods.append(pod_index)
+            container_cpu.append(usage.get('cpu', '0'))
+            container_ram.append(usage.get('memory', '0'))
+    cpu = sum_quantities_by(container_pods, container_cpu, len(keys), TO_MILLICORES)
+    ram = sum_quantities_by(container_pods, container_ram, len(keys), TO_MIB)
+    return keys, cpu, ram
+
+
+def summarize_node_metrics(items):
+    """
+    Reads the usage of metrics.k8s.io NodeMetrics.
+
+    Returns:
+        tuple: (keys, cpu, ram) with interned node names, CPU in millicores and memory in MiB.
+    """
+    keys = [sys.intern(item.get('metadata', {}).get('name', 'unknown')) for item in items]
+    cpu = parse_quantities([item.get('usage', {}).get('cpu', '0') for item in items], TO_MILLICORES)
+    ram = parse_quantities([item.get('usage', {}).get('memory', '0') for item in items], TO_MIB)
+    return keys, cpu, ram
+
+
+class MetricsRingBuffer:
+    """
+    Fixed-size CPU/RAM history of a set of series (pods or nodes) that are sampled together.
+
+    Each sample is one column of two float32 matrices (series x points), written round-robin,
+    so memory does not grow with time. A series missing from a sample gets NaN there. Keys
+    map to matrix rows; rows of series not seen for a whole window (deleted pods) are freed
+    and reused, and the matrices double in height when they run out of rows.
+    """
+    def __init__(self, points=KUBE_METRICS_HISTORY_POINTS, initial_rows=_INITIAL_ROWS):
+        self.points = points
+        self.samples = 0  # Samples recorded so far; the next one goes to column samples % points
+        self.last_time = None  # Time of the latest sample (epoch seconds)
+        self._rows = {}
+        self._keys = [None] * initial_rows
+        self._free_rows = []
+        self._allocated = 0
+        self._cpu = np.full((initial_rows, points), np.nan, dtype=np.float32)
+        self._ram = np.full((initial_rows, points), np.nan, dtype=np.float32)
+        self._last_seen = np.full(initial_rows, -1, dtype=np.int64)
+        self._times = np.full(points, np.nan, dtype=np.float64)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _grow(self):
+        rows = self._cpu.shape[0]
+        self._cpu = np.vstack([self._cpu, np.full((rows, self.points), np.nan, dtype=np.float32)])
+        self._ram = np.vstack([self._ram, np.full((rows, self.points), np.nan, dtype=np.float32)])
+        self._last_seen = np.concatenate([self._last_seen, np.full(rows, -1, dtype=np.int64)])
+        self._keys.extend([None] * rows)
+
+    def _row(self, key):
+        row = self._rows.get(key)
+        if row is None:
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                if self._allocated == self._cpu.shape[0]:
+                    self._grow()
+                row = self._allocated
+                self._allocated += 1
+            self._rows[key] = row
+            self._keys[row] = key
+        return row
+
+    def _evict(self):
+        last_seen = self._last_seen[:self._allocated]
+        for row in np.flatnonzero((last_seen >= 0) & (last_seen <= self.samples - 1 - self.points)).tolist():
+            del self._rows[self._keys[row]]
+            self._keys[row] = None
+            self._last_seen[row] = -1
+            self._free_rows.append(row)
+
+    def record(self, timestamp, keys, cpu, ram):
+        """
+        Appends one sample.
+
+        Args:
+            timestamp (float): Sample time (epoch seconds).
+            keys (list): Series keys.
+            cpu (numpy.ndarray): CPU per key, in millicores.
+            ram (numpy.ndarray): Memory per key, in MiB.
+        """
+        with self._lock:
+            column = self.samples % self.points
+            rows = np.fromiter((self._row(key) for key in keys), dtype=np.intp, count=len(keys))
+            self._cpu[:, column] = np.nan
+            self._ram[:, column] = np.nan
+            self._cpu[rows, column] = cpu
+            self._ram[rows, column] = ram
+            self._last_seen[rows] = self.samples
+            self._times[column] = timestamp
+            self.last_time = timestamp
+            self.samples += 1
+            self._evict()
+
+    def latest(self):
+        """
+        Returns the most recent sample.
+
+        Returns:
+            tuple: (keys, cpu, ram) like summarize_pod_metrics; empty before the first sample.
+        """
+        with self._lock:
+            if not self.samples:
+                return [], np.zeros(0), np.zeros(0)
+            rows = np.flatnonzero(self._last_seen[:self._allocated] == self.samples - 1)
+            column = (self.samples - 1) % self.points
+            keys = [self._keys[row] for row in rows.tolist()]
+            return keys, self._cpu[rows, column].astype(np.float64), self._ram[rows, column].astype(np.float64)
+
+    def history(self, key):
+        """
+        Returns the recorded history of one series, oldest first.
+
+        Returns:
+            dict: 'timestamps', 'cpu' and 'ram' lists of equal length, with None where the
+            series had no value, or None if the key is unknown.
+        """
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            count = min(self.samples, self.points)
+            columns = (np.arange(count) + self.samples - count) % self.points
+            cpu = self._cpu[row, columns]
+            ram = self._ram[row, columns]
+            times = self._times[columns]
+
+        def with_gaps(values):
+            return [None if value != value else round(value, 2) for value in values.tolist()]
+
+        return {'timestamps': times.tolist(), 'cpu': with_gaps(cpu), 'ram': with_gaps(ram)}
+
+
+class MetricsSampler:
+    """
+    Polls metrics.k8s.io for one cluster in a background thread and keeps the history.
+
+    Pod and node usage are recorded in MetricsRingBuffers every interval seconds, so views
+    can show current usage and trends without calling the metrics API themselves.
+    """
+    def __init__(self, cluster_client, interval=KUBE_METRICS_SAMPLE_SECONDS, points=KUBE_METRICS_HISTORY_POINTS):
+        self.cluster_name = cluster_client.name
+        self.metrics_api = cluster_client.metrics_api
+        self.interval = interval
+        self.pods = MetricsRingBuffer(points)
+        self.nodes = MetricsRingBuffer(points)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def has_fresh_sample(self):
+        """
+        True while the latest pod sample is at most two intervals old.
+
+        When metrics.k8s.io keeps failing the sample ages past that, and views go back to
+        calling the metrics API themselves instead of showing old usage as current.
+        """
+        last_time = self.pods.last_time
+        return last_time is not None and time.time() - last_time <= _STALE_INTERVALS * self.interval
+
+    def start(self):
+        """
+        Starts the background sampling thread if it is not already running.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"metrics-{self.cluster_name}", daemon=True)
+        self._thread.start()
+        logger.info(f"Started metrics sampler for cluster '{self.cluster_name}' every {self.interval}s.")
+
+    def stop(self):
+        """
+        Stops the background thread after its current sample.
+        """
+        self._stopped.set()
+        logger.info(f"Stopped metrics sampler for cluster '{self.cluster_name}'.")
+
+    def sample(self):
+        """
+        Records one sample of pod and node usage.
+        """
+        for plural, buffer, summarize in (
+            ('pods', self.pods, summarize_pod_metrics),
+            ('nodes', self.nodes, summarize_node_metrics),
+        ):
+            try:
+                items = self.metrics_api.list_cluster_custom_object(
+                    group="metrics.k8s.io", version="v1beta1", plural=plural
+                ).get('items', [])
+            except ApiException as e:
+                logger.warning(f"Failed to sample {plural} metrics of cluster '{self.cluster_name}': {e.reason}")
+                continue
+            buffer.record(time.time(), *summarize(items))
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Metrics sampler for cluster '{self.cluster_name}' failed: {e}")
+            self._stopped.wait(self.interval)
+
+
+def current_pod_usage(cluster_client):
+    """
+    Returns the current per-pod usage of a cluster.
+
+    Served from the latest sample of the cluster's MetricsSampler; until it has one, while
+    that sample is stale, or with the sampler disabled the metrics API is called directly.
+
+    Args:
+        cluster_client (ClusterClient): The ClusterClient instance.
+
+    Returns:
+        tuple: (keys, cpu, ram) like summarize_pod_metrics.
+
+    Raises:
+        ApiException: If the direct metrics API call fails.
+    """
+    if KUBE_METRICS_SAMPLER_ENABLED:
+        sampler = cluster_client.get_metrics_sampler()
+        if sampler.has_fresh_sample:
+            return sampler.pods.latest()
+    items = cluster_client.metrics_api.list_cluster_custom_object(
+        group="metrics.k8s.io", version="v1beta1", plural="pods"
+    ).get('items', [])
+    return summarize_pod_metrics(items)
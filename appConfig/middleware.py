@@ -0,0 +1,113 @@
+# appConfig/middleware.py
+
+import asyncio
+import os
+import secrets
+
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+from appConfig.settings import KUBE_RESPONSE_COMPRESSION, KUBE_COMPRESSION_MIN_BYTES
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses are gzip-compressed without it
+    brotli = None
+
+_COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+# Quality 5 compresses HTML and JSON better than gzip -6 at a similar speed.
+_BROTLI_QUALITY = 5
+# Random padding added to compressed bodies, as in Django's GZipMiddleware (mitigates BREACH).
+_MAX_RANDOM_BYTES = 100
+
+
+def accepted_encodings(header):
+    """
+    Returns the content codings an Accept-Encoding header allows (those without q=0).
+    """
+    encodings = set()
+    for part in header.split(','):
+        coding, _, parameters = part.partition(';')
+        parameter, _, value = parameters.partition('=')
+        if parameter.strip().lower() == 'q':
+            try:
+                if float(value) == 0:
+                    continue
+            except ValueError:
+                continue
+        encodings.add(coding.strip().lower())
+    return encodings
+
+
+def compress_brotli(content, max_random_bytes=_MAX_RANDOM_BYTES):
+    """
+    Brotli-compresses content, padded with 1 to max_random_bytes random bytes.
+
+    The padding is a metadata meta-block, which decoders skip. It goes between the flushed
+    data and the final empty meta-block, where the stream is byte-aligned, so the
+    compressed data itself is untouched.
+
+    Returns:
+        bytes: The compressed content.
+    """
+    compressor = brotli.Compressor(quality=_BROTLI_QUALITY)
+    data = compressor.process(content) + compressor.flush()
+    size = secrets.randbelow(max_random_bytes) + 1
+    # ISLAST=0, MNIBBLES=0 (metadata), reserved bit, MSKIPBYTES=1, MSKIPLEN-1; padded to 16 bits
+    metadata = ((0b11 << 1) | (1 << 4) | ((size - 1) << 6)).to_bytes(2, 'little')
+    return data + metadata + os.urandom(size) + compressor.finish()
+
+
+def _compressible(response):
+    return (
+        KUBE_RESPONSE_COMPRESSION
+        and not response.streaming
+        and not response.has_header('Content-Encoding')
+        and response.get('Content-Type', '').startswith(_COMPRESSIBLE_TYPES)
+        and len(response.content) >= KUBE_COMPRESSION_MIN_BYTES
+    )
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses large HTML and JSON responses with brotli or gzip, whichever the browser
+    accepts (brotli preferred, when installed).
+
+    Streaming responses such as the SSE log streams and log downloads are passed through
+    untouched, so compression never buffers them. As in Django's GZipMiddleware, strong
+    ETags are made weak, which If-None-Match still matches, and both codings are padded
+    with random bytes. Under ASGI the compression runs in a worker thread.
+    """
+    def process_response(self, request, response):
+        if not _compressible(response):
+            return response
+        return self._compress(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if not _compressible(response):
+            return response
+        # Compress in a worker thread, so neither the event loop nor the single thread that
+        # sync_to_async shares between all requests waits for it.
+        return await asyncio.to_thread(self._compress, request, response)
+
+    def _compress(self, request, response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encodings = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in encodings:
+            encoding, content = 'br', compress_brotli(response.content)
+        elif 'gzip' in encodings:
+            encoding, content = 'gzip', compress_string(response.content, max_random_bytes=_MAX_RANDOM_BYTES)
+        else:
+            return response
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response.headers['Content-Length'] = str(len(content))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,128 @@
+# appConfig/pager.py
+
+import json
+
+from kubernetes.client.exceptions import ApiException
+
+from appConfig.rawjson import read_raw_response
+from appConfig.settings import logger, KUBE_LIST_PAGE_SIZE
+
+HTTP_STATUS_GONE = 410
+
+
+def _inconsistent_continue_token(exception):
+    """
+    Extracts the continue token the apiserver returns alongside an expired-token 410.
+    """
+    try:
+        return json.loads(exception.body).get('metadata', {}).get('continue')
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def call_list(list_func, raw=False, **kwargs):
+    """
+    Calls a Kubernetes list method, optionally skipping model deserialization.
+
+    With raw the response body is decoded straight into RawObjects instead of
+    kubernetes models (V1PodList, V1Pod, ...), which is much cheaper for large lists.
+
+    Args:
+        list_func (callable): A list method, e.g. core_v1.list_pod_for_all_namespaces.
+        raw (bool): Whether to return a RawObject instead of a model.
+        **kwargs: Arguments for list_func (e.g. limit, label_selector).
+
+    Returns:
+        The list response (model or RawObject).
+    """
+    if raw:
+        return read_raw_response(list_func(_preload_content=False, **kwargs))
+    return list_func(**kwargs)
+
+
+def iter_list_pages(list_func, page_size=None, resume_expired=True, raw=False, **kwargs):
+    """
+    Calls a Kubernetes list method in limit/continue chunks, yielding one page at a time.
+
+    When a continue token expires mid-listing, the apiserver answers 410 Gone and may
+    include a fresh token that resumes from the latest snapshot. With resume_expired the
+    pager continues with that token (the listing is then no longer a single consistent
+    snapshot). Otherwise, or when no token is offered, the ApiException is raised.
+
+    Args:
+        list_func (callable): A list method, e.g. core_v1.list_pod_for_all_namespaces.
+        page_size (int): Objects per request; defaults to KUBE_LIST_PAGE_SIZE.
+        resume_expired (bool): Whether to resume after the continue token expires.
+        raw (bool): Whether to yield RawObjects instead of models (see call_list).
+        **kwargs: Extra arguments for list_func (e.g. label_selector).
+
+    Yields:
+        The list response of each page (e.g. V1PodList).
+    """
+    page_size = page_size or KUBE_LIST_PAGE_SIZE
+    continue_token = None
+    while True:
+        try:
+            if continue_token:
+                page = call_list(list_func, raw=raw, limit=page_size, _continue=continue_token, **kwargs)
+            else:
+                page = call_list(list_func, raw=raw, limit=page_size, **kwargs)
+        except ApiException as e:
+            if e.status != HTTP_STATUS_GONE or not continue_token or not resume_expired:
+                raise
+            continue_token = _inconsistent_continue_token(e)
+            if not continue_token:
+                raise
+            logger.warning("List continue token expired; resuming from the latest snapshot.")
+            continue
+
+        yield page
+
+        continue_token = page.metadata._continue
+        if not continue_token:
+            return
+
+
+def iter_list_items(list_func, page_size=None, raw=False, **kwargs):
+    """
+    Yields the objects of a paginated list one by one.
+
+    Only one page is held in memory at a time.
+
+    Args:
+        list_func (callable): A list method, e.g. core_v1.list_pod_for_all_namespaces.
+        page_size (int): Objects per request; defaults to KUBE_LIST_PAGE_SIZE.
+        raw (bool): Whether to yield RawObjects instead of models.
+        **kwargs: Extra arguments for list_func.
+
+    Yields:
+        The listed objects (e.g. V1Pod instances).
+    """
+    for page in iter_list_pages(list_func, page_size=page_size, raw=raw, **kwargs):
+        yield from page.items
+
+
+def list_all_pages(list_func, page_size=None, **kwargs):
+    """
+    Fetches every page of a list and returns them merged into the first response.
+
+    Useful for callers that expect a single list object (with .items and .metadata)
+    while still keeping each apiserver response small.
+
+    Args:
+        list_func (callable): A list method, e.g. apps_v1.list_deployment_for_all_namespaces.
+        page_size (int): Objects per request; defaults to KUBE_LIST_PAGE_SIZE.
+        **kwargs: Extra arguments for list_func.
+
+    Returns:
+        The first page's list object, holding the items of all pages.
+    """
+    result = None
+    for page in iter_list_pages(list_func, page_size=page_size, **kwargs):
+        if result is None:
+            result = page
+        else:
+            result.items.extend(page.items)
+            result.metadata.resource_version = page.metadata.resource_version
+    result.metadata._continue = None
+    return result
@@ -0,0 +1,224 @@
+# appConfig/podtable.py
+
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.utils.timesince import timesince
+
+from appConfig.asyncclient import alist_cached_items
+from appConfig.kubeconfig import iter_cached_items
+from appConfig.quantity import TO_MILLICORES, TO_MIB, sum_quantities_by
+from appConfig.settings import KUBE_INFORMERS_ENABLED
+
+
+class _Categories:
+    """
+    Interns the values of a low-cardinality string column and assigns them integer codes.
+    """
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class PodTable:
+    """
+    Compact, read-only struct-of-arrays snapshot of a cluster's pods.
+
+    Namespaces, nodes and phases are stored as int32 codes into lists of interned strings,
+    and counts, restarts, creation times and resource requests/limits as NumPy columns, so
+    a 100k-pod table takes a few tens of MB and serves the pods list, the dashboard and the
+    namespace rollups without keeping per-request row dicts or touching the pod models.
+    Tables built from a synced informer are cached until its store changes (see
+    get_pod_table).
+
+    Attributes:
+        names, uids (list): Pod names and uids.
+        namespace_codes, node_codes, phase_codes (numpy.ndarray): int32 codes into
+            namespace_values, node_values and phase_values. Pods not scheduled yet have node ''.
+        containers, ready_containers, restarts (numpy.ndarray): int32 counts.
+        created (numpy.ndarray): float64 creation time (epoch seconds), NaN if unknown.
+        cpu_requests, cpu_limits (numpy.ndarray): Sums over the pod's containers, in millicores.
+        ram_requests, ram_limits (numpy.ndarray): Sums over the pod's containers, in MiB.
+    """
+    def __init__(self, names, uids, namespaces, nodes, phases, containers, ready_containers, restarts, created,
+                 cpu_requests, cpu_limits, ram_requests, ram_limits):
+        self.names = names
+        self.uids = uids
+        self.namespace_codes = np.asarray(namespaces[0], dtype=np.int32)
+        self.namespace_values = namespaces[1]
+        self.node_codes = np.asarray(nodes[0], dtype=np.int32)
+        self.node_values = nodes[1]
+        self.phase_codes = np.asarray(phases[0], dtype=np.int32)
+        self.phase_values = phases[1]
+        self.containers = np.asarray(containers, dtype=np.int32)
+        self.ready_containers = np.asarray(ready_containers, dtype=np.int32)
+        self.restarts = np.asarray(restarts, dtype=np.int32)
+        self.created = np.asarray(created, dtype=np.float64)
+        self.cpu_requests = cpu_requests
+        self.cpu_limits = cpu_limits
+        self.ram_requests = ram_requests
+        self.ram_limits = ram_limits
+        self._columns = {}
+
+    @classmethod
+    def from_pods(cls, pods):
+        """
+        Builds a table in one pass over pod objects (kubernetes models or RawObjects).
+        """
+        names, uids = [], []
+        namespaces, nodes, phases = _Categories(), _Categories(), _Categories()
+        namespace_codes, node_codes, phase_codes = [], [], []
+        containers, ready_containers, restarts, created = [], [], [], []
+        container_pods, cpu_requests, cpu_limits, ram_requests, ram_limits = [], [], [], [], []
+        for index, pod in enumerate(pods):
+            metadata, spec, status = pod.metadata, pod.spec, pod.status
+            names.append(metadata.name)
+            uids.append(metadata.uid or '')
+            namespace_codes.append(namespaces.code(metadata.namespace or ''))
+            node_codes.append(nodes.code((spec.node_name if spec else None) or ''))
+            phase_codes.append(phases.code((status.phase if status else None) or 'Unknown'))
+            creation_timestamp = metadata.creation_timestamp
+            created.append(creation_timestamp.timestamp() if creation_timestamp else np.nan)
+
+            pod_containers = (spec.containers if spec else None) or []
+            containers.append(len(pod_containers))
+            for container in pod_containers:
+                resources = container.resources
+                requests = (resources.requests if resources else None) or {}
+                limits = (resources.limits if resources else None) or {}
+                container_pods.append(index)
+                cpu_requests.append(requests.get('cpu', '0'))
+                cpu_limits.append(limits.get('cpu', '0'))
+                ram_requests.append(requests.get('memory', '0'))
+                ram_limits.append(limits.get('memory', '0'))
+
+            ready = restart_count = 0
+            for container_status in (status.container_statuses if status else None) or []:
+                ready += bool(container_status.ready)
+                restart_count += container_status.restart_count or 0
+            ready_containers.append(ready)
+            restarts.append(restart_count)
+
+        count = len(names)
+        return cls(
+            names, uids,
+            (namespace_codes, namespaces.values), (node_codes, nodes.values), (phase_codes, phases.values),
+            containers, ready_containers, restarts, created,
+            sum_quantities_by(container_pods, cpu_requests, count, TO_MILLICORES),
+            sum_quantities_by(container_pods, cpu_limits, count, TO_MILLICORES),
+            sum_quantities_by(container_pods, ram_requests, count, TO_MIB),
+            sum_quantities_by(container_pods, ram_limits, count, TO_MIB),
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def phase_counts(self):
+        """
+        Returns a dict of pod phase -> number of pods.
+        """
+        counts = np.bincount(self.phase_codes, minlength=len(self.phase_values)).tolist()
+        return dict(zip(self.phase_values, counts))
+
+    def column(self, field):
+        """
+        Returns the values of a pods list field (see rows) for filtering and sorting.
+
+        The created_at column holds epoch seconds, which sort like the ISO timestamps.
+
+        Returns:
+            list: One value per pod, or None if the field cannot be filtered or sorted.
+        """
+        column = self._columns.get(field)
+        if column is None:
+            if field == 'name':
+                column = self.names
+            elif field == 'namespace':
+                column = [self.namespace_values[code] for code in self.namespace_codes.tolist()]
+            elif field == 'status':
+                column = [self.phase_values[code] for code in self.phase_codes.tolist()]
+            elif field == 'node':
+                column = [self.node_values[code] or 'N/A' for code in self.node_codes.tolist()]
+            elif field == 'container_info':
+                column = [
+                    f"{ready} / {total}"
+                    for ready, total in zip(self.ready_containers.tolist(), self.containers.tolist())
+                ]
+            elif field in ('created_at', 'age'):
+                column = [None if created != created else created for created in self.created.tolist()]
+            else:
+                return None
+            self._columns[field] = column
+        return column
+
+    def rows(self, indices):
+        """
+        Builds the pods list row dicts of the given pods.
+
+        Args:
+            indices (iterable): Row indices, e.g. the requested page.
+
+        Returns:
+            list: Dicts with name, namespace, status, node, container_info, created_at,
+            age, details_url and view_json.
+        """
+        now = datetime.now(timezone.utc)
+        rows = []
+        for index in indices:
+            name = self.names[index]
+            namespace = self.namespace_values[self.namespace_codes[index]]
+            created = self.created[index]
+            creation_timestamp = datetime.fromtimestamp(created, timezone.utc) if created == created else None
+            rows.append({
+                'name': name,
+                'namespace': namespace,
+                'status': self.phase_values[self.phase_codes[index]],
+                'node': self.node_values[self.node_codes[index]] or 'N/A',
+                'container_info': f"{self.ready_containers[index]} / {self.containers[index]}",
+                'created_at': creation_timestamp.isoformat() if creation_timestamp else '',
+                'age': f"{timesince(creation_timestamp, now)} ago" if creation_timestamp else 'N/A',
+                'details_url': f"/pods/{namespace}/{name}/",
+                'view_json': f"/pods/{namespace}/{name}/json/",
+            })
+        return rows
+
+
+def get_pod_table(cluster_client, request_timeout=None):
+    """
+    Returns the PodTable of a cluster.
+
+    With a synced pods informer the table is built once per informer update and shared
+    by all requests; otherwise it is built from a paginated list, whose page requests
+    time out after request_timeout seconds if given.
+
+    Raises:
+        ApiException: If the paginated fallback fails.
+    """
+    if KUBE_INFORMERS_ENABLED:
+        informer = cluster_client.get_informer('pods')
+        if informer.has_synced:
+            return informer.cached_view(PodTable.from_pods)
+    return PodTable.from_pods(iter_cached_items(cluster_client, 'pods', request_timeout=request_timeout))
+
+
+async def aget_pod_table(cluster_client):
+    """
+    Async variant of get_pod_table; the table is built in a worker thread.
+    """
+    if KUBE_INFORMERS_ENABLED:
+        informer = cluster_client.get_informer('pods')
+        if informer.has_synced:
+            return await sync_to_async(informer.cached_view, thread_sensitive=False)(PodTable.from_pods)
+    pods = await alist_cached_items(cluster_client, 'pods')
+    return await sync_to_async(PodTable.from_pods, thread_sensitive=False)(pods)
@@ -0,0 +1,117 @@
+# appConfig/quantity.py
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from appConfig.settings import logger
+
+# resource.Quantity grammar: <signedNumber><suffix>, where the suffix is a binary SI suffix,
+# a decimal SI suffix or a decimal exponent ('e3', 'E-2'). 'E' alone is exa.
+_QUANTITY_PATTERN = re.compile(
+    r'([+-]?(?:\d+(?:\.\d*)?|\.\d+))'
+    r'(?:(Ki|Mi|Gi|Ti|Pi|Ei|n|u|m|k|M|G|T|P|E)|[eE]([+-]?\d+))?'
+)
+_BINARY_EXPONENTS = {'Ki': 10, 'Mi': 20, 'Gi': 30, 'Ti': 40, 'Pi': 50, 'Ei': 60}
+_DECIMAL_EXPONENTS = {'n': -9, 'u': -6, 'm': -3, '': 0, 'k': 3, 'M': 6, 'G': 9, 'T': 12, 'P': 15, 'E': 18}
+
+# Scale factors from base units (cores, bytes) to the units shown on the dashboard.
+TO_MILLICORES = 1000.0
+TO_MIB = 1.0 / 2 ** 20
+
+# Metrics and specs repeat a small set of strings ('100m', '128Mi', ...), so parsed values are cached.
+_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_quantity(quantity):
+    """
+    Parses a Kubernetes quantity into a float in base units (cores, bytes, ...).
+
+    Supports the full resource.Quantity grammar: decimal SI suffixes (n, u, m, k, M, G,
+    T, P, E), binary SI suffixes (Ki to Ei) and decimal exponents (1e3, 5E-1).
+
+    Args:
+        quantity (str): e.g. '250m', '1.5Gi', '2k', '1e3'. Numbers are accepted as is.
+
+    Returns:
+        float: The value in base units, e.g. 0.25 for '250m' and 1610612736.0 for '1.5Gi'.
+
+    Raises:
+        ValueError: If the string is not a valid quantity.
+    """
+    if not isinstance(quantity, str):
+        return float(quantity)
+    match = _QUANTITY_PATTERN.fullmatch(quantity.strip())
+    if not match:
+        raise ValueError(f"Invalid quantity '{quantity}'.")
+    number, suffix, exponent = match.groups()
+    if suffix in _BINARY_EXPONENTS:
+        return float(number) * 2 ** _BINARY_EXPONENTS[suffix]
+    # Parsing the number with its decimal exponent rounds once, so '100m' is exactly float('0.1').
+    exponent = int(exponent) if exponent is not None else _DECIMAL_EXPONENTS[suffix or '']
+    return float(f"{number}e{exponent}")
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _parse_or_zero(quantity):
+    # Invalid quantities count as 0 and are logged once per distinct string.
+    try:
+        return parse_quantity(quantity)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Ignoring unparsable quantity {quantity!r}: {e}")
+        return 0.0
+
+
+def cpu_millicores(quantity):
+    """
+    Returns a CPU quantity ('250m', '2', '1500000n') in millicores; 0 if it is invalid.
+    """
+    return _parse_or_zero(quantity) * TO_MILLICORES
+
+
+def memory_mib(quantity):
+    """
+    Returns a memory quantity ('256Mi', '1G', '512Ki') in MiB; 0 if it is invalid.
+    """
+    return _parse_or_zero(quantity) * TO_MIB
+
+
+def parse_quantities(quantities, scale=1.0):
+    """
+    Parses a column of quantities into a NumPy array.
+
+    Each distinct string is parsed once (the cache is shared with cpu_millicores and
+    memory_mib), so a column of thousands of container usages costs a cache lookup per
+    entry and the scaling and any aggregation happen in NumPy. Invalid entries are 0.
+
+    Args:
+        quantities (iterable): Quantity strings.
+        scale (float): Factor applied to the base units, e.g. TO_MILLICORES or TO_MIB.
+
+    Returns:
+        numpy.ndarray: float64 values, one per quantity.
+    """
+    count = len(quantities) if hasattr(quantities, '__len__') else -1
+    values = np.fromiter(map(_parse_or_zero, quantities), dtype=np.float64, count=count)
+    if scale != 1.0:
+        values *= scale
+    return values
+
+
+def sum_quantities_by(group_ids, quantities, groups, scale=1.0):
+    """
+    Sums a column of quantities per group, e.g. container usages per pod.
+
+    Args:
+        group_ids (sequence of int): The group (0 to groups - 1) of each quantity.
+        quantities (sequence of str): The quantities.
+        groups (int): Number of groups.
+        scale (float): Factor applied to the base units, e.g. TO_MILLICORES or TO_MIB.
+
+    Returns:
+        numpy.ndarray: float64 totals, one per group.
+    """
+    values = parse_quantities(quantities, scale)
+    return np.bincount(np.asarray(group_ids, dtype=np.intp), weights=values, minlength=groups)
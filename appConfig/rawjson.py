@@ -0,0 +1,175 @@
+# appConfig/rawjson.py
+
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library decoder is used without it
+    orjson = None
+
+# Keys holding RFC 3339 timestamps, which the kubernetes models expose as datetime objects.
+_TIMESTAMP_SUFFIXES = ('Timestamp', 'Time')
+_TIMESTAMP_KEYS = {'startedAt', 'finishedAt'}
+# Maps holding user data, whose values are returned as sent even if a key looks like a timestamp field.
+_FREE_FORM_KEYS = frozenset({
+    'labels', 'annotations', 'data', 'stringData', 'binaryData', 'matchLabels', 'nodeSelector', 'fieldsV1',
+})
+_CAMEL_PATTERN = re.compile(r'_([a-z])')
+# Characters escaped inside <script> elements, as django.utils.html.json_script does.
+_JSON_SCRIPT_ESCAPES = {ord('>'): '\\u003E', ord('<'): '\\u003C', ord('&'): '\\u0026'}
+
+
+def json_loads(data):
+    """
+    Decodes JSON bytes or str, with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """
+    Encodes obj as a compact JSON str, with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def json_script(value, element_id):
+    """
+    Outputs value as JSON in a <script type="application/json"> element, like Django's
+    json_script filter but encoded once with json_dumps (orjson when it is installed).
+
+    Pages read the data with JSON.parse(document.getElementById(element_id).textContent),
+    so rows are neither built by template loops nor pasted into JavaScript with |safe.
+
+    Args:
+        value: JSON-serializable data, e.g. a list of row dicts.
+        element_id (str): id of the script element.
+
+    Returns:
+        SafeString: The script element.
+    """
+    data = mark_safe(json_dumps(value).translate(_JSON_SCRIPT_ESCAPES))
+    return format_html('<script id="{}" type="application/json">{}</script>', element_id, data)
+
+
+@lru_cache(maxsize=None)
+def _to_camel(name):
+    return _CAMEL_PATTERN.sub(lambda match: match.group(1).upper(), name.lstrip('_'))
+
+
+def _normalize(name):
+    return name.replace('_', '').lower()
+
+
+def _wrap(key, value, free_form=False):
+    value_type = type(value)
+    if value_type is dict:
+        return RawObject(value, free_form or key in _FREE_FORM_KEYS)
+    if value_type is list:
+        return [RawObject(item, free_form) if type(item) is dict else item for item in value]
+    if (
+        value_type is str and not free_form and key
+        and (key.endswith(_TIMESTAMP_SUFFIXES) or key in _TIMESTAMP_KEYS)
+    ):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+class RawObject:
+    """
+    Read-only view over decoded Kubernetes JSON that reads like a kubernetes model.
+
+    Attribute names are the models' snake_case names (pod.status.container_statuses,
+    page.metadata._continue) and are resolved against the camelCase JSON keys, including
+    acronyms such as podIP. Missing fields return None, timestamps are returned as
+    datetimes and nested objects are wrapped on access, so list views can read raw
+    responses without building model objects. Map fields such as labels also behave like
+    a read-only dict (keys(), get(), items(), len()); inside user data maps (labels,
+    annotations, ConfigMap data, ...) values are never converted.
+    """
+    __slots__ = ('_data', '_normalized', '_free_form')
+
+    def __init__(self, data, free_form=False):
+        self._data = data
+        self._normalized = None
+        self._free_form = free_form
+
+    def _resolve(self, name):
+        # Fallback for names that do not camel-case to their JSON key (pod_ip -> podIP).
+        if self._normalized is None:
+            self._normalized = {_normalize(data_key): data_key for data_key in self._data}
+        return self._normalized.get(_normalize(name))
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in RawObject.__slots__:
+            raise AttributeError(name)
+        key = _to_camel(name)
+        if key in self._data:
+            return _wrap(key, self._data[key], self._free_form)
+        key = self._resolve(name)
+        if key is None:
+            if name == 'items':
+                # A map field (e.g. labels) rather than a list response with an items key.
+                return lambda: [
+                    (data_key, _wrap(data_key, value, self._free_form)) for data_key, value in self._data.items()
+                ]
+            return None
+        return _wrap(key, self._data[key], self._free_form)
+
+    def __getitem__(self, key):
+        return _wrap(key, self._data[key], self._free_form)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"RawObject({self._data!r})"
+
+    def get(self, key, default=None):
+        if key in self._data:
+            return _wrap(key, self._data[key], self._free_form)
+        return default
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self):
+        return [_wrap(key, value, self._free_form) for key, value in self._data.items()]
+
+    def to_dict(self):
+        """
+        Returns the decoded JSON (camelCase keys, as sent by the apiserver).
+        """
+        return self._data
+
+
+def read_raw_response(response):
+    """
+    Decodes a urllib3 response returned by a call made with _preload_content=False.
+
+    Returns:
+        RawObject: The decoded body.
+    """
+    try:
+        return RawObject(json_loads(response.data))
+    finally:
+        response.release_conn()
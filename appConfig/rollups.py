@@ -0,0 +1,66 @@
+# appConfig/rollups.py
+
+import numpy as np
+
+POD_PHASES = ('Running', 'Pending', 'Succeeded', 'Failed', 'Unknown')
+_PHASE_INDEX = {phase: index for index, phase in enumerate(POD_PHASES)}
+_UNKNOWN_PHASE = _PHASE_INDEX['Unknown']
+
+
+def rollup_by_namespace(pod_table, usage=None, namespaces=()):
+    """
+    Sums pod counts, resource requests, limits and usage per namespace.
+
+    The PodTable already holds namespace codes, phases and per-pod requests and limits as
+    columns, so the sums are NumPy group-bys over them and the cost is linear in the
+    number of pods. Requests and limits are the sums over a pod's regular containers.
+
+    Args:
+        pod_table (PodTable): The pods of the whole cluster.
+        usage (tuple): Optional (keys, cpu, ram) per pod as returned by
+            summarize_pod_metrics or MetricsRingBuffer.latest.
+        namespaces (iterable): Namespace names to include even if they have no pods.
+
+    Returns:
+        dict: Namespace name -> {'pods', 'running', 'pending', 'succeeded', 'failed',
+        'unknown', 'cpu_requests', 'cpu_limits', 'cpu_usage', 'ram_requests',
+        'ram_limits', 'ram_usage'}, with CPU in millicores and memory in MiB.
+    """
+    # Group ids are the table's namespace codes, followed by namespaces without pods.
+    namespace_index = {name: code for code, name in enumerate(pod_table.namespace_values)}
+    for name in namespaces:
+        namespace_index.setdefault(name, len(namespace_index))
+    usage_keys, usage_cpu, usage_ram = usage if usage is not None else ([], np.zeros(0), np.zeros(0))
+    usage_namespaces = np.fromiter(
+        (namespace_index.setdefault(key[0], len(namespace_index)) for key in usage_keys),
+        dtype=np.intp, count=len(usage_keys),
+    )
+    groups = len(namespace_index)
+
+    # Map the table's phase codes onto POD_PHASES; any other phase counts as Unknown.
+    phase_map = np.array(
+        [_PHASE_INDEX.get(phase, _UNKNOWN_PHASE) for phase in pod_table.phase_values], dtype=np.intp
+    )
+    pod_namespaces = pod_table.namespace_codes.astype(np.intp)
+    phase_counts = np.bincount(
+        pod_namespaces * len(POD_PHASES) + phase_map[pod_table.phase_codes],
+        minlength=groups * len(POD_PHASES),
+    ).reshape(groups, len(POD_PHASES))
+
+    def by_namespace(values, value_namespaces=pod_namespaces):
+        return np.bincount(value_namespaces, weights=values, minlength=groups).astype(np.float64, copy=False)
+
+    columns = {
+        'pods': phase_counts.sum(axis=1),
+        'cpu_requests': by_namespace(pod_table.cpu_requests),
+        'cpu_limits': by_namespace(pod_table.cpu_limits),
+        'cpu_usage': by_namespace(usage_cpu, usage_namespaces),
+        'ram_requests': by_namespace(pod_table.ram_requests),
+        'ram_limits': by_namespace(pod_table.ram_limits),
+        'ram_usage': by_namespace(usage_ram, usage_namespaces),
+    }
+    for index, phase in enumerate(POD_PHASES):
+        columns[phase.lower()] = phase_counts[:, index]
+
+    rows = zip(*(column.tolist() for column in columns.values()))
+    return {name: dict(zip(columns, row)) for name, row in zip(namespace_index, rows)}
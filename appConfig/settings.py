@@ -71,6 +71,7 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'appConfig.middleware.CompressionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -113,6 +114,61 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Directory holding the kubeconfig files offered in the cluster selector
+KUBECONFIG_DIR = os.getenv('KUBECONFIG_DIR', 'kubeConfigs')
+
+# Cached ClusterClients (one per kubeconfig file, least recently used evicted first)
+KUBE_CLIENT_CACHE_SIZE = int(os.getenv('KUBE_CLIENT_CACHE_SIZE', '64'))
+
+# Kubernetes informers (in-memory list+watch caches per cluster)
+KUBE_INFORMERS_ENABLED = os.getenv('KUBE_INFORMERS_ENABLED', 'True').lower() in ('true', '1', 'yes')
+KUBE_INFORMER_WATCH_TIMEOUT = int(os.getenv('KUBE_INFORMER_WATCH_TIMEOUT', '300'))  # seconds per watch request
+KUBE_INFORMER_RETRY_SECONDS = int(os.getenv('KUBE_INFORMER_RETRY_SECONDS', '5'))
+# Recent watch deltas kept per shared WebSocket watch so reconnecting clients can resume
+KUBE_WATCH_REPLAY_EVENTS = int(os.getenv('KUBE_WATCH_REPLAY_EVENTS', '1000'))
+
+# Paginated list calls (limit/continue)
+KUBE_LIST_PAGE_SIZE = int(os.getenv('KUBE_LIST_PAGE_SIZE', '500'))
+# Decode list responses into lightweight RawObjects instead of kubernetes models
+KUBE_RAW_LISTS = os.getenv('KUBE_RAW_LISTS', 'False').lower() in ('true', '1', 'yes')
+
+# Concurrent fetches (dashboard fan-out)
+KUBE_FETCH_MAX_WORKERS = int(os.getenv('KUBE_FETCH_MAX_WORKERS', '16'))
+KUBE_FETCH_TIMEOUT = float(os.getenv('KUBE_FETCH_TIMEOUT', '30'))  # seconds
+
+# Connections per cluster for the asyncio Kubernetes client used by async views
+KUBE_ASYNC_POOL_SIZE = int(os.getenv('KUBE_ASYNC_POOL_SIZE', '100'))
+
+# Conditional GET (ETag / 304) for list and JSON pages served from informers
+KUBE_CONDITIONAL_GET = os.getenv('KUBE_CONDITIONAL_GET', 'True').lower() in ('true', '1', 'yes')
+# Brotli/gzip compression of HTML and JSON responses (streaming responses are never compressed)
+KUBE_RESPONSE_COMPRESSION = os.getenv('KUBE_RESPONSE_COMPRESSION', 'True').lower() in ('true', '1', 'yes')
+KUBE_COMPRESSION_MIN_BYTES = int(os.getenv('KUBE_COMPRESSION_MIN_BYTES', '1024'))
+
+# Metrics history (background metrics.k8s.io sampler per cluster)
+KUBE_METRICS_SAMPLER_ENABLED = os.getenv('KUBE_METRICS_SAMPLER_ENABLED', 'True').lower() in ('true', '1', 'yes')
+KUBE_METRICS_SAMPLE_SECONDS = int(os.getenv('KUBE_METRICS_SAMPLE_SECONDS', '30'))
+KUBE_METRICS_HISTORY_POINTS = int(os.getenv('KUBE_METRICS_HISTORY_POINTS', '120'))  # samples kept per pod/node
+
+# Pod log streaming
+# Log stream admission: quotas (0 = unlimited) and how many requests may wait how long for a slot
+KUBE_LOG_STREAMS_TOTAL = int(os.getenv('KUBE_LOG_STREAMS_TOTAL', '1000'))
+KUBE_LOG_STREAMS_PER_CLUSTER = int(os.getenv('KUBE_LOG_STREAMS_PER_CLUSTER', '200'))
+KUBE_LOG_STREAMS_PER_SESSION = int(os.getenv('KUBE_LOG_STREAMS_PER_SESSION', '60'))
+KUBE_LOG_ADMISSION_QUEUE = int(os.getenv('KUBE_LOG_ADMISSION_QUEUE', '200'))
+KUBE_LOG_ADMISSION_TIMEOUT = float(os.getenv('KUBE_LOG_ADMISSION_TIMEOUT', '15'))  # seconds
+KUBE_LOG_READ_CHUNK_SIZE = int(os.getenv('KUBE_LOG_READ_CHUNK_SIZE', '65536'))  # bytes
+# Recent lines kept per shared log stream and replayed to new viewers
+KUBE_LOG_BUFFER_LINES = int(os.getenv('KUBE_LOG_BUFFER_LINES', '1000'))
+# Lines a viewer may lag behind a shared log stream before it is disconnected
+KUBE_LOG_VIEWER_QUEUE_LINES = int(os.getenv('KUBE_LOG_VIEWER_QUEUE_LINES', '10000'))
+# Defaults for framing=batch; each request may override them with batch_ms and batch_bytes
+KUBE_LOG_BATCH_MS = int(os.getenv('KUBE_LOG_BATCH_MS', '100'))
+KUBE_LOG_BATCH_BYTES = int(os.getenv('KUBE_LOG_BATCH_BYTES', '65536'))
+# Merged multi-pod log streams: pods followed at once and how long lines wait for slower pods
+KUBE_LOG_MERGE_MAX_PODS = int(os.getenv('KUBE_LOG_MERGE_MAX_PODS', '50'))
+KUBE_LOG_MERGE_WINDOW_MS = int(os.getenv('KUBE_LOG_MERGE_WINDOW_MS', '250'))
+
 # DATABASES
 DATABASES = {
     'default': {
@@ -0,0 +1,213 @@
+# appConfig/tabulator.py
+
+import math
+import re
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+
+TABULATOR_DEFAULT_PAGE_SIZE = 25
+TABULATOR_MAX_PAGE_SIZE = 500
+
+# Matches the bracketed query parameters Tabulator sends, e.g. sort[0][field] or filter[1][value].
+_PARAM_PATTERN = re.compile(r'^(sort|filter)\[(\d+)\]\[(\w+)\]$')
+
+
+def _int_param(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_table_params(query_params):
+    """
+    Parses the page, size, sort and filter parameters of a Tabulator remote request.
+
+    Args:
+        query_params (QueryDict): The request's GET parameters.
+
+    Returns:
+        tuple: (page, size, sorters, filters) where sorters is a list of
+        {'field', 'dir'} dicts in priority order and filters a list of
+        {'field', 'type', 'value'} dicts.
+    """
+    page = max(_int_param(query_params.get('page'), 1), 1)
+    size = _int_param(query_params.get('size'), TABULATOR_DEFAULT_PAGE_SIZE)
+    size = min(max(size, 1), TABULATOR_MAX_PAGE_SIZE)
+
+    grouped = {'sort': {}, 'filter': {}}
+    for key, value in query_params.items():
+        match = _PARAM_PATTERN.match(key)
+        if match:
+            kind, index, attribute = match.groups()
+            grouped[kind].setdefault(int(index), {})[attribute] = value
+
+    sorters = [grouped['sort'][index] for index in sorted(grouped['sort'])]
+    filters = [grouped['filter'][index] for index in sorted(grouped['filter'])]
+    return page, size, sorters, filters
+
+
+def _as_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(cell, value, operator):
+    cell_number, value_number = _as_number(cell), _as_number(value)
+    if cell_number is not None and value_number is not None:
+        return operator(cell_number, value_number)
+    return operator(str(cell), str(value))
+
+
+_FILTER_TYPES = {
+    'like': lambda cell, value: str(value).lower() in str(cell).lower(),
+    'starts': lambda cell, value: str(cell).lower().startswith(str(value).lower()),
+    'ends': lambda cell, value: str(cell).lower().endswith(str(value).lower()),
+    '=': lambda cell, value: str(cell) == str(value),
+    '!=': lambda cell, value: str(cell) != str(value),
+    '<': lambda cell, value: _compare(cell, value, lambda a, b: a < b),
+    '<=': lambda cell, value: _compare(cell, value, lambda a, b: a <= b),
+    '>': lambda cell, value: _compare(cell, value, lambda a, b: a > b),
+    '>=': lambda cell, value: _compare(cell, value, lambda a, b: a >= b),
+}
+
+
+def _sort_key(value):
+    # Numbers sort before text and empty values sort last, so mixed columns never raise TypeError.
+    if value is None or value == '':
+        return 2, 0, ''
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return 0, value, ''
+    return 1, 0, str(value).lower()
+
+
+def apply_table_params(rows, sorters, filters):
+    """
+    Filters and sorts row dicts the way Tabulator would locally.
+
+    Filters on unknown fields or with unsupported types are ignored.
+
+    Returns:
+        list: The matching rows in display order.
+    """
+    for table_filter in filters:
+        field = table_filter.get('field')
+        value = table_filter.get('value', '')
+        matches = _FILTER_TYPES.get(table_filter.get('type', 'like'))
+        if not field or matches is None or value == '':
+            continue
+        rows = [row for row in rows if row.get(field) is not None and matches(row[field], value)]
+
+    rows = list(rows)
+    # Python's sort is stable, so sorting by the least significant sorter first keeps priority order.
+    for sorter in reversed(sorters):
+        field = sorter.get('field')
+        if not field:
+            continue
+        rows.sort(key=lambda row: _sort_key(row.get(field)), reverse=sorter.get('dir') == 'desc')
+    return rows
+
+
+def apply_column_params(table, sorters, filters):
+    """
+    Filters and sorts a columnar table (e.g. a PodTable) the way apply_table_params does.
+
+    Only row indices are filtered and sorted, against the table's columns, so no row dicts
+    are built for rows outside the requested page. Filters and sorters on fields the
+    table has no column for are ignored.
+
+    Args:
+        table: Has len() and column(field), which returns a list of values or None.
+
+    Returns:
+        list: The indices of the matching rows in display order.
+    """
+    indices = range(len(table))
+    for table_filter in filters:
+        field = table_filter.get('field')
+        value = table_filter.get('value', '')
+        matches = _FILTER_TYPES.get(table_filter.get('type', 'like'))
+        column = table.column(field) if field else None
+        if column is None or matches is None or value == '':
+            continue
+        indices = [index for index in indices if column[index] is not None and matches(column[index], value)]
+
+    indices = list(indices)
+    for sorter in reversed(sorters):
+        field = sorter.get('field')
+        column = table.column(field) if field else None
+        if column is None:
+            continue
+        indices.sort(key=lambda index: _sort_key(column[index]), reverse=sorter.get('dir') == 'desc')
+    return indices
+
+
+def _paginate(page, size, last_row):
+    last_page = max(math.ceil(last_row / size), 1)
+    page = min(page, last_page)
+    return last_page, (page - 1) * size
+
+
+def tabulator_response(request, rows):
+    """
+    Answers a Tabulator remote-mode request (pagination, sortMode and filterMode "remote").
+
+    Args:
+        request (HttpRequest): The ajax request sent by Tabulator.
+        rows (iterable): Every row dict of the table; only the requested page is serialized.
+
+    Returns:
+        JsonResponse: {'last_page', 'last_row', 'data'} as expected by Tabulator.
+    """
+    page, size, sorters, filters = parse_table_params(request.GET)
+    rows = apply_table_params(rows, sorters, filters)
+
+    last_row = len(rows)
+    last_page, start = _paginate(page, size, last_row)
+
+    return JsonResponse({
+        'last_page': last_page,
+        'last_row': last_row,
+        'data': rows[start:start + size],
+    })
+
+
+def table_response(request, table):
+    """
+    Variant of tabulator_response for a columnar table; row dicts are only built for
+    the requested page, by table.rows(indices).
+    """
+    page, size, sorters, filters = parse_table_params(request.GET)
+    indices = apply_column_params(table, sorters, filters)
+
+    last_row = len(indices)
+    last_page, start = _paginate(page, size, last_row)
+
+    return JsonResponse({
+        'last_page': last_page,
+        'last_row': last_row,
+        'data': table.rows(indices[start:start + size]),
+    })
+
+
+async def atabulator_response(request, build_rows, *args):
+    """
+    Async variant of tabulator_response for async views.
+
+    Building, sorting and serializing the rows is CPU work, so build_rows(*args) and the
+    response are produced in a worker thread instead of blocking the event loop.
+    """
+    return await sync_to_async(
+        lambda: tabulator_response(request, build_rows(*args)),
+        thread_sensitive=False,
+    )()
+
+
+async def atable_response(request, table):
+    """
+    Async variant of table_response; filtering, sorting and serializing run in a worker thread.
+    """
+    return await sync_to_async(table_response, thread_sensitive=False)(request, table)
@@ -2,11 +2,13 @@
 
 from django.contrib import admin
 from django.urls import path
-from kubeBoard.views import index_page, select_kubeconfig
-from kubeIngress.views import ingress_detail, all_ingresses_page
-from kubePods.views import pod_details_page, pod_json_page, download_pod_json, all_pods_page
-from kubeLogs.views import stream_pod_logs
-from kubeEvents.views import all_events_page, event_detail_page
+from kubeBoard.views import index_page, node_metrics_history, select_kubeconfig
+from kubeIngress.views import ingress_detail, all_ingresses_page, all_ingresses_data
+from kubePods.views import (
+    pod_details_page, pod_json_page, download_pod_json, pod_metrics_history, all_pods_page, all_pods_data
+)
+from kubeLogs.views import download_pod_logs, log_stream_stats, stream_pod_logs, stream_selector_logs
+from kubeEvents.views import all_events_page, all_events_data, event_detail_page
 from kubeConfigMaps.views import all_config_maps_page, config_map_details_page, config_map_json_page
 from kubeSecrets.views import all_secrets_page, secret_details_page, secret_json_page
 from kubeDeployments.views import all_deployments_page, deployment_details_page, deployment_json_page
@@ -26,22 +28,31 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', index_page, name='index_page'),
     path('select-kubeconfig/', select_kubeconfig, name='select_kubeconfig'),
+    path('internal/log-streams/', log_stream_stats, name='log_stream_stats'),
+    path('nodes/<str:node_name>/metrics-history/', node_metrics_history, name='node_metrics_history'),
 
     # Pods
     path('pods/', all_pods_page, name='all_pods_page'),
+    path('pods/data/', all_pods_data, name='all_pods_data'),
+    path('pods/<str:namespace>/stream-logs/', stream_selector_logs, name='stream_selector_logs'),
     path('pods/<str:namespace>/<str:pod_name>/', pod_details_page, name='pod_details_page'),
     path('pods/<str:namespace>/<str:pod_name>/json/', pod_json_page, name='pod_json_page'),
     path('pods/<str:namespace>/<str:pod_name>/download_json/', download_pod_json, name='download_pod_json'),
+    path('pods/<str:namespace>/<str:pod_name>/metrics-history/', pod_metrics_history, name='pod_metrics_history'),
     path('pods/<str:namespace>/<str:pod_name>/stream-logs/<str:container_name>/', stream_pod_logs,
          name='stream_pod_logs'),
+    path('pods/<str:namespace>/<str:pod_name>/download-logs/<str:container_name>/', download_pod_logs,
+         name='download_pod_logs'),
 
     # Events
     path('events/', all_events_page, name='all_events_page'),
+    path('events/data/', all_events_data, name='all_events_data'),
     path('events/<str:namespace>/<str:event_name>/', event_detail_page, name='event_detail_page'),
 
     # Ingresses
     path('ingresses/<str:namespace>/<str:name>/', ingress_detail, name='ingress_detail'),
     path('ingresses/', all_ingresses_page, name='all_ingresses_page'),
+    path('ingresses/data/', all_ingresses_data, name='all_ingresses_data'),
 
     # ConfigMaps
     path('configmaps/', all_config_maps_page, name='all_config_maps_page'),
@@ -1,56 +1,58 @@
 # appConfig/utils.py
 
-import threading
-from pathlib import Path
+from asgiref.sync import sync_to_async
 
 from appConfig.kubeconfig import load_kubeconfig, list_kubeconfigs
 from appConfig.settings import logger
 
-# Define a semaphore with a maximum number of concurrent streams
-MAX_CONCURRENT_STREAMS = 10  # Adjust based on your server's capacity
-log_stream_semaphore = threading.Semaphore(MAX_CONCURRENT_STREAMS)
-
-def acquire_stream_semaphore():
+def get_cluster_client(request):
     """
-    Acquires the semaphore for a new log stream.
-    Returns True if acquired, False otherwise.
+    Retrieves the currently selected ClusterClient based on the user's session.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        ClusterClient: The selected ClusterClient instance.
+        str: An error message if something goes wrong, otherwise None.
     """
-    acquired = log_stream_semaphore.acquire(blocking=False)
-    if not acquired:
-        logger.warning("Failed to acquire semaphore for new log stream.")
-    return acquired
+    return get_cluster_client_for_session(request.session)
 
-def release_stream_semaphore():
+async def aget_cluster_client(request):
     """
-    Releases the semaphore when a log stream is closed.
+    Async variant of get_cluster_client, for async views.
+
+    Loading the session and the kubeconfig is synchronous, so it runs in a worker thread.
     """
-    log_stream_semaphore.release()
+    return await sync_to_async(get_cluster_client)(request)
 
-def get_cluster_client(request):
+def get_cluster_client_for_session(session):
     """
-    Retrieves the currently selected ClusterClient based on the user's session.
+    Retrieves the ClusterClient selected in a session.
+
+    Used directly by WebSocket consumers, which have a session in their scope but no request.
+    The session may hit the database, so call it through sync_to_async from async code.
 
     Args:
-        request (HttpRequest): The incoming HTTP request.
+        session (SessionBase): The user's session.
 
     Returns:
         ClusterClient: The selected ClusterClient instance.
         str: An error message if something goes wrong, otherwise None.
     """
-    selected_kubeconfig = request.session.get('selected_kubeconfig')
+    selected_kubeconfig = session.get('selected_kubeconfig')
 
     if not selected_kubeconfig:
         error_message = "No Kubernetes kubeconfig is selected."
         logger.error(error_message)
         return None, error_message
 
-    kubeconfig_files = [kc.name for kc in list_kubeconfigs()]
-    if selected_kubeconfig not in kubeconfig_files:
+    kubeconfig_path = next((kc for kc in list_kubeconfigs() if kc.name == selected_kubeconfig), None)
+    if kubeconfig_path is None:
         error_message = f"Selected kubeconfig '{selected_kubeconfig}' is not available."
         logger.error(error_message)
         return None, error_message
 
-    kubeconfig_path = Path("kubeConfigs") / selected_kubeconfig
     cluster = load_kubeconfig(kubeconfig_path)
 
     if not cluster:
@@ -58,4 +60,26 @@ def get_cluster_client(request):
         logger.error(error_message)
         return None, error_message
 
-    return cluster, None
\ No newline at end of file
+    return cluster, None
+
+def format_label_selector(selector):
+    """
+    Formats a V1LabelSelector (e.g. a Deployment's spec.selector) as a label selector string.
+
+    Args:
+        selector (V1LabelSelector): The selector, or None.
+
+    Returns:
+        str: e.g. 'app=web,tier in (a,b)', or '' if the selector is empty.
+    """
+    if not selector:
+        return ''
+    parts = [f"{key}={value}" for key, value in (selector.match_labels or {}).items()]
+    for expression in selector.match_expressions or []:
+        if expression.operator == 'Exists':
+            parts.append(expression.key)
+        elif expression.operator == 'DoesNotExist':
+            parts.append(f"!{expression.key}")
+        else:
+            parts.append(f"{expression.key} {expression.operator.lower()} ({','.join(expression.values or [])})")
+    return ','.join(parts)
@@ -0,0 +1,402 @@
+# appConfig/watchstream.py
+
+import asyncio
+import threading
+from collections import deque
+
+from kubernetes import watch
+from kubernetes.client.exceptions import ApiException
+
+from appConfig.informers import CLUSTER_SCOPED_RESOURCES, get_list_function
+from appConfig.pager import HTTP_STATUS_GONE, iter_list_pages
+from appConfig.settings import (
+    logger, KUBE_INFORMER_WATCH_TIMEOUT, KUBE_INFORMER_RETRY_SECONDS, KUBE_LIST_PAGE_SIZE, KUBE_WATCH_REPLAY_EVENTS
+)
+
+# Watch events waiting for the dispatcher; beyond this the shared watch starts over with a fresh snapshot.
+_DISPATCH_QUEUE_EVENTS = 10000
+
+
+class ResourceWatch:
+    """
+    Streams changes of one resource type (optionally one namespace) as plain-dict events.
+
+    Runs list+watch in a background thread and hands every event to on_event:
+
+    - {'type': 'SNAPSHOT', 'objects': [...], 'resourceVersion': rv, 'complete': bool}, one
+      per list page, sent when no resourceVersion was given or after it expired;
+    - {'type': 'ADDED' | 'MODIFIED' | 'DELETED', 'object': {...}, 'resourceVersion': rv};
+    - {'type': 'BOOKMARK', 'resourceVersion': rv};
+    - {'type': 'EXPIRED', 'resourceVersion': rv} when the apiserver no longer has the
+      requested resourceVersion (a fresh SNAPSHOT follows);
+    - {'type': 'ERROR', 'message': str} on other failures (the watch is retried).
+
+    Objects are the JSON dicts sent by the apiserver. When started with a resourceVersion
+    the watch resumes from it, so a reconnecting client only receives what it missed.
+    """
+    def __init__(self, cluster_client, resource_type, on_event, namespace=None, resource_version=None):
+        self.cluster_name = cluster_client.name
+        self.resource_type = resource_type
+        self.namespace = None if resource_type in CLUSTER_SCOPED_RESOURCES else namespace
+        self.list_func = get_list_function(cluster_client, resource_type)
+        self.on_event = on_event
+        self.resource_version = resource_version
+        self._stopped = threading.Event()
+        self._resync = threading.Event()
+        self._watch = None
+        self._thread = None
+
+    @property
+    def _selector_kwargs(self):
+        if self.namespace:
+            return {'field_selector': f"metadata.namespace={self.namespace}"}
+        return {}
+
+    def start(self):
+        """
+        Starts the background thread.
+        """
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"watch-{self.cluster_name}-{self.resource_type}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread and ends the current watch.
+        """
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+
+    def resync(self):
+        """
+        Ends the current list or watch and starts over: an EXPIRED event is sent, then a
+        fresh SNAPSHOT.
+        """
+        self._resync.set()
+        if self._watch:
+            self._watch.stop()
+
+    def _snapshot(self):
+        pages = iter_list_pages(self.list_func, resume_expired=False, raw=True, **self._selector_kwargs)
+        page = next(pages)
+        while page is not None:
+            if self._resync.is_set():
+                return
+            next_page = next(pages, None)
+            self.resource_version = page.metadata.resource_version
+            self.on_event({
+                'type': 'SNAPSHOT',
+                'objects': page.to_dict().get('items') or [],
+                'resourceVersion': self.resource_version,
+                'complete': next_page is None,
+            })
+            page = next_page
+
+    def _watch_once(self):
+        self._watch = watch.Watch()
+        stream = self._watch.stream(
+            self.list_func,
+            resource_version=self.resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=KUBE_INFORMER_WATCH_TIMEOUT,
+            **self._selector_kwargs,
+        )
+        for event in stream:
+            if self._stopped.is_set() or self._resync.is_set():
+                break
+            raw_object = event['raw_object']
+            self.resource_version = raw_object['metadata']['resourceVersion']
+            if event['type'] == 'BOOKMARK':
+                self.on_event({'type': 'BOOKMARK', 'resourceVersion': self.resource_version})
+                continue
+            self.on_event({'type': event['type'], 'object': raw_object, 'resourceVersion': self.resource_version})
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if self._resync.is_set():
+                self._resync.clear()
+                self.on_event({'type': 'EXPIRED', 'resourceVersion': self.resource_version})
+                self.resource_version = None
+            try:
+                if self.resource_version is None:
+                    self._snapshot()
+                if not self._resync.is_set():
+                    self._watch_once()
+            except ApiException as e:
+                if self._stopped.is_set():
+                    break
+                if e.status == HTTP_STATUS_GONE:
+                    logger.info(
+                        f"resourceVersion {self.resource_version} for {self.resource_type} on cluster "
+                        f"'{self.cluster_name}' expired; sending a new snapshot."
+                    )
+                    self.on_event({'type': 'EXPIRED', 'resourceVersion': self.resource_version})
+                    self.resource_version = None
+                    continue
+                logger.error(f"Watch for {self.resource_type} on cluster '{self.cluster_name}' failed: {e}")
+                self.on_event({'type': 'ERROR', 'message': f"API Error: {e.reason}"})
+                self._stopped.wait(KUBE_INFORMER_RETRY_SECONDS)
+            except Exception as e:
+                if self._stopped.is_set():
+                    break
+                logger.error(f"Watch for {self.resource_type} on cluster '{self.cluster_name}' failed: {e}")
+                self.on_event({'type': 'ERROR', 'message': str(e)})
+                self._stopped.wait(KUBE_INFORMER_RETRY_SECONDS)
+
+
+def format_watch_event(resource_type, event):
+    """
+    Converts a ResourceWatch delta, bookmark, expiry or error into the message sent to the browser.
+    """
+    event_type = event['type']
+    if event_type == 'BOOKMARK':
+        return {'type': 'bookmark', 'resourceType': resource_type, 'resourceVersion': event['resourceVersion']}
+    if event_type == 'EXPIRED':
+        # The client's state is too old to resume; a new snapshot follows.
+        return {'type': 'resync', 'resourceType': resource_type, 'resourceVersion': event['resourceVersion']}
+    if event_type == 'ERROR':
+        return {'type': 'error', 'message': event['message']}
+    return {
+        'type': 'delta',
+        'resourceType': resource_type,
+        'eventType': event_type,
+        'resource': event['object'],
+        'resourceVersion': event['resourceVersion'],
+    }
+
+
+def _object_key(obj):
+    metadata = obj.get('metadata') or {}
+    return metadata.get('namespace'), metadata.get('name')
+
+
+class SharedWatch:
+    """
+    One upstream ResourceWatch shared by every WebSocket subscribed to the same
+    (cluster, resource type, namespace).
+
+    Events are applied to an in-memory store and fanned out to every subscriber's
+    asyncio.Queue, which the subscribing consumer drains into its WebSocket. The queues
+    are not bounded like a channel layer's, so a long replay or a burst of deltas is
+    never dropped. New subscribers get a snapshot of the store; reconnecting subscribers whose last
+    resourceVersion is still in the replay buffer only get the deltas they missed.
+    All methods run on the event loop; the watch thread hands events over thread-safely
+    through a bounded queue. If the dispatcher falls that far behind, the queued events
+    are dropped and subscribers get a resync followed by a fresh snapshot.
+    """
+    def __init__(self, key, cluster_client, resource_type, namespace, loop):
+        self.key = key
+        self.resource_type = resource_type
+        self.subscribers = {}  # Channel name -> the queue its consumer sends from
+        self.store = {}
+        self.resource_version = None
+        self.synced = False
+        self.recent = deque(maxlen=KUBE_WATCH_REPLAY_EVENTS)
+        self._snapshot = {}
+        self._lock = asyncio.Lock()
+        self._queue = asyncio.Queue(maxsize=_DISPATCH_QUEUE_EVENTS)
+        self._overflowed = False
+        # Keeps the client open while the watch runs, even if the registry drops it meanwhile.
+        self.cluster_client = cluster_client
+        cluster_client.acquire()
+        self.watch = ResourceWatch(
+            cluster_client,
+            resource_type,
+            on_event=lambda event: loop.call_soon_threadsafe(self._enqueue, event),
+            namespace=namespace,
+        )
+        self.watch.start()
+        self._task = loop.create_task(self._dispatch())
+
+    def _snapshot_messages(self):
+        objects = list(self.store.values())
+        for start in range(0, max(len(objects), 1), KUBE_LIST_PAGE_SIZE):
+            yield {
+                'type': 'snapshot',
+                'resourceType': self.resource_type,
+                'resources': objects[start:start + KUBE_LIST_PAGE_SIZE],
+                'resourceVersion': self.resource_version,
+                'complete': start + KUBE_LIST_PAGE_SIZE >= len(objects),
+            }
+
+    def _send(self, message):
+        for queue in self.subscribers.values():
+            queue.put_nowait(message)
+
+    async def _apply(self, event):
+        event_type = event['type']
+        if event_type == 'SNAPSHOT':
+            for obj in event['objects']:
+                self._snapshot[_object_key(obj)] = obj
+            if event['complete']:
+                self.store, self._snapshot = self._snapshot, {}
+                self.resource_version = event['resourceVersion']
+                self.recent.clear()
+                self.synced = True
+                for message in self._snapshot_messages():
+                    self._send(message)
+            return
+
+        if event_type in ('ADDED', 'MODIFIED', 'DELETED'):
+            if event_type == 'DELETED':
+                self.store.pop(_object_key(event['object']), None)
+            else:
+                self.store[_object_key(event['object'])] = event['object']
+        elif event_type == 'EXPIRED':
+            self.synced = False
+            self._snapshot = {}
+
+        message = format_watch_event(self.resource_type, event)
+        if event.get('resourceVersion') and event_type != 'EXPIRED':
+            self.resource_version = event['resourceVersion']
+            self.recent.append(message)
+        self._send(message)
+
+    def _enqueue(self, event):
+        if self._overflowed:
+            # Events are dropped until the watch starts over; an EXPIRED is always followed by a full snapshot.
+            if event['type'] != 'EXPIRED':
+                return
+            self._overflowed = False
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(
+                f"Shared {self.resource_type} watch {self.key} fell {self._queue.qsize()} events behind; "
+                f"starting over with a fresh snapshot."
+            )
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._overflowed = True
+            self.watch.resync()
+
+    async def _dispatch(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                async with self._lock:
+                    await self._apply(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # One bad event must not end the fan-out of the ones after it.
+                logger.error(f"Error dispatching {event['type']} event of the {self.resource_type} watch: {e}")
+
+    async def add(self, channel_name, queue, resource_version=None):
+        """
+        Subscribes a channel and brings it up to date.
+
+        The messages that bring it up to date are queued before the channel is registered,
+        so a failure leaves nothing subscribed.
+
+        Args:
+            channel_name (str): The subscribing consumer's channel name.
+            queue (asyncio.Queue): Receives the watch messages for the consumer to send.
+            resource_version (str): The last resourceVersion the client saw, if any.
+        """
+        async with self._lock:
+            # Until synced, the snapshot is sent to every subscriber once the upstream list completes.
+            if self.synced and not (resource_version and resource_version == self.resource_version):
+                replay = None
+                if resource_version:
+                    for index, message in enumerate(self.recent):
+                        if message.get('resourceVersion') == resource_version:
+                            replay = list(self.recent)[index + 1:]
+                            break
+                if replay is None:
+                    if resource_version:
+                        queue.put_nowait({'type': 'resync', 'resourceType': self.resource_type,
+                                          'resourceVersion': resource_version})
+                    replay = list(self._snapshot_messages())
+                for message in replay:
+                    queue.put_nowait(message)
+            self.subscribers[channel_name] = queue
+
+    def remove(self, channel_name):
+        """
+        Unsubscribes a channel.
+        """
+        self.subscribers.pop(channel_name, None)
+
+    def close(self):
+        """
+        Stops the upstream watch and the dispatcher.
+        """
+        self.watch.stop()
+        self._task.cancel()
+        self.cluster_client.release()
+
+
+class WatchMultiplexer:
+    """
+    Shares upstream watches between WebSocket subscribers.
+
+    Watches are keyed by (kubeconfig file, resource type, namespace) and reference-counted
+    by subscribed channels, so the apiserver sees one watch per key no matter how many
+    browser tabs are open. The watch is stopped when its last subscriber leaves.
+    """
+    def __init__(self):
+        self._watches = {}
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, cluster_client, resource_type, namespace, channel_name, queue, resource_version=None):
+        """
+        Subscribes a channel to a resource type, starting the upstream watch if needed.
+
+        Args:
+            queue (asyncio.Queue): Receives the channel's watch messages (see SharedWatch.add).
+
+        Returns:
+            tuple: The subscription key, to be passed to unsubscribe.
+        """
+        if resource_type in CLUSTER_SCOPED_RESOURCES:
+            namespace = None
+        key = (cluster_client.kubeconfig_file, resource_type, namespace or '')
+        while True:
+            async with self._lock:
+                shared = self._watches.get(key)
+                if shared is None:
+                    shared = SharedWatch(key, cluster_client, resource_type, namespace, asyncio.get_running_loop())
+                    self._watches[key] = shared
+                    logger.info(f"Started shared {resource_type} watch for {key}.")
+            try:
+                await shared.add(channel_name, queue, resource_version)
+            except BaseException:
+                # Do not leave a watch started for this channel running without subscribers.
+                self._stop_if_unused(key, shared)
+                raise
+            async with self._lock:
+                if self._watches.get(key) is shared:
+                    return key
+            # The last subscriber left and closed the watch before this channel was added; start over.
+            shared.remove(channel_name)
+
+    async def unsubscribe(self, key, channel_name):
+        """
+        Unsubscribes a channel; stops the upstream watch when nobody is left.
+        """
+        async with self._lock:
+            shared = self._watches.get(key)
+            if shared is None:
+                return
+            shared.remove(channel_name)
+            self._stop_if_unused(key, shared)
+
+    def _stop_if_unused(self, key, shared):
+        if not shared.subscribers and self._watches.get(key) is shared:
+            shared.close()
+            del self._watches[key]
+            logger.info(f"Stopped shared {shared.resource_type} watch for {key}.")
+
+    def stats(self):
+        """
+        Returns the number of subscribers per shared watch.
+        """
+        return {key: len(shared.subscribers) for key, shared in self._watches.items()}
+
+
+watch_multiplexer = WatchMultiplexer()
@@ -1,14 +1,21 @@
-import json
 import asyncio
+import json
+from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
-from appConfig.utils import get_cluster_client
+from appConfig.informers import INFORMER_RESOURCES
+from appConfig.utils import get_cluster_client_for_session
 from appConfig.settings import logger
-from kubernetes.client.exceptions import ApiException
+from appConfig.watchstream import watch_multiplexer
 
 
 class KubernetesResourceConsumer(AsyncWebsocketConsumer):
     """
     WebSocket consumer for real-time Kubernetes resource updates.
+
+    On subscribe the consumer joins the shared watch of the resource type in the session's
+    cluster (see WatchMultiplexer) and receives ADDED/MODIFIED/DELETED deltas with their
+    resourceVersion. A client that sends the last resourceVersion it saw only gets the
+    deltas it missed; otherwise it first receives a snapshot of the current objects.
     """
     
     async def connect(self):
@@ -17,14 +24,16 @@ class KubernetesResourceConsumer(AsyncWebsocketConsumer):
         """
         # Extract resource type from the URL path
         self.resource_type = self.scope['url_route']['kwargs'].get('resource_type')
-        
-        if not self.resource_type:
-            await self.close(code=4000)
-            return
+        self.subscription = None
+        self.sender_task = None
         
         # Create a unique group name for this resource type
         self.group_name = f"k8s_{self.resource_type}"
         
+        if self.resource_type not in INFORMER_RESOURCES:
+            await self.close(code=4000)
+            return
+        
         # Join the group
         await self.channel_layer.group_add(
             self.group_name,
@@ -39,6 +48,8 @@ class KubernetesResourceConsumer(AsyncWebsocketConsumer):
         """
         Called when the WebSocket closes for any reason.
         """
+        await self.stop_watch()
+
         # Leave the group
         await self.channel_layer.group_discard(
             self.group_name,
@@ -60,9 +71,14 @@ class KubernetesResourceConsumer(AsyncWebsocketConsumer):
                 
                 # Store namespace in the consumer instance for later use
                 self.namespace = namespace
+
+                cluster, error = await sync_to_async(get_cluster_client_for_session)(self.scope['session'])
+                if error:
+                    await self.send(text_data=json.dumps({'type': 'error', 'message': error}))
+                    return
                 
-                # Start the background task to fetch resource updates
-                asyncio.create_task(self.fetch_resource_updates())
+                # Start watching; resume from the client's last resourceVersion if it sent one
+                await self.start_watch(cluster, namespace, data.get('resourceVersion'))
                 
                 await self.send(text_data=json.dumps({
                     'type': 'subscription_success',
@@ -72,6 +88,7 @@ class KubernetesResourceConsumer(AsyncWebsocketConsumer):
             
             elif action == 'unsubscribe':
                 # Handle unsubscription
+                await self.stop_watch()
                 await self.send(text_data=json.dumps({
                     'type': 'unsubscription_success',
                     'resourceType': self.resource_type
@@ -103,46 +120,38 @@ class KubernetesResourceConsumer(AsyncWebsocketConsumer):
         # Forward the update to the WebSocket
         await self.send(text_data=json.dumps(event))
     
-    async def fetch_resource_updates(self):
+    async def start_watch(self, cluster, namespace, resource_version):
+        """
+        Subscribes this WebSocket to the shared watch for the resource type.
+        """
+        await self.stop_watch()
+        queue = asyncio.Queue()
+        self.subscription = await watch_multiplexer.subscribe(
+            cluster, self.resource_type, namespace, self.channel_name, queue, resource_version
+        )
+        self.sender_task = asyncio.create_task(self.send_watch_messages(queue))
+
+    async def stop_watch(self):
+        """
+        Leaves the current shared watch, if any.
+        """
+        if self.subscription:
+            await watch_multiplexer.unsubscribe(self.subscription, self.channel_name)
+            self.subscription = None
+        if self.sender_task:
+            self.sender_task.cancel()
+            self.sender_task = None
+
+    async def send_watch_messages(self, queue):
         """
-        Background task to periodically fetch resource updates.
+        Background task that sends the shared watch's messages to the WebSocket as they arrive.
         """
         try:
-            # Continue fetching updates until the connection is closed
             while True:
-                # Wait for a specified interval (e.g., 5 seconds)
-                await asyncio.sleep(5)
-                
-                # Fetch the resources
-                resources = await self.get_resources()
-                
-                # Send the update to the group
-                await self.channel_layer.group_send(
-                    self.group_name,
-                    {
-                        'type': 'resource_update',
-                        'resourceType': self.resource_type,
-                        'resources': resources
-                    }
-                )
-        
+                message = await queue.get()
+                await self.send(text_data=json.dumps(message))
         except asyncio.CancelledError:
             # Task was cancelled, clean up
-            logger.info(f"Resource update task cancelled for {self.resource_type}")
+            logger.info(f"Resource watch task cancelled for {self.resource_type}")
         except Exception as e:
-            logger.error(f"Error in fetch_resource_updates: {e}")
-            await self.send(text_data=json.dumps({
-                'type': 'error',
-                'message': f"Error fetching resource updates: {str(e)}"
-            }))
-    
-    async def get_resources(self):
-        """
-        Fetch resources from the Kubernetes API.
-        This is a placeholder that should be implemented in the actual application.
-        """
-        # This would be implemented to use the Django views or direct API calls
-        # to fetch the resources based on the resource_type and namespace
-        
-        # For now, return an empty list as a placeholder
-        return []
\ No newline at end of file
+            logger.error(f"Error in send_watch_messages: {e}")
@@ -0,0 +1,137 @@
+# kubeBoard/management/commands/benchmark_async_views.py
+
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+from django.core.management.base import BaseCommand
+
+from appConfig.asyncclient import aiter_list_items, get_async_client, get_async_list_function
+from appConfig.informers import get_list_function
+from appConfig.kubeconfig import create_cluster_client
+from appConfig.pager import iter_list_items
+from appConfig.settings import KUBE_RAW_LISTS
+from kubeBoard.management.commands.benchmark_list_decoding import _synthetic_pod_list
+
+
+class _SlowApiserver(ThreadingHTTPServer):
+    """
+    Answers every pod list with the same body after a fixed delay, like a slow cluster.
+    """
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, body, latency):
+        self.body = body
+        self.latency = latency
+        super().__init__(('127.0.0.1', 0), _SlowApiserverHandler)
+
+
+class _SlowApiserverHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_kubeconfig(directory, server_url):
+    path = os.path.join(directory, 'benchmark.yaml')
+    with open(path, 'w') as f:
+        yaml.safe_dump({
+            'apiVersion': 'v1',
+            'kind': 'Config',
+            'clusters': [{'name': 'benchmark', 'cluster': {'server': server_url}}],
+            'users': [{'name': 'benchmark', 'user': {'token': 'benchmark'}}],
+            'contexts': [{'name': 'benchmark', 'context': {'cluster': 'benchmark', 'user': 'benchmark'}}],
+            'current-context': 'benchmark',
+        }, f)
+    return path
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares concurrent page loads served by the sync views (a bounded worker pool) "
+        "with the async views (the asyncio Kubernetes client) against a slow local apiserver."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Concurrent page loads to simulate.")
+        parser.add_argument('--latency-ms', type=int, default=200, help="Apiserver response delay per list call.")
+        parser.add_argument('--pods', type=int, default=50, help="Pods returned by each list call.")
+        parser.add_argument(
+            '--raw', action='store_true', default=KUBE_RAW_LISTS,
+            help="Decode into RawObjects instead of models (defaults to KUBE_RAW_LISTS).",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=min(32, (os.cpu_count() or 1) + 4),
+            help="Threads available to sync views (asgiref's default executor size).",
+        )
+
+    def handle(self, *args, **options):
+        server = _SlowApiserver(_synthetic_pod_list(options['pods']), options['latency_ms'] / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        with tempfile.TemporaryDirectory() as directory:
+            kubeconfig_path = _write_kubeconfig(directory, f"http://127.0.0.1:{server.server_address[1]}")
+            cluster = create_cluster_client(kubeconfig_path)
+            try:
+                self.stdout.write(
+                    f"{options['requests']} concurrent pod list loads, {options['pods']} pods each, "
+                    f"{options['latency_ms']} ms apiserver latency, {'raw' if options['raw'] else 'model'} decoding."
+                )
+                sync_result = self._run_sync(cluster, options['requests'], options['workers'], options['raw'])
+                async_result = asyncio.run(self._run_async(cluster, options['requests'], options['raw']))
+            finally:
+                cluster.close()
+                server.shutdown()
+
+        for name, (elapsed, latencies) in (('sync', sync_result), ('async', async_result)):
+            self.stdout.write(
+                f"{name:>5}: {elapsed:.2f} s total, {len(latencies) / elapsed:,.0f} loads/sec, "
+                f"p50 {statistics.median(latencies) * 1000:.0f} ms, "
+                f"p95 {statistics.quantiles(latencies, n=20)[-1] * 1000:.0f} ms"
+            )
+        self.stdout.write(self.style.SUCCESS(f"async/sync throughput: {sync_result[0] / async_result[0]:.1f}x"))
+
+    def _run_sync(self, cluster, requests, workers, raw):
+        list_func = get_list_function(cluster, 'pods')
+        started = time.perf_counter()
+
+        def load():
+            # Latency is measured from when the page load arrives, including time queued for a worker.
+            list(iter_list_items(list_func, raw=raw))
+            return time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            latencies = list(executor.map(lambda _: load(), range(requests)))
+        return time.perf_counter() - started, latencies
+
+    async def _run_async(self, cluster, requests, raw):
+        async_cluster = await get_async_client(cluster)
+        list_func = get_async_list_function(async_cluster, 'pods')
+        started = time.perf_counter()
+
+        async def load():
+            [item async for item in aiter_list_items(list_func, raw=raw)]
+            return time.perf_counter() - started
+
+        try:
+            latencies = await asyncio.gather(*(load() for _ in range(requests)))
+            return time.perf_counter() - started, latencies
+        finally:
+            await async_cluster.close()
+            cluster.async_clients.clear()
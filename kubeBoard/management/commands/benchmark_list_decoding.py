@@ -0,0 +1,117 @@
+# kubeBoard/management/commands/benchmark_list_decoding.py
+
+import inspect
+import json
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from kubernetes import client
+
+from appConfig.kubeconfig import list_kubeconfigs, load_kubeconfig
+from appConfig.pager import iter_list_items
+from appConfig.rawjson import RawObject, json_loads, orjson
+
+
+class _Body:
+    """
+    Stands in for the urllib3 response that ApiClient.deserialize reads.
+    """
+    def __init__(self, data):
+        self.data = data
+
+
+def _deserialize(api_client, body, response_type):
+    # Newer kubernetes clients take the response text and content type instead of the response.
+    if 'content_type' in inspect.signature(api_client.deserialize).parameters:
+        return api_client.deserialize(body.decode(), response_type, 'application/json')
+    return api_client.deserialize(_Body(body), response_type)
+
+
+def _synthetic_pod_list(count):
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
+    pods = []
+    for i in range(count):
+        pods.append({
+            'metadata': {
+                'name': f"pod-{i}",
+                'namespace': f"namespace-{i % 50}",
+                'uid': f"00000000-0000-0000-0000-{i:012d}",
+                'creationTimestamp': created,
+                'labels': {'app': f"app-{i % 200}", 'pod-template-hash': 'abcdef1234'},
+            },
+            'spec': {
+                'nodeName': f"node-{i % 100}",
+                'containers': [
+                    {'name': 'app', 'image': 'example/app:1.0', 'resources': {'requests': {'cpu': '100m', 'memory': '128Mi'}}},
+                    {'name': 'sidecar', 'image': 'example/sidecar:1.0'},
+                ],
+            },
+            'status': {
+                'phase': 'Running',
+                'podIP': '10.0.0.1',
+                'startTime': created,
+                'containerStatuses': [
+                    {'name': 'app', 'ready': True, 'restartCount': 0, 'image': 'example/app:1.0', 'imageID': '', 'state': {'running': {'startedAt': created}}},
+                    {'name': 'sidecar', 'ready': True, 'restartCount': 1, 'image': 'example/sidecar:1.0', 'imageID': '', 'state': {'running': {'startedAt': created}}},
+                ],
+            },
+        })
+    return json.dumps({'apiVersion': 'v1', 'kind': 'PodList', 'metadata': {'resourceVersion': '1'}, 'items': pods}).encode()
+
+
+def _read_row(pod):
+    # The attributes a list view typically reads per pod.
+    running = sum(1 for status in pod.status.container_statuses or [] if status.ready)
+    return (pod.metadata.name, pod.metadata.namespace, pod.status.phase, pod.spec.node_name,
+            len(pod.spec.containers or []), running, pod.metadata.creation_timestamp)
+
+
+class Command(BaseCommand):
+    help = "Compares rows/sec of kubernetes model deserialization against the raw JSON list path."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kubeconfig', help="Kubeconfig file name to benchmark against a live cluster.")
+        parser.add_argument('--synthetic', type=int, default=20000,
+                            help="Number of generated pods to decode when no kubeconfig is given.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per path; the best run is reported.")
+
+    def handle(self, *args, **options):
+        if options['kubeconfig']:
+            paths = {
+                'model': self._live_path(options['kubeconfig'], raw=False),
+                'raw': self._live_path(options['kubeconfig'], raw=True),
+            }
+        else:
+            body = _synthetic_pod_list(options['synthetic'])
+            self.stdout.write(f"Decoding {options['synthetic']} synthetic pods ({len(body) / 1e6:.1f} MB).")
+            api_client = client.ApiClient()
+            paths = {
+                'model': lambda: [_read_row(pod) for pod in _deserialize(api_client, body, 'V1PodList').items],
+                'raw': lambda: [_read_row(pod) for pod in RawObject(json_loads(body)).items],
+            }
+
+        self.stdout.write(f"JSON decoder: {'orjson' if orjson is not None else 'json'}")
+        results = {}
+        for name, run in paths.items():
+            best = None
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                rows = len(run())
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = rows / best if best else 0
+            self.stdout.write(f"{name:>6}: {rows} rows in {best * 1000:.0f} ms ({results[name]:,.0f} rows/sec)")
+
+        if results['model']:
+            self.stdout.write(self.style.SUCCESS(f"raw/model speed-up: {results['raw'] / results['model']:.1f}x"))
+
+    def _live_path(self, kubeconfig_name, raw):
+        kubeconfig_path = next((kc for kc in list_kubeconfigs() if kc.name == kubeconfig_name), None)
+        if kubeconfig_path is None:
+            raise CommandError(f"Kubeconfig '{kubeconfig_name}' not found.")
+        cluster = load_kubeconfig(kubeconfig_path)
+        if cluster is None:
+            raise CommandError(f"Failed to load kubeconfig '{kubeconfig_name}'.")
+        list_func = cluster.core_v1.list_pod_for_all_namespaces
+        return lambda: [_read_row(pod) for pod in iter_list_items(list_func, raw=raw)]
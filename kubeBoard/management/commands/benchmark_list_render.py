@@ -0,0 +1,84 @@
+# kubeBoard/management/commands/benchmark_list_render.py
+
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import engines
+
+# How the list pages embedded their Tabulator rows before: a template loop writing JS literals...
+_LOOP_TEMPLATE = """<script>
+var rows = [
+    {% for row in rows %}
+    {
+        name: "{{ row.name }}",
+        namespace: "{{ row.namespace }}",
+        type: "{{ row.type }}",
+        cluster_ip: "{{ row.cluster_ip }}",
+        external_ip: "{{ row.external_ip }}",
+        ports: "{{ row.ports }}",
+        age: "{{ row.age }}"
+    }{% if not forloop.last %},{% endif %}
+    {% endfor %}
+];
+</script>"""
+
+# ...or json.dumps in the view, pasted into the script unescaped.
+_DUMPS_TEMPLATE = """<script>
+var rows = {{ rows_json|safe }};
+</script>"""
+
+_JSON_SCRIPT_TEMPLATE = """{% load fast_json %}{{ rows|fast_json_script:"rows-data" }}
+<script>
+var rows = JSON.parse(document.getElementById('rows-data').textContent);
+</script>"""
+
+
+def _rows(count):
+    return [
+        {
+            'name': f"service-{i}",
+            'namespace': f"namespace-{i % 50}",
+            'type': 'ClusterIP' if i % 4 else 'LoadBalancer',
+            'cluster_ip': f"10.96.{i // 256 % 256}.{i % 256}",
+            'external_ip': 'None' if i % 4 else f"lb-{i}.example.com",
+            'ports': f"{8000 + i % 100}:http/TCP, 443:https/TCP",
+            'age': f"{i % 90}d",
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures rendering a list page's table rows as template-loop JS literals, as "
+        "json.dumps pasted with |safe, and as one fast_json_script element."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help="Synthetic table rows.")
+        parser.add_argument('--repeat', type=int, default=5, help="Renders per variant; the fastest is reported.")
+
+    def handle(self, *args, **options):
+        rows = _rows(options['rows'])
+        engine = engines['django']
+        variants = {
+            'template loop': (engine.from_string(_LOOP_TEMPLATE), lambda: {'rows': rows}),
+            'json.dumps|safe': (engine.from_string(_DUMPS_TEMPLATE), lambda: {'rows_json': json.dumps(rows)}),
+            'fast_json_script': (engine.from_string(_JSON_SCRIPT_TEMPLATE), lambda: {'rows': rows}),
+        }
+        self.stdout.write(f"{len(rows)} rows, best of {options['repeat']} renders (including encoding):")
+
+        results = {}
+        for name, (template, context) in variants.items():
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                html = template.render(context())
+                timings.append(time.perf_counter() - started)
+            results[name] = min(timings)
+            self.stdout.write(f"{name:>17}: {results[name] * 1000:8.1f} ms, {len(html) / 1e6:.2f} MB")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"fast_json_script vs template loop: {results['template loop'] / results['fast_json_script']:.1f}x"
+        ))
@@ -0,0 +1,109 @@
+# kubeBoard/management/commands/benchmark_log_framing.py
+
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+
+from appConfig.logstream import LOG_FRAMINGS, frame_log_lines, iter_log_lines
+from appConfig.settings import KUBE_LOG_BATCH_BYTES, KUBE_LOG_BATCH_MS, KUBE_LOG_READ_CHUNK_SIZE
+
+
+class _Content:
+    """
+    Stands in for aiohttp's StreamReader, handing out a log body in read-sized chunks.
+    """
+    def __init__(self, body, rate):
+        self.body = body
+        self.rate = rate
+
+    async def iter_chunked(self, chunk_size):
+        started = time.perf_counter()
+        for offset in range(0, len(self.body), chunk_size):
+            if self.rate:
+                # Pace the chunks like a pod writing `rate` bytes per second.
+                delay = started + offset / self.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+            yield self.body[offset:offset + chunk_size]
+
+
+class _Response:
+    def __init__(self, body, rate):
+        self.content = _Content(body, rate)
+
+
+def _log_body(lines, line_bytes):
+    prefix = '2024-01-01T00:00:00.000000000Z INFO request handled id='
+    line = (prefix + 'x' * max(line_bytes - len(prefix) - 8, 0)).encode()
+    return b''.join(line + b'%08d\n' % i for i in range(lines))
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures pod log stream throughput with one SSE message per line versus batched "
+        "messages, writing every message to a local socket."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=200000, help="Log lines to stream.")
+        parser.add_argument('--line-bytes', type=int, default=120, help="Approximate length of each line.")
+        parser.add_argument(
+            '--lines-per-second', type=int, default=0,
+            help="Pace the stream like a chatty pod instead of reading as fast as possible.",
+        )
+        parser.add_argument('--batch-ms', type=int, default=KUBE_LOG_BATCH_MS)
+        parser.add_argument('--batch-bytes', type=int, default=KUBE_LOG_BATCH_BYTES)
+
+    def handle(self, *args, **options):
+        body = _log_body(options['lines'], options['line_bytes'])
+        rate = options['lines_per_second'] * len(body) / options['lines'] if options['lines_per_second'] else 0
+        self.stdout.write(
+            f"{options['lines']} lines, {len(body) / 1e6:.1f} MB"
+            + (f", paced at {options['lines_per_second']} lines/sec." if rate else ", unpaced.")
+        )
+
+        results = {}
+        for framing in LOG_FRAMINGS:
+            elapsed, messages, sent = asyncio.run(
+                self._run(body, rate, framing, options['batch_ms'] / 1000, options['batch_bytes'])
+            )
+            results[framing] = elapsed
+            self.stdout.write(
+                f"{framing:>6}: {elapsed:.2f} s, {options['lines'] / elapsed:,.0f} lines/sec, "
+                f"{messages:,} SSE events ({messages / elapsed:,.0f}/sec), {sent / 1e6:.1f} MB sent"
+            )
+        if not rate:
+            self.stdout.write(self.style.SUCCESS(
+                f"batch/lines throughput: {results['lines'] / results['batch']:.1f}x"
+            ))
+
+    async def _run(self, body, rate, framing, max_delay, max_bytes):
+        # Every SSE message is written to a local socket and drained, as the ASGI server would.
+        drained = asyncio.Event()
+
+        async def discard(reader, writer):
+            while await reader.read(1024 * 1024):
+                pass
+            writer.close()
+            drained.set()
+
+        server = await asyncio.start_server(discard, '127.0.0.1', 0)
+        _, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        lines = iter_log_lines(_Response(body, rate), chunk_size=KUBE_LOG_READ_CHUNK_SIZE)
+        messages = sent = 0
+        started = time.perf_counter()
+        try:
+            async for message in frame_log_lines(lines, framing, max_delay, max_bytes):
+                data = message.encode()
+                writer.write(data)
+                await writer.drain()
+                messages += 1
+                sent += len(data)
+            return time.perf_counter() - started, messages, sent
+        finally:
+            writer.close()
+            await drained.wait()
+            server.close()
@@ -1,74 +1,21 @@
 # kubeBoard/views.py
 
-import json
-from collections import defaultdict
 from datetime import datetime, timezone
 
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.views.decorators.http import require_POST
 from kubernetes.client.exceptions import ApiException
 
-from appConfig.kubeconfig import list_kubeconfigs
-from appConfig.settings import logger
+from appConfig.fanout import fetch_concurrently
+from appConfig.kubeconfig import list_kubeconfigs, list_cached_items
+from appConfig.metadata import count_managed_keys, list_object_metadata
+from appConfig.metricshistory import summarize_pod_metrics
+from appConfig.podtable import PodTable, get_pod_table
+from appConfig.quantity import TO_MILLICORES, TO_MIB, parse_quantities
+from appConfig.settings import logger, KUBE_METRICS_SAMPLER_ENABLED
 from appConfig.utils import get_cluster_client
-
-
-def parse_cpu(cpu_str):
-    """
-    Parses CPU usage strings from Kubernetes metrics and converts to millicores.
-
-    Args:
-        cpu_str (str): CPU usage string (e.g., '500m', '1', '250n').
-
-    Returns:
-        float: CPU usage in millicores.
-    """
-    try:
-        if cpu_str.endswith('n'):
-            # nano cores
-            return float(cpu_str[:-1]) / 1e6  # millicores
-        elif cpu_str.endswith('u'):
-            # micro cores
-            return float(cpu_str[:-1]) / 1e3  # millicores
-        elif cpu_str.endswith('m'):
-            return float(cpu_str[:-1])  # millicores
-        else:
-            # assuming it's in cores
-            return float(cpu_str) * 1000  # millicores
-    except ValueError as e:
-        logger.error(f"Error parsing CPU string '{cpu_str}': {e}")
-        return 0.0
-
-
-def parse_ram(ram_str):
-    """
-    Parses RAM usage strings from Kubernetes metrics and converts to MiB.
-
-    Args:
-        ram_str (str): RAM usage string (e.g., '256Mi', '1Gi', '512Ki').
-
-    Returns:
-        float: RAM usage in MiB.
-    """
-    try:
-        if ram_str.endswith('Ki'):
-            return float(ram_str[:-2]) / 1024
-        elif ram_str.endswith('Mi'):
-            return float(ram_str[:-2])
-        elif ram_str.endswith('Gi'):
-            return float(ram_str[:-2]) * 1024
-        elif ram_str.endswith('Ti'):
-            return float(ram_str[:-2]) * 1024 * 1024
-        elif ram_str.endswith('n'):
-            # Unlikely, set to 0
-            return 0.0
-        else:
-            # Unknown unit, set to 0
-            logger.warning(f"Unknown RAM unit in '{ram_str}'")
-            return 0.0
-    except ValueError as e:
-        logger.error(f"Error parsing RAM string '{ram_str}': {e}")
-        return 0.0
+from kubeEvents.index import EventIndex
 
 
 def format_event(event, kubeconfig_file):
@@ -97,19 +44,6 @@ def format_event(event, kubeconfig_file):
     }
 
 
-def format_pod_event(event):
-    """Formats an event related to a pod."""
-    first_seen = event.first_timestamp.replace(tzinfo=timezone.utc).astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S") if event.first_timestamp else ''
-    last_seen = event.last_timestamp.replace(tzinfo=timezone.utc).astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S") if event.last_timestamp else ''
-    return {
-        'type': event.type,
-        'reason': event.reason,
-        'message': event.message,
-        'first_seen': first_seen,
-        'last_seen': last_seen,
-    }
-
-
 def index_page(request):
     """
     Renders the main dashboard page with data from the selected Kubernetes cluster.
@@ -119,137 +53,97 @@ def index_page(request):
         if error:
             return render(request, 'kubeBoard/index.html', {'error': error})
 
-        # Retrieve namespaces
-        try:
-            all_namespaces = cluster.core_v1.list_namespace().items
-        except ApiException as e:
-            logger.error(f"Failed to retrieve namespaces for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            all_namespaces = []
-
-        # Retrieve pods
-        try:
-            all_pods = cluster.core_v1.list_pod_for_all_namespaces().items
-        except ApiException as e:
-            logger.error(f"Failed to retrieve pods for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            all_pods = []
-
-        # Retrieve events
-        try:
-            events = cluster.core_v1.list_event_for_all_namespaces(limit=1000).items
-        except ApiException as e:
-            logger.error(f"Failed to retrieve events for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            events = []
-
-        # Retrieve nodes
-        try:
-            all_nodes = cluster.core_v1.list_node().items
-        except ApiException as e:
-            logger.error(f"Failed to retrieve nodes for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            all_nodes = []
-
-        # Retrieve metrics (CPU and RAM)
-        try:
-            metrics = cluster.metrics_api.list_cluster_custom_object(
+        # Pod usage comes from the background metrics sampler while its latest sample is fresh
+        sampler = cluster.get_metrics_sampler() if KUBE_METRICS_SAMPLER_ENABLED else None
+        sampled = sampler is not None and sampler.has_fresh_sample
+
+        # Retrieve every section concurrently; a failing section falls back to an empty list
+        sources = {
+            'namespaces': (lambda timeout: list_cached_items(cluster, 'namespaces', request_timeout=timeout), []),
+            'pods': (lambda timeout: get_pod_table(cluster, request_timeout=timeout), PodTable.from_pods([])),
+            'events': (lambda timeout: list_cached_items(cluster, 'events', limit=1000, request_timeout=timeout), []),
+            'nodes': (lambda timeout: list_cached_items(cluster, 'nodes', request_timeout=timeout), []),
+            'ingresses': (lambda timeout: list_cached_items(cluster, 'ingresses', request_timeout=timeout), []),
+            'configmaps': (lambda timeout: list_object_metadata(cluster, 'configmaps', request_timeout=timeout), []),
+            'deployments': (lambda timeout: list_cached_items(cluster, 'deployments', request_timeout=timeout), []),
+            'daemonsets': (lambda timeout: list_cached_items(cluster, 'daemonsets', request_timeout=timeout), []),
+        }
+        if not sampled:
+            sources['metrics'] = (lambda timeout: cluster.metrics_api.list_cluster_custom_object(
                 group="metrics.k8s.io",
                 version="v1beta1",
-                plural="pods"
-            )
-            metrics_items = metrics.get('items', [])
-        except ApiException as e:
-            logger.error(f"Failed to retrieve metrics for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            metrics_items = []
+                plural="pods",
+                _request_timeout=timeout
+            ).get('items', []), [])
+        sections, section_timings = fetch_concurrently(sources, label=cluster.kubeconfig_file)
+
+        all_namespaces = sections['namespaces']
+        pod_table = sections['pods']
+        events = sections['events']
+        all_nodes = sections['nodes']
 
         # Compute total cluster capacity
-        total_cpu_capacity = 0  # in millicores
-        total_ram_capacity = 0  # in MiB
-
-        for node in all_nodes:
-            capacity = node.status.capacity
-            cpu = capacity.get('cpu', '0')
-            ram_str = capacity.get('memory', '0')
-            # Parse CPU
-            try:
-                cpu_cores = float(cpu)
-                total_cpu_capacity += cpu_cores * 1000  # millicores
-            except ValueError as e:
-                logger.error(f"Error parsing node CPU '{cpu}': {e}")
-            # Parse RAM
-            try:
-                ram_mi = parse_ram(ram_str)
-                total_ram_capacity += ram_mi
-            except ValueError as e:
-                logger.error(f"Error parsing node RAM '{ram_str}': {e}")
-
-        # Compute metrics
-        total_cpu_usage = 0.0  # in millicores
-        total_ram_usage = 0.0  # in MiB
-        pod_metrics = {}
-
-        for metric in metrics_items:
-            namespace = metric.get('metadata', {}).get('namespace', 'default')
-            name = metric.get('metadata', {}).get('name', 'unknown')
-            containers = metric.get('containers', [])
-            pod_cpu = 0.0
-            pod_ram = 0.0
-            for container in containers:
-                cpu = container.get('usage', {}).get('cpu', '0m')
-                ram = container.get('usage', {}).get('memory', '0Mi')
-                # Parse CPU
-                pod_cpu += parse_cpu(cpu)
-                # Parse RAM
-                pod_ram += parse_ram(ram)
-            total_cpu_usage += pod_cpu
-            total_ram_usage += pod_ram
-            pod_metrics[(namespace, name)] = {
-                'cpu_usage': f"{pod_cpu:.2f}",
-                'ram_usage': f"{pod_ram:.2f}"
-            }
+        total_cpu_capacity = parse_quantities(
+            [node.status.capacity.get('cpu', '0') for node in all_nodes], TO_MILLICORES
+        ).sum()
+        total_ram_capacity = parse_quantities(
+            [node.status.capacity.get('memory', '0') for node in all_nodes], TO_MIB
+        ).sum()
+
+        # Compute metrics: per-pod usage from the latest sample or from this request's fetch
+        if sampled:
+            pod_keys, pod_cpu, pod_ram = sampler.pods.latest()
+        else:
+            pod_keys, pod_cpu, pod_ram = summarize_pod_metrics(sections['metrics'])
+        total_cpu_usage = pod_cpu.sum()
+        total_ram_usage = pod_ram.sum()
+        pod_metrics = {
+            key: {'cpu_usage': f"{cpu:.2f}", 'ram_usage': f"{ram:.2f}"}
+            for key, cpu, ram in zip(pod_keys, pod_cpu.tolist(), pod_ram.tolist())
+        }
 
         # Compute usage percentages
-        cpu_percentage = (total_cpu_usage / total_cpu_capacity) * 100 if total_cpu_capacity > 0 else 0
-        ram_percentage = (total_ram_usage / total_ram_capacity) * 100 if total_ram_capacity > 0 else 0
+        cpu_percentage = float(total_cpu_usage / total_cpu_capacity) * 100 if total_cpu_capacity > 0 else 0
+        ram_percentage = float(total_ram_usage / total_ram_capacity) * 100 if total_ram_capacity > 0 else 0
 
         # Compute summary statistics
         total_namespaces = len(all_namespaces)
-        total_pods = len(all_pods)
+        total_pods = len(pod_table)
         total_nodes = len(all_nodes)
-        phase_counts = defaultdict(int)
-        for pod in all_pods:
-            phase = pod.status.phase or "Unknown"
-            phase_counts[phase] += 1
+        phase_counts = pod_table.phase_counts()
+
+        # Index events by involved object once, instead of scanning them for every pod
+        event_index = EventIndex(events)
 
-        # Aggregate pod data
+        # Aggregate pod data from the columns of the pod table
+        age_hours = ((datetime.now(timezone.utc).timestamp() - pod_table.created) / 3600).tolist()
         all_pods_data = []
-        for pod in all_pods:
-            creation_time = pod.metadata.creation_timestamp
-            if creation_time:
-                age_timedelta = datetime.now(timezone.utc) - creation_time
-                age_hours = age_timedelta.total_seconds() / 3600
-                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+        for index, name in enumerate(pod_table.names):
+            namespace = pod_table.namespace_values[pod_table.namespace_codes[index]]
+            hours = age_hours[index]
+            if hours == hours:
+                age_str = f"{int(hours)}h" if hours < 24 else f"{int(hours / 24)}d"
             else:
                 age_str = "N/A"
 
             # Get pod metrics
-            metrics = pod_metrics.get((pod.metadata.namespace, pod.metadata.name), {})
+            metrics = pod_metrics.get((namespace, name), {})
             cpu_usage = metrics.get('cpu_usage', '0.00m')
             ram_usage = metrics.get('ram_usage', '0.00Mi')
 
-            # Filter events related to this pod
-            pod_events = [
-                format_pod_event(event)
-                for event in events
-                if event.involved_object.kind == 'Pod' and event.involved_object.name == pod.metadata.name
-            ]
+            # Look up events related to this pod
+            pod_events = event_index.for_object('Pod', namespace, name, pod_table.uids[index] or None)
 
             all_pods_data.append({
-                'name': pod.metadata.name,
-                'namespace': pod.metadata.namespace,
-                'status': pod.status.phase or 'Unknown',
-                'node': pod.spec.node_name or 'N/A',
+                'name': name,
+                'namespace': namespace,
+                'status': pod_table.phase_values[pod_table.phase_codes[index]],
+                'node': pod_table.node_values[pod_table.node_codes[index]] or 'N/A',
                 'age': age_str,
                 'cpu_usage': cpu_usage,
                 'ram_usage': ram_usage,
-                'details_url': f"/pods/{pod.metadata.namespace}/{pod.metadata.name}/",
+                'event_count': len(pod_events),
+                'details_url': f"/pods/{namespace}/{name}/",
             })
 
         # Aggregate event data
@@ -259,13 +153,7 @@ def index_page(request):
 
         # ================== Ingresses Overview ==================
 
-        # Retrieve Ingresses
-        try:
-            all_ingresses = cluster.networking_v1.list_ingress_for_all_namespaces().items
-            logger.info(f"Retrieved {len(all_ingresses)} ingresses.")
-        except ApiException as e:
-            logger.error(f"Failed to retrieve ingresses for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            all_ingresses = []
+        all_ingresses = sections['ingresses']
 
         # Process ingresses
         all_ingresses_data = []
@@ -296,27 +184,18 @@ def index_page(request):
                 'details_url': f"/ingresses/{namespace}/{name}/",
             })
 
-        # Convert to JSON
-        ingresses_data_json = json.dumps(all_ingresses_data)
-
         # ================== End Ingresses Overview ==================
 
         # ================== ConfigMaps Overview ==================
 
-        # Retrieve ConfigMaps
-        try:
-            all_config_maps = cluster.core_v1.list_config_map_for_all_namespaces().items
-            logger.info(f"Retrieved {len(all_config_maps)} ConfigMaps.")
-        except ApiException as e:
-            logger.error(f"Failed to retrieve ConfigMaps for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            all_config_maps = []
+        all_config_maps = sections['configmaps']
 
         # Process ConfigMaps
         all_config_maps_data = []
         for config_map in all_config_maps:
             name = config_map.metadata.name or 'Unnamed'
             namespace = config_map.metadata.namespace or 'default'
-            data_count = len(config_map.data) if config_map.data else 0
+            data_count = count_managed_keys(config_map.metadata)
             creation_timestamp = config_map.metadata.creation_timestamp
             if creation_timestamp:
                 age_timedelta = datetime.now(timezone.utc) - creation_timestamp
@@ -333,20 +212,11 @@ def index_page(request):
                 'details_url': f"/configmaps/{namespace}/{name}/",
             })
 
-        # Convert to JSON
-        config_maps_data_json = json.dumps(all_config_maps_data)
-
         # ================== End ConfigMaps Overview ==================
 
         # ================== Deployments Overview ==================
 
-        # Retrieve Deployments
-        try:
-            all_deployments = cluster.apps_v1.list_deployment_for_all_namespaces().items
-            logger.info(f"Retrieved {len(all_deployments)} Deployments.")
-        except ApiException as e:
-            logger.error(f"Failed to retrieve Deployments for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            all_deployments = []
+        all_deployments = sections['deployments']
 
         # Process Deployments
         all_deployments_data = []
@@ -372,20 +242,11 @@ def index_page(request):
                 'details_url': f"/deployments/{namespace}/{name}/",
             })
 
-        # Convert to JSON
-        deployments_data_json = json.dumps(all_deployments_data)
-
         # ================== End Deployments Overview ==================
 
         # ================== DaemonSets Overview ==================
 
-        # Retrieve DaemonSets
-        try:
-            all_daemon_sets = cluster.apps_v1.list_daemon_set_for_all_namespaces().items
-            logger.info(f"Retrieved {len(all_daemon_sets)} DaemonSets.")
-        except ApiException as e:
-            logger.error(f"Failed to retrieve DaemonSets for kubeconfig '{cluster.kubeconfig_file}': {e}")
-            all_daemon_sets = []
+        all_daemon_sets = sections['daemonsets']
 
         # Process DaemonSets
         all_daemon_sets_data = []
@@ -411,9 +272,6 @@ def index_page(request):
                 'details_url': f"/daemonsets/{namespace}/{name}/",
             })
 
-        # Convert to JSON
-        daemon_sets_data_json = json.dumps(all_daemon_sets_data)
-
         # ================== End DaemonSets Overview ==================
 
         # Collect overview statistics
@@ -454,13 +312,14 @@ def index_page(request):
         # Prepare context for the template
         context = {
             'overviews': all_overviews,
-            'pods_data_json': json.dumps(all_pods_data),
-            'events_data_json': json.dumps(all_events_data),
-            'ingresses_data_json': ingresses_data_json,
-            'config_maps_data_json': config_maps_data_json,
-            'deployments_data_json': deployments_data_json,
-            'daemon_sets_data_json': daemon_sets_data_json,
+            'pods_data': all_pods_data,
+            'events_data': all_events_data,
+            'ingresses_data': all_ingresses_data,
+            'config_maps_data': all_config_maps_data,
+            'deployments_data': all_deployments_data,
+            'daemon_sets_data': all_daemon_sets_data,
             'kube_commands': kube_commands,
+            'section_timings': section_timings,
         }
 
         return render(request, 'kubeBoard/index.html', context)
@@ -475,6 +334,26 @@ def index_page(request):
         return render(request, 'kubeBoard/index.html', {'error': error_message})
 
 
+def node_metrics_history(request, node_name):
+    """
+    Returns the sampled CPU (millicores) and memory (MiB) history of a node for its sparklines.
+
+    The data comes from the cluster's background metrics sampler, so polling this endpoint
+    does not call the metrics API.
+    """
+    if not KUBE_METRICS_SAMPLER_ENABLED:
+        return JsonResponse({'error': 'Metrics history is disabled.'}, status=404)
+    cluster, error = get_cluster_client(request)
+    if error:
+        return JsonResponse({'error': error}, status=400)
+    sampler = cluster.get_metrics_sampler()
+    history = sampler.nodes.history(node_name)
+    if history is None:
+        history = {'timestamps': [], 'cpu': [], 'ram': []}
+    history['interval'] = sampler.interval
+    return JsonResponse(history)
+
+
 @require_POST
 def select_kubeconfig(request):
     """
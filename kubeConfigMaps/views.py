@@ -4,7 +4,8 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-from appConfig.kubeconfig import list_config_maps, list_config_maps_for_all_namespaces, read_namespaced_config_map
+from appConfig.kubeconfig import list_config_maps, read_namespaced_config_map, list_cached_items
+from appConfig.metadata import count_managed_keys, list_object_metadata
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
@@ -19,12 +20,18 @@ def all_config_maps_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
-
-        # Get all ConfigMaps across all namespaces
-        config_maps = list_config_maps_for_all_namespaces(cluster)
-        if not config_maps:
-            config_maps = {"items": []}
+        all_namespaces = list_cached_items(cluster, 'namespaces')
+
+        # Get the metadata of all ConfigMaps across all namespaces; their data is not
+        # downloaded; the key count comes from managedFields.
+        try:
+            config_maps = [
+                {'metadata': config_map.metadata, 'data_count': count_managed_keys(config_map.metadata)}
+                for config_map in list_object_metadata(cluster, 'configmaps')
+            ]
+        except ApiException as e:
+            logger.error(f"Failed to retrieve ConfigMaps: {e}")
+            config_maps = []
 
         kubectl_command = {
             'get': "kubectl get configmaps --all-namespaces",
@@ -37,7 +44,7 @@ def all_config_maps_page(request):
 
         context = {
             'namespaces': all_namespaces,
-            'config_maps': config_maps.items,
+            'config_maps': config_maps,
             'kubectl_command': kubectl_command,
         }
 
@@ -5,11 +5,13 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-from appConfig.kubeconfig import list_cron_jobs, list_cron_jobs_for_all_namespaces
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import list_cron_jobs, list_cron_jobs_for_all_namespaces, iter_cached_items, list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('namespaces', 'cronjobs')
 def all_cron_jobs_page(request):
     """
     Displays all CronJobs across all namespaces in the selected Kubernetes cluster.
@@ -20,47 +22,46 @@ def all_cron_jobs_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
+        all_namespaces = list_cached_items(cluster, 'namespaces')
 
         # Get all CronJobs across all namespaces
         try:
-            cron_jobs = cluster.batch_v1.list_cron_job_for_all_namespaces()
+            cron_jobs = iter_cached_items(cluster, 'cronjobs')
         except ApiException as e:
             logger.error(f"Failed to retrieve CronJobs: {e}")
-            cron_jobs = None
+            cron_jobs = []
 
         # Process cron_jobs to add age and other useful information
         processed_cron_jobs = []
-        if cron_jobs and cron_jobs.items:
-            for cron_job in cron_jobs.items:
-                creation_time = cron_job.metadata.creation_timestamp
-                if creation_time:
-                    age_timedelta = datetime.now(timezone.utc) - creation_time
-                    age_hours = age_timedelta.total_seconds() / 3600
-                    age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-                else:
-                    age_str = "N/A"
-
-                # Get schedule and status
-                schedule = cron_job.spec.schedule or "N/A"
-                suspend = cron_job.spec.suspend or False
-                status = "Suspended" if suspend else "Active"
+        for cron_job in cron_jobs:
+            creation_time = cron_job.metadata.creation_timestamp
+            if creation_time:
+                age_timedelta = datetime.now(timezone.utc) - creation_time
+                age_hours = age_timedelta.total_seconds() / 3600
+                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+            else:
+                age_str = "N/A"
+
+            # Get schedule and status
+            schedule = cron_job.spec.schedule or "N/A"
+            suspend = cron_job.spec.suspend or False
+            status = "Suspended" if suspend else "Active"
                 
-                # Get last schedule time
-                last_schedule = "Never"
-                if cron_job.status and cron_job.status.last_schedule_time:
-                    last_schedule_time = cron_job.status.last_schedule_time
-                    last_schedule = last_schedule_time.strftime("%Y-%m-%d %H:%M:%S")
-
-                processed_cron_jobs.append({
-                    'name': cron_job.metadata.name,
-                    'namespace': cron_job.metadata.namespace,
-                    'schedule': schedule,
-                    'status': status,
-                    'last_schedule': last_schedule,
-                    'age': age_str,
-                    'details_url': f"/cronjobs/{cron_job.metadata.namespace}/{cron_job.metadata.name}/",
-                })
+            # Get last schedule time
+            last_schedule = "Never"
+            if cron_job.status and cron_job.status.last_schedule_time:
+                last_schedule_time = cron_job.status.last_schedule_time
+                last_schedule = last_schedule_time.strftime("%Y-%m-%d %H:%M:%S")
+
+            processed_cron_jobs.append({
+                'name': cron_job.metadata.name,
+                'namespace': cron_job.metadata.namespace,
+                'schedule': schedule,
+                'status': status,
+                'last_schedule': last_schedule,
+                'age': age_str,
+                'details_url': f"/cronjobs/{cron_job.metadata.namespace}/{cron_job.metadata.name}/",
+            })
 
         kubectl_command = {
             'get': "kubectl get cronjobs --all-namespaces",
@@ -74,7 +75,6 @@ def all_cron_jobs_page(request):
 
         context = {
             'namespaces': all_namespaces,
-            'cron_jobs': cron_jobs.items if cron_jobs else [],
             'processed_cron_jobs': processed_cron_jobs,
             'kubectl_command': kubectl_command,
         }
@@ -221,6 +221,7 @@ def cron_job_details_page(request, namespace, cron_job_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('cronjobs')
 def cron_job_json_page(request, namespace, cron_job_name):
     """
     Displays the JSON representation of a specific CronJob.
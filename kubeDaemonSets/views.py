@@ -5,11 +5,13 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-from appConfig.kubeconfig import list_daemon_sets, list_daemon_sets_for_all_namespaces, read_namespaced_daemon_set
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import list_daemon_sets, read_namespaced_daemon_set, iter_cached_items, list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('namespaces', 'daemonsets')
 def all_daemon_sets_page(request):
     """
     Displays all DaemonSets across all namespaces in the selected Kubernetes cluster.
@@ -20,16 +22,18 @@ def all_daemon_sets_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
+        all_namespaces = list_cached_items(cluster, 'namespaces')
 
         # Get all DaemonSets across all namespaces
-        daemon_sets = list_daemon_sets_for_all_namespaces(cluster)
-        if not daemon_sets:
-            daemon_sets = {"items": []}
+        try:
+            daemon_sets = iter_cached_items(cluster, 'daemonsets')
+        except ApiException as e:
+            logger.error(f"Failed to retrieve DaemonSets: {e}")
+            daemon_sets = []
 
         # Process daemon_sets to add age and other useful information
         processed_daemon_sets = []
-        for daemon_set in daemon_sets.items:
+        for daemon_set in daemon_sets:
             creation_time = daemon_set.metadata.creation_timestamp
             if creation_time:
                 age_timedelta = datetime.now(timezone.utc) - creation_time
@@ -65,7 +69,6 @@ def all_daemon_sets_page(request):
 
         context = {
             'namespaces': all_namespaces,
-            'daemon_sets': daemon_sets.items,
             'processed_daemon_sets': processed_daemon_sets,
             'kubectl_command': kubectl_command,
         }
@@ -197,6 +200,7 @@ def daemon_set_details_page(request, namespace, daemon_set_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('daemonsets')
 def daemon_set_json_page(request, namespace, daemon_set_name):
     """
     Displays the JSON representation of a specific DaemonSet.
@@ -5,11 +5,13 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-from appConfig.kubeconfig import list_deployments, list_deployments_for_all_namespaces
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import list_deployments, iter_cached_items, list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('namespaces', 'deployments')
 def all_deployments_page(request):
     """
     Displays all Deployments across all namespaces in the selected Kubernetes cluster.
@@ -20,16 +22,18 @@ def all_deployments_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
+        all_namespaces = list_cached_items(cluster, 'namespaces')
 
         # Get all Deployments across all namespaces
-        deployments = list_deployments_for_all_namespaces(cluster)
-        if not deployments:
-            deployments = {"items": []}
+        try:
+            deployments = iter_cached_items(cluster, 'deployments')
+        except ApiException as e:
+            logger.error(f"Failed to retrieve Deployments: {e}")
+            deployments = []
 
         # Process deployments to add age and other useful information
         processed_deployments = []
-        for deployment in deployments.items:
+        for deployment in deployments:
             creation_time = deployment.metadata.creation_timestamp
             if creation_time:
                 age_timedelta = datetime.now(timezone.utc) - creation_time
@@ -67,7 +71,6 @@ def all_deployments_page(request):
 
         context = {
             'namespaces': all_namespaces,
-            'deployments': deployments.items,
             'processed_deployments': processed_deployments,
             'kubectl_command': kubectl_command,
         }
@@ -203,6 +206,7 @@ def deployment_details_page(request, namespace, deployment_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('deployments')
 def deployment_json_page(request, namespace, deployment_name):
     """
     Displays the JSON representation of a specific Deployment.
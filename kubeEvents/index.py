@@ -0,0 +1,48 @@
+# kubeEvents/index.py
+
+from collections import defaultdict
+
+
+class EventIndex:
+    """
+    Groups events by the object they are about, so per-object lookups are O(1).
+
+    Events are keyed by their involvedObject (kind, namespace, name). When a uid is
+    given on lookup, events recorded for an older object with the same name are
+    skipped; events without a uid are kept because they cannot be told apart.
+    """
+    def __init__(self, events=()):
+        self._by_object = defaultdict(list)
+        for event in events:
+            self.add(event)
+
+    def add(self, event):
+        """
+        Adds one event to the index.
+        """
+        involved_object = event.involved_object
+        if not involved_object:
+            return
+        key = (involved_object.kind, involved_object.namespace, involved_object.name)
+        self._by_object[key].append(event)
+
+    def for_object(self, kind, namespace, name, uid=None):
+        """
+        Returns the events recorded for an object.
+
+        Args:
+            kind (str): Kind of the involved object (e.g. 'Pod').
+            namespace (str): Namespace of the involved object.
+            name (str): Name of the involved object.
+            uid (str): Optional uid of the involved object.
+
+        Returns:
+            list: The matching events, possibly empty.
+        """
+        events = self._by_object.get((kind, namespace, name), [])
+        if uid is None:
+            return events
+        return [event for event in events if not event.involved_object.uid or event.involved_object.uid == uid]
+
+    def __len__(self):
+        return sum(len(events) for events in self._by_object.values())
@@ -1,62 +1,78 @@
 # kubeEvents/views.py
 
-import json
+from django.http import JsonResponse
 from django.shortcuts import render
-from kubernetes.client import ApiException
 
+from appConfig.asyncclient import API_EXCEPTIONS, alist_cached_items, get_async_client
+from appConfig.conditional import conditional_on_lists
 from appConfig.settings import logger
-from appConfig.utils import get_cluster_client  # Import the helper function
+from appConfig.tabulator import atabulator_response
+from appConfig.utils import aget_cluster_client, get_cluster_client  # Import the helper function
 from kubeBoard.views import format_event  # Ensure format_event accepts kubeconfig_file
 
 
 def all_events_page(request):
     """
     Displays all Kubernetes events across all namespaces for the selected cluster.
+    The table loads its rows page by page from all_events_data.
     """
-    try:
-        # Retrieve the selected cluster client
-        cluster, error = get_cluster_client(request)
-        if error:
-            return render(request, 'kubeEvents/all-events.html', {'error': error})
+    cluster, error = get_cluster_client(request)
+    if error:
+        return render(request, 'kubeEvents/all-events.html', {'error': error})
 
-        # Fetch all events with an increased limit if necessary
-        events = cluster.core_v1.list_event_for_all_namespaces(limit=1000).items
+    kubectl_command = "kubectl get events --all-namespaces"
 
-        # Format events for Tabulator
-        events_data = [format_event(event, cluster.kubeconfig_file) for event in events]
-        kubectl_command = "kubectl get events --all-namespaces"
+    context = {
+        'kubectl_command': kubectl_command,
+    }
 
-        events_count = len(events_data)
+    return render(request, 'kubeEvents/all-events.html', context)
 
-        context = {
-            'events_data_json': json.dumps(events_data),
-            'kubectl_command': kubectl_command,
-            'events_count': events_count,
-        }
 
-        return render(request, 'kubeEvents/all-events.html', context)
-    except ApiException as e:
+def event_rows(events, kubeconfig_file):
+    """
+    Formats events for Tabulator.
+    """
+    return [format_event(event, kubeconfig_file) for event in events]
+
+
+@conditional_on_lists('events')
+async def all_events_data(request):
+    """
+    Returns one page of the events table as JSON for Tabulator's remote mode.
+    """
+    cluster, error = await aget_cluster_client(request)
+    if error:
+        return JsonResponse({'error': error}, status=500)
+
+    try:
+        # Fetch all events with an increased limit if necessary
+        events = await alist_cached_items(cluster, 'events', limit=1000)
+
+        return await atabulator_response(request, event_rows, events, cluster.kubeconfig_file)
+    except API_EXCEPTIONS as e:
         error_message = f"API Error: {e.reason}"
-        logger.error(f"API Exception in all_events_page: {error_message}")
-        return render(request, 'kubeEvents/all-events.html', {'error': error_message})
+        logger.error(f"API Exception in all_events_data: {error_message}")
+        return JsonResponse({'error': error_message}, status=e.status if e.status else 500)
     except Exception as e:
         error_message = f"Unexpected Error: {str(e)}"
-        logger.error(f"Exception in all_events_page: {error_message}")
-        return render(request, 'kubeEvents/all-events.html', {'error': error_message})
+        logger.error(f"Exception in all_events_data: {error_message}")
+        return JsonResponse({'error': error_message}, status=500)
 
 
-def event_detail_page(request, namespace, event_name):
+async def event_detail_page(request, namespace, event_name):
     """
     Displays detailed information about a specific Kubernetes event.
     """
     try:
         # Retrieve the selected cluster client
-        cluster, error = get_cluster_client(request)
+        cluster, error = await aget_cluster_client(request)
         if error:
             return render(request, 'kubeEvents/event-detail.html', {'error': error})
 
         # Fetch the specific event
-        event = cluster.core_v1.read_namespaced_event(name=event_name, namespace=namespace)
+        async_cluster = await get_async_client(cluster)
+        event = await async_cluster.core_v1.read_namespaced_event(name=event_name, namespace=namespace)
 
         # Extract additional properties
         additional_properties = {
@@ -90,7 +106,7 @@ def event_detail_page(request, namespace, event_name):
         }
 
         return render(request, 'kubeEvents/event-detail.html', context)
-    except ApiException as e:
+    except API_EXCEPTIONS as e:
         error_message = f"API Error: {e.reason}"
         logger.error(f"API Exception in event_detail_page: {error_message}")
         return render(request, 'kubeEvents/event-detail.html', {'error': error_message})
@@ -1,85 +1,99 @@
-import json
 from datetime import datetime, timezone
 
+from django.http import JsonResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
+from appConfig.asyncclient import API_EXCEPTIONS, alist_cached_items
+from appConfig.conditional import conditional_on_lists
 from appConfig.settings import logger
-from appConfig.utils import get_cluster_client
+from appConfig.tabulator import atabulator_response
+from appConfig.utils import aget_cluster_client, get_cluster_client
+
+
+def ingress_rows(all_ingresses):
+    """
+    Builds one Tabulator row per Ingress.
+    """
+    # Process ingresses
+    all_ingresses_data = []
+    for ingress in all_ingresses:
+        name = ingress.metadata.name or 'Unnamed'
+        namespace = ingress.metadata.namespace or 'default'
+        rules = ingress.spec.rules if ingress.spec else []
+        host = rules[0].host if rules else 'N/A'
+        paths = []
+        for rule in rules:
+            if rule.http:
+                for path in rule.http.paths:
+                    paths.append(path.path)
+        creation_timestamp = ingress.metadata.creation_timestamp
+        if creation_timestamp:
+            age_timedelta = datetime.now(timezone.utc) - creation_timestamp
+            age_hours = age_timedelta.total_seconds() / 3600
+            age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+        else:
+            age_str = "N/A"
+
+        all_ingresses_data.append({
+            'name': name,
+            'namespace': namespace,
+            'host': host,
+            'paths': ', '.join(paths),
+            'age': age_str,
+            'created_at': creation_timestamp.isoformat() if creation_timestamp else '',
+            'details_url': f"/ingresses/{namespace}/{name}/",
+        })
+    return all_ingresses_data
 
 
 def all_ingresses_page(request):
     """
     Renders a dedicated page displaying all Ingress resources in the selected Kubernetes cluster.
+    The table loads its rows page by page from all_ingresses_data.
     """
-    try:
-        cluster, error = get_cluster_client(request)
-        if error:
-            return render(request, 'kubeIngress/all_ingresses.html', {'error': error})
+    cluster, error = get_cluster_client(request)
+    if error:
+        return render(request, 'kubeIngress/all_ingresses.html', {'error': error})
 
+    # Define dynamic kubectl commands
+    kube_commands = {
+        'cluster_info': 'kubectl cluster-info',
+        'get_ingresses': 'kubectl get ingress --all-namespaces',
+        'describe_ingress': 'kubectl describe ingress {name} -n {namespace}',
+    }
+
+    # Prepare context for the template
+    context = {
+        'kube_commands': kube_commands,
+    }
+
+    return render(request, 'kubeIngress/all_ingresses.html', context)
+
+
+@conditional_on_lists('ingresses')
+async def all_ingresses_data(request):
+    """
+    Returns one page of the ingresses table as JSON for Tabulator's remote mode.
+    """
+    cluster, error = await aget_cluster_client(request)
+    if error:
+        return JsonResponse({'error': error}, status=500)
+
+    try:
         # Retrieve Ingresses
         try:
-            all_ingresses = cluster.networking_v1.list_ingress_for_all_namespaces().items
+            all_ingresses = await alist_cached_items(cluster, 'ingresses')
             logger.info(f"Retrieved {len(all_ingresses)} ingresses.")
-        except ApiException as e:
+        except API_EXCEPTIONS as e:
             logger.error(f"Failed to retrieve ingresses for kubeconfig '{cluster.kubeconfig_file}': {e}")
             all_ingresses = []
 
-        # Process ingresses
-        all_ingresses_data = []
-        for ingress in all_ingresses:
-            name = ingress.metadata.name or 'Unnamed'
-            namespace = ingress.metadata.namespace or 'default'
-            rules = ingress.spec.rules if ingress.spec else []
-            host = rules[0].host if rules else 'N/A'
-            paths = []
-            for rule in rules:
-                if rule.http:
-                    for path in rule.http.paths:
-                        paths.append(path.path)
-            creation_timestamp = ingress.metadata.creation_timestamp
-            if creation_timestamp:
-                age_timedelta = datetime.now(timezone.utc) - creation_timestamp
-                age_hours = age_timedelta.total_seconds() / 3600
-                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-            else:
-                age_str = "N/A"
-
-            all_ingresses_data.append({
-                'name': name,
-                'namespace': namespace,
-                'host': host,
-                'paths': ', '.join(paths),
-                'age': age_str,
-                'details_url': f"/ingresses/{namespace}/{name}/",
-            })
-
-        # Convert to JSON
-        ingresses_data_json = json.dumps(all_ingresses_data)
-
-        # Define dynamic kubectl commands
-        kube_commands = {
-            'cluster_info': 'kubectl cluster-info',
-            'get_ingresses': 'kubectl get ingress --all-namespaces',
-            'describe_ingress': 'kubectl describe ingress {name} -n {namespace}',
-        }
-
-        # Prepare context for the template
-        context = {
-            'ingresses_data_json': ingresses_data_json,
-            'kube_commands': kube_commands,
-        }
-
-        return render(request, 'kubeIngress/all_ingresses.html', context)
-
-    except ApiException as e:
-        error_message = f"API Error: {e.reason or 'An unknown API error occurred.'}"
-        logger.error(f"API Exception: {error_message}")
-        return render(request, 'kubeIngress/all_ingresses.html', {'error': error_message})
+        return await atabulator_response(request, ingress_rows, all_ingresses)
     except Exception as e:
         error_message = f"Unexpected Error: {str(e)}"
         logger.error(f"Unexpected Exception: {error_message}")
-        return render(request, 'kubeIngress/all_ingresses.html', {'error': error_message})
+        return JsonResponse({'error': error_message}, status=500)
 
 
 def ingress_detail(request, namespace, name):
@@ -5,11 +5,13 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-from appConfig.kubeconfig import list_jobs, list_jobs_for_all_namespaces
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import list_jobs, list_jobs_for_all_namespaces, iter_cached_items, list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('namespaces', 'jobs')
 def all_jobs_page(request):
     """
     Displays all Jobs across all namespaces in the selected Kubernetes cluster.
@@ -20,47 +22,46 @@ def all_jobs_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
+        all_namespaces = list_cached_items(cluster, 'namespaces')
 
         # Get all Jobs across all namespaces
         try:
-            jobs = cluster.batch_v1.list_job_for_all_namespaces()
+            jobs = iter_cached_items(cluster, 'jobs')
         except ApiException as e:
             logger.error(f"Failed to retrieve Jobs: {e}")
-            jobs = None
+            jobs = []
 
         # Process jobs to add age and other useful information
         processed_jobs = []
-        if jobs and jobs.items:
-            for job in jobs.items:
-                creation_time = job.metadata.creation_timestamp
-                if creation_time:
-                    age_timedelta = datetime.now(timezone.utc) - creation_time
-                    age_hours = age_timedelta.total_seconds() / 3600
-                    age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-                else:
-                    age_str = "N/A"
-
-                # Calculate completion status
-                status = "Running"
-                if job.status.succeeded:
-                    status = "Completed"
-                elif job.status.failed:
-                    status = "Failed"
-
-                # Calculate completions
-                completions = job.spec.completions or 1
-                succeeded = job.status.succeeded or 0
-                completion_str = f"{succeeded}/{completions}"
-
-                processed_jobs.append({
-                    'name': job.metadata.name,
-                    'namespace': job.metadata.namespace,
-                    'status': status,
-                    'completions': completion_str,
-                    'age': age_str,
-                    'details_url': f"/jobs/{job.metadata.namespace}/{job.metadata.name}/",
-                })
+        for job in jobs:
+            creation_time = job.metadata.creation_timestamp
+            if creation_time:
+                age_timedelta = datetime.now(timezone.utc) - creation_time
+                age_hours = age_timedelta.total_seconds() / 3600
+                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+            else:
+                age_str = "N/A"
+
+            # Calculate completion status
+            status = "Running"
+            if job.status.succeeded:
+                status = "Completed"
+            elif job.status.failed:
+                status = "Failed"
+
+            # Calculate completions
+            completions = job.spec.completions or 1
+            succeeded = job.status.succeeded or 0
+            completion_str = f"{succeeded}/{completions}"
+
+            processed_jobs.append({
+                'name': job.metadata.name,
+                'namespace': job.metadata.namespace,
+                'status': status,
+                'completions': completion_str,
+                'age': age_str,
+                'details_url': f"/jobs/{job.metadata.namespace}/{job.metadata.name}/",
+            })
 
         kubectl_command = {
             'get': "kubectl get jobs --all-namespaces",
@@ -72,7 +73,6 @@ def all_jobs_page(request):
 
         context = {
             'namespaces': all_namespaces,
-            'jobs': jobs.items if jobs else [],
             'processed_jobs': processed_jobs,
             'kubectl_command': kubectl_command,
         }
@@ -188,6 +188,7 @@ def job_details_page(request, namespace, job_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('jobs')
 def job_json_page(request, namespace, job_name):
     """
     Displays the JSON representation of a specific Job.
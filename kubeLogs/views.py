@@ -1,96 +1,362 @@
 # kubeLogs/views.py
 
-import json
-from django.http import StreamingHttpResponse, HttpResponse
-from kubernetes.client import ApiException
-from appConfig.settings import logger
-from appConfig.utils import get_cluster_client, acquire_stream_semaphore, release_stream_semaphore
+import asyncio
+from django.http import JsonResponse, StreamingHttpResponse, HttpResponse
+from django.utils.encoding import escape_uri_path
+from appConfig.asyncclient import API_EXCEPTIONS, acall_list, get_async_client
+from appConfig.logstream import (
+    LogStreamSlots, filter_log_lines, frame_log_lines, gzip_log_chunks, iter_log_lines, log_broadcasters,
+    log_stream_admission, merge_log_streams, open_pod_log, parse_log_filter, parse_log_framing, parse_log_window,
+    sse_event
+)
+from appConfig.settings import logger, KUBE_LOG_BUFFER_LINES, KUBE_LOG_MERGE_MAX_PODS, KUBE_RAW_LISTS
+from appConfig.utils import aget_cluster_client, format_label_selector
 
-def stream_pod_logs(request, namespace, pod_name, container_name):
+# Workloads whose pods can be streamed together (?workload=<kind>/<name>): kind -> (API, read method).
+LOG_WORKLOAD_KINDS = {
+    'deployment': ('apps_v1', 'read_namespaced_deployment'),
+    'statefulset': ('apps_v1', 'read_namespaced_stateful_set'),
+    'daemonset': ('apps_v1', 'read_namespaced_daemon_set'),
+    'replicaset': ('apps_v1', 'read_namespaced_replica_set'),
+    'job': ('batch_v1', 'read_namespaced_job'),
+}
+
+# Follow requests opened at once when a merged stream starts.
+_MERGE_OPEN_CONCURRENCY = 10
+
+
+def _admission_refused(error_message):
+    response = HttpResponse(error_message, status=429)  # 429 Too Many Requests
+    response['Retry-After'] = '5'
+    return response
+
+
+async def stream_pod_logs(request, namespace, pod_name, container_name):
     """
     Streams the logs of a specific pod's container in the selected Kubernetes cluster.
+
+    Runs on the ASGI event loop: a follow stream holds no worker thread, only a coroutine
+    and an aiohttp connection, and log_stream_admission queues it until the cluster and
+    session quotas have room.
+    Viewers of the same container share one upstream stream (see LogBroadcaster) and
+    get the last tail_lines of its buffer replayed on connect.
+    With ?framing=batch lines are coalesced into 'logs' events (see batch_lines), tuned
+    with batch_ms and batch_bytes.
+    include/exclude (regex, or plain text with match=fixed) drop lines on the server before
+    framing. since_seconds, since_time and limit_bytes are passed to the log API, so such a
+    request gets its own upstream stream instead of the shared one, as does a tail_lines
+    above KUBE_LOG_BUFFER_LINES.
     """
     # Retrieve the ClusterClient based on the user's selected kubeconfig
-    cluster, error = get_cluster_client(request)
+    cluster, error = await aget_cluster_client(request)
     if error:
         logger.error(f"Failed to get cluster client: {error}")
         return HttpResponse(error, status=500)
 
-    # Acquire semaphore before starting the log stream
-    if not acquire_stream_semaphore():
-        error_message = "Maximum number of concurrent log streams reached. Please try again later."
-        logger.warning(error_message)
-        return HttpResponse(error_message, status=429)  # 429 Too Many Requests
-
     # Get tail_lines from query parameters with default value
     try:
         tail_lines = int(request.GET.get('tail_lines', 100))
         if tail_lines < 1:
             raise ValueError("tail_lines must be a positive integer.")
     except ValueError as ve:
-        # Release semaphore and return error response
-        release_stream_semaphore()
         error_message = f"Invalid tail_lines parameter: {str(ve)}"
         logger.error(error_message)
         return HttpResponse(error_message, status=400)  # 400 Bad Request
 
     try:
-        # Initialize the log stream
-        pod_logs = cluster.core_v1.read_namespaced_pod_log(
-            name=pod_name,
-            namespace=namespace,
-            container=container_name,
-            follow=True,
-            tail_lines=tail_lines,
-            _preload_content=False,
-            pretty=True,
-            async_req=False
-        )
+        framing, max_delay, max_bytes = parse_log_framing(request.GET)
+        line_filter = parse_log_filter(request.GET)
+        window = parse_log_window(request.GET)
+    except ValueError as ve:
+        error_message = f"Invalid log stream parameters: {str(ve)}"
+        logger.error(error_message)
+        return HttpResponse(error_message, status=400)
 
-        def event_stream():
-            try:
-                for log_line in pod_logs.stream():
-                    if isinstance(log_line, bytes):
-                        decoded_log = log_line.decode('utf-8').rstrip()
-                    elif isinstance(log_line, str):
-                        decoded_log = log_line.rstrip()
-                    elif isinstance(log_line, dict):
-                        # Assuming log_line is a JSON object
-                        decoded_log = json.dumps(log_line).rstrip()
-                    elif isinstance(log_line, list):
-                        # Assuming log_line is a list of JSON objects
-                        decoded_log = json.dumps(log_line).rstrip()
-                    else:
-                        decoded_log = str(log_line).rstrip()
-                    yield f"data: {json.dumps({'log': decoded_log})}\n\n\n\n"
-            except GeneratorExit:
-                logger.info(f"Client disconnected from log streaming for pod '{pod_name}' in namespace '{namespace}'.")
-            except Exception as e:
-                error_message = f"Error streaming logs: {str(e)}"
-                logger.error(error_message)
-                yield f"data: {json.dumps({'log': error_message})}\n\n"
-            finally:
-                # Ensure the semaphore is released when streaming ends
-                release_stream_semaphore()
-                # Close the pod_logs stream to free resources
-                pod_logs.close()
-
-        # Create a StreamingHttpResponse using the generator
-        response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
-        response['Cache-Control'] = 'no-cache'
-        response['X-Accel-Buffering'] = 'no'
-
-        return response
-
-    except ApiException as e:
-        # Release semaphore in case of an exception
-        release_stream_semaphore()
+    # Wait for a slot in the cluster's and the session's quota before opening the upstream stream
+    cluster_key, session_key = cluster.kubeconfig_file, request.session.session_key or ''
+    error_message = await log_stream_admission.admit(cluster_key, session_key)
+    if error_message:
+        return _admission_refused(error_message)
+    # The slot, the cluster client and the opened stream are released through slots,
+    # which the response's generator takes over once the stream is open.
+    slots = LogStreamSlots(cluster, cluster_key, session_key)
+
+    try:
+        async_cluster = await get_async_client(cluster)
+        if window or tail_lines > KUBE_LOG_BUFFER_LINES:
+            # The shared buffer cannot answer a since/limit window or a longer tail; open a separate stream
+            pod_logs = slots.hold(await open_pod_log(
+                async_cluster, namespace, pod_name, container_name, tail_lines=tail_lines, **window
+            ))
+            log_lines = iter_log_lines(pod_logs)
+        else:
+            # Join the shared log stream, opening it if nobody is watching this container yet
+            log_lines = slots.hold(await log_broadcasters.open(
+                cluster, async_cluster, namespace, pod_name, container_name, tail_lines
+            ))
+    except API_EXCEPTIONS as e:
+        slots.release()
         error_message = f"API Error: {e.reason or 'An unknown API error occurred.'}"
         logger.error(f"API Exception in stream_pod_logs: {error_message}")
         return HttpResponse(error_message, status=e.status if e.status else 500)
     except Exception as e:
-        # Release semaphore in case of an exception
-        release_stream_semaphore()
+        slots.release()
         error_message = f"Unexpected Error: {str(e)}"
         logger.error(f"Unexpected Exception in stream_pod_logs: {error_message}")
-        return HttpResponse(error_message, status=500)
\ No newline at end of file
+        return HttpResponse(error_message, status=500)
+    except BaseException:
+        # The client left while the stream was opening.
+        slots.release()
+        raise
+
+    async def event_stream():
+        lines = filter_log_lines(log_lines, line_filter) if line_filter else log_lines
+        try:
+            async for message in frame_log_lines(lines, framing, max_delay, max_bytes):
+                yield message
+        except asyncio.CancelledError:
+            # Django cancels the response when the client disconnects.
+            logger.info(f"Client disconnected from log streaming for pod '{pod_name}' in namespace '{namespace}'.")
+            raise
+        except Exception as e:
+            error_message = f"Error streaming logs: {str(e)}"
+            logger.error(error_message)
+            yield sse_event({'log': error_message})
+        finally:
+            # Free the quota slot; the shared stream closes once its last viewer has left
+            slots.release()
+
+    # Create a StreamingHttpResponse using the async generator
+    response = StreamingHttpResponse(slots.bind(event_stream()), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+
+    return response
+
+
+async def download_pod_logs(request, namespace, pod_name, container_name):
+    """
+    Downloads the full log of a pod's container as a gzip file.
+
+    The raw log body is compressed chunk by chunk on its way to the client (see
+    gzip_log_chunks), so memory use stays flat for logs of any size. ?previous=true
+    returns the log of the previous instance of a restarted or crashed container;
+    since_seconds, since_time and limit_bytes narrow the download. The download counts
+    against the log stream quotas while it runs.
+    """
+    cluster, error = await aget_cluster_client(request)
+    if error:
+        logger.error(f"Failed to get cluster client: {error}")
+        return HttpResponse(error, status=500)
+
+    previous = request.GET.get('previous') == 'true'
+    try:
+        window = parse_log_window(request.GET)
+    except ValueError as ve:
+        error_message = f"Invalid log download parameters: {str(ve)}"
+        logger.error(error_message)
+        return HttpResponse(error_message, status=400)
+
+    cluster_key, session_key = cluster.kubeconfig_file, request.session.session_key or ''
+    error_message = await log_stream_admission.admit(cluster_key, session_key)
+    if error_message:
+        return _admission_refused(error_message)
+    # The slot, the cluster client and the opened log are released through slots,
+    # which the response's generator takes over once the log is open.
+    slots = LogStreamSlots(cluster, cluster_key, session_key)
+
+    try:
+        async_cluster = await get_async_client(cluster)
+        pod_logs = slots.hold(await open_pod_log(
+            async_cluster, namespace, pod_name, container_name, follow=False, previous=previous, **window
+        ))
+    except API_EXCEPTIONS as e:
+        slots.release()
+        error_message = f"API Error: {e.reason or 'An unknown API error occurred.'}"
+        logger.error(f"API Exception in download_pod_logs: {error_message}")
+        return HttpResponse(error_message, status=e.status if e.status else 500)
+    except Exception as e:
+        slots.release()
+        error_message = f"Unexpected Error: {str(e)}"
+        logger.error(f"Unexpected Exception in download_pod_logs: {error_message}")
+        return HttpResponse(error_message, status=500)
+    except BaseException:
+        # The client left while the log was opening.
+        slots.release()
+        raise
+
+    async def gzip_stream():
+        try:
+            async for chunk in gzip_log_chunks(pod_logs):
+                yield chunk
+        except asyncio.CancelledError:
+            logger.info(f"Client cancelled the log download of pod '{pod_name}' in namespace '{namespace}'.")
+            raise
+        finally:
+            slots.release()
+
+    response = StreamingHttpResponse(slots.bind(gzip_stream()), content_type='application/gzip')
+    filename = f"{pod_name}-{container_name}{'-previous' if previous else ''}.log.gz"
+    response['Content-Disposition'] = f'attachment; filename="{escape_uri_path(filename)}"'
+    response['X-Accel-Buffering'] = 'no'
+
+    return response
+
+
+async def _resolve_label_selector(async_cluster, namespace, query_params):
+    """
+    Returns the label selector given directly (?selector=) or taken from a workload (?workload=kind/name).
+
+    Raises:
+        ValueError: If neither is given or the workload kind is not supported.
+        ApiException: If the workload cannot be read.
+    """
+    selector = query_params.get('selector', '').strip()
+    if selector:
+        return selector
+
+    kind, _, name = query_params.get('workload', '').partition('/')
+    if not kind or not name:
+        raise ValueError("Pass a label selector (selector=app=web) or a workload (workload=deployment/web).")
+    if kind.lower() not in LOG_WORKLOAD_KINDS:
+        raise ValueError(f"workload kind must be one of {', '.join(LOG_WORKLOAD_KINDS)}.")
+
+    api_name, method_name = LOG_WORKLOAD_KINDS[kind.lower()]
+    workload = await getattr(getattr(async_cluster, api_name), method_name)(name, namespace)
+    selector = format_label_selector(workload.spec.selector)
+    if not selector:
+        raise ValueError(f"{kind} '{name}' has no pod selector.")
+    return selector
+
+
+def _log_container(pod, container_name):
+    # Like kubectl logs: the requested container, else the default-container annotation, else the first one.
+    if container_name:
+        return container_name
+    annotations = pod.metadata.annotations or {}
+    return annotations.get('kubectl.kubernetes.io/default-container') or pod.spec.containers[0].name
+
+
+async def stream_selector_logs(request, namespace):
+    """
+    Streams the logs of all pods matching a label selector or workload as one merged stream.
+
+    Every matching pod (at most KUBE_LOG_MERGE_MAX_PODS) is followed with timestamps=True,
+    and the lines are merged in time order by merge_log_streams and prefixed with the pod
+    name. Each pod counts against the log stream quotas. Accepts selector or
+    workload, container, tail_lines (per pod) and the framing, filter and window
+    parameters of stream_pod_logs; include/exclude also see the pod name prefix.
+    """
+    cluster, error = await aget_cluster_client(request)
+    if error:
+        logger.error(f"Failed to get cluster client: {error}")
+        return HttpResponse(error, status=500)
+
+    try:
+        tail_lines = int(request.GET.get('tail_lines', 100))
+        if tail_lines < 1:
+            raise ValueError("tail_lines must be a positive integer.")
+        framing, max_delay, max_bytes = parse_log_framing(request.GET)
+        line_filter = parse_log_filter(request.GET)
+        window = parse_log_window(request.GET)
+    except ValueError as ve:
+        error_message = f"Invalid log stream parameters: {str(ve)}"
+        logger.error(error_message)
+        return HttpResponse(error_message, status=400)
+
+    container_name = request.GET.get('container')
+    try:
+        async_cluster = await get_async_client(cluster)
+        selector = await _resolve_label_selector(async_cluster, namespace, request.GET)
+        pod_list = await acall_list(
+            async_cluster.core_v1.list_namespaced_pod, raw=KUBE_RAW_LISTS, namespace=namespace, label_selector=selector
+        )
+    except ValueError as ve:
+        return HttpResponse(str(ve), status=400)
+    except API_EXCEPTIONS as e:
+        error_message = f"API Error: {e.reason or 'An unknown API error occurred.'}"
+        logger.error(f"API Exception in stream_selector_logs: {error_message}")
+        return HttpResponse(error_message, status=e.status if e.status else 500)
+
+    # Pending pods have no logs yet.
+    pods = sorted(
+        (pod for pod in pod_list.items or [] if pod.status.phase != 'Pending'),
+        key=lambda pod: pod.metadata.name,
+    )
+    if not pods:
+        return HttpResponse(f"No started pods match '{selector}' in namespace '{namespace}'.", status=404)
+    notices = []
+    if len(pods) > KUBE_LOG_MERGE_MAX_PODS:
+        notices.append(f"Showing logs of {KUBE_LOG_MERGE_MAX_PODS} of {len(pods)} pods matching '{selector}'.")
+        pods = pods[:KUBE_LOG_MERGE_MAX_PODS]
+
+    cluster_key, session_key = cluster.kubeconfig_file, request.session.session_key or ''
+    error_message = await log_stream_admission.admit(cluster_key, session_key, len(pods))
+    if error_message:
+        return _admission_refused(error_message)
+    # The slots, the cluster client and every opened response are released through slots,
+    # which the response's generator takes over; the gather is the only wait before that.
+    slots = LogStreamSlots(cluster, cluster_key, session_key, len(pods))
+
+    semaphore = asyncio.Semaphore(_MERGE_OPEN_CONCURRENCY)
+
+    async def open_stream(pod):
+        async with semaphore:
+            return slots.hold(await open_pod_log(
+                async_cluster, namespace, pod.metadata.name, _log_container(pod, container_name),
+                tail_lines=tail_lines, timestamps=True, **window
+            ))
+
+    try:
+        results = await asyncio.gather(*(open_stream(pod) for pod in pods), return_exceptions=True)
+    except BaseException:
+        # The client left while the streams were opening; close the ones already open.
+        slots.release()
+        raise
+    responses = {}
+    for pod, result in zip(pods, results):
+        if isinstance(result, BaseException):
+            reason = result.reason if isinstance(result, API_EXCEPTIONS) else str(result)
+            notices.append(f"[{pod.metadata.name}] Failed to stream logs: {reason}")
+        else:
+            responses[pod.metadata.name] = result
+    # Only the streams that opened keep their quota slots.
+    slots.give_back(len(pods) - len(responses))
+    if not responses:
+        slots.release()
+        logger.error(f"No log stream could be opened for selector '{selector}' in namespace '{namespace}'.")
+        return HttpResponse("\n".join(notices), status=502)
+
+    async def event_stream():
+        try:
+            for notice in notices:
+                yield sse_event({'log': notice})
+            streams = {name: iter_log_lines(response) for name, response in responses.items()}
+            lines = merge_log_streams(streams)
+            if line_filter:
+                lines = filter_log_lines(lines, line_filter)
+            async for message in frame_log_lines(lines, framing, max_delay, max_bytes):
+                yield message
+        except asyncio.CancelledError:
+            logger.info(f"Client disconnected from merged log streaming for '{selector}' in namespace '{namespace}'.")
+            raise
+        except Exception as e:
+            error_message = f"Error streaming logs: {str(e)}"
+            logger.error(error_message)
+            yield sse_event({'log': error_message})
+        finally:
+            slots.release()
+
+    response = StreamingHttpResponse(slots.bind(event_stream()), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+
+    return response
+
+
+async def log_stream_stats(request):
+    """
+    Internal endpoint reporting log stream admission occupancy and the shared upstream streams.
+    """
+    shared_streams = {'/'.join(key): viewers for key, viewers in log_broadcasters.stats().items()}
+    return JsonResponse({'admission': log_stream_admission.stats(), 'shared_streams': shared_streams})
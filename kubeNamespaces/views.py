@@ -6,10 +6,16 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
+from appConfig.conditional import conditional_on_lists, metrics_sample_version
+from appConfig.kubeconfig import iter_cached_items
+from appConfig.metricshistory import current_pod_usage
+from appConfig.podtable import PodTable, get_pod_table
+from appConfig.rollups import rollup_by_namespace
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('namespaces', 'pods', 'services', extra_versions=metrics_sample_version)
 def all_namespaces_page(request):
     """
     Displays all Namespaces in the selected Kubernetes cluster.
@@ -21,89 +27,102 @@ def all_namespaces_page(request):
     try:
         # Get all Namespaces
         try:
-            namespaces = cluster.core_v1.list_namespace()
+            namespaces = iter_cached_items(cluster, 'namespaces')
         except ApiException as e:
             logger.error(f"Failed to retrieve Namespaces: {e}")
-            namespaces = None
+            namespaces = []
+        namespaces = list(namespaces)
+
+        # Roll up pods, requests, limits and usage per namespace from one cluster-wide pod list
+        try:
+            pod_table = get_pod_table(cluster)
+        except ApiException as e:
+            logger.error(f"Failed to retrieve Pods: {e}")
+            pod_table = PodTable.from_pods([])
+        try:
+            usage = current_pod_usage(cluster)
+        except ApiException as e:
+            logger.warning(f"Failed to retrieve pod metrics: {e.reason}")
+            usage = None
+        rollups = rollup_by_namespace(pod_table, usage, [namespace.metadata.name for namespace in namespaces])
 
         # Process namespaces to add age and other useful information
         processed_namespaces = []
-        if namespaces and namespaces.items:
-            for namespace in namespaces.items:
-                creation_time = namespace.metadata.creation_timestamp
-                if creation_time:
-                    age_timedelta = datetime.now(timezone.utc) - creation_time
-                    age_hours = age_timedelta.total_seconds() / 3600
-                    age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-                else:
-                    age_str = "N/A"
-
-                # Get status
-                status = namespace.status.phase or "Unknown"
-
-                processed_namespaces.append({
-                    'name': namespace.metadata.name,
-                    'status': status,
-                    'age': age_str,
-                    'details_url': f"/namespaces/{namespace.metadata.name}/",
-                })
+        for namespace in namespaces:
+            creation_time = namespace.metadata.creation_timestamp
+            if creation_time:
+                age_timedelta = datetime.now(timezone.utc) - creation_time
+                age_hours = age_timedelta.total_seconds() / 3600
+                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+            else:
+                age_str = "N/A"
+
+            # Get status
+            status = namespace.status.phase or "Unknown"
+
+            processed_namespaces.append({
+                'name': namespace.metadata.name,
+                'status': status,
+                'age': age_str,
+                'details_url': f"/namespaces/{namespace.metadata.name}/",
+                'rollup': rollups[namespace.metadata.name],
+            })
 
         # Get services across all namespaces
         try:
-            services = cluster.core_v1.list_service_for_all_namespaces()
+            services = iter_cached_items(cluster, 'services')
         except ApiException as e:
             logger.error(f"Failed to retrieve Services: {e}")
-            services = None
+            services = []
 
         # Process services
         processed_services = []
-        if services and services.items:
-            for service in services.items:
-                creation_time = service.metadata.creation_timestamp
-                if creation_time:
-                    age_timedelta = datetime.now(timezone.utc) - creation_time
-                    age_hours = age_timedelta.total_seconds() / 3600
-                    age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-                else:
-                    age_str = "N/A"
-
-                # Get type and cluster IP
-                service_type = service.spec.type or "ClusterIP"
-                cluster_ip = service.spec.cluster_ip or "None"
-
-                # Get external IP if available
-                external_ip = "None"
-                if service.spec.type == "LoadBalancer" and service.status.load_balancer.ingress:
-                    for ingress in service.status.load_balancer.ingress:
-                        if ingress.ip:
-                            external_ip = ingress.ip
-                            break
-                        elif ingress.hostname:
-                            external_ip = ingress.hostname
-                            break
-
-                # Get ports
-                ports = []
-                if service.spec.ports:
-                    for port in service.spec.ports:
-                        port_str = f"{port.port}"
-                        if port.target_port:
-                            port_str += f":{port.target_port}"
-                        if port.node_port:
-                            port_str += f":{port.node_port}"
-                        if port.protocol:
-                            port_str += f"/{port.protocol}"
-                        ports.append(port_str)
-
-                processed_services.append({
-                    'name': service.metadata.name,
-                    'namespace': service.metadata.namespace,
-                    'type': service_type,
-                    'cluster_ip': cluster_ip,
-                    'external_ip': external_ip,
-                    'ports': ", ".join(ports),
-                    'age': age_str,
-                })
+        for service in services:
+            creation_time = service.metadata.creation_timestamp
+            if creation_time:
+                age_timedelta = datetime.now(timezone.utc) - creation_time
+                age_hours = age_timedelta.total_seconds() / 3600
+                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+            else:
+                age_str = "N/A"
+
+            # Get type and cluster IP
+            service_type = service.spec.type or "ClusterIP"
+            cluster_ip = service.spec.cluster_ip or "None"
+
+            # Get external IP if available
+            external_ip = "None"
+            if service.spec.type == "LoadBalancer" and service.status.load_balancer.ingress:
+                for ingress in service.status.load_balancer.ingress:
+                    if ingress.ip:
+                        external_ip = ingress.ip
+                        break
+                    elif ingress.hostname:
+                        external_ip = ingress.hostname
+                        break
+
+            # Get ports
+            ports = []
+            if service.spec.ports:
+                for port in service.spec.ports:
+                    port_str = f"{port.port}"
+                    if port.target_port:
+                        port_str += f":{port.target_port}"
+                    if port.node_port:
+                        port_str += f":{port.node_port}"
+                    if port.protocol:
+                        port_str += f"/{port.protocol}"
+                    ports.append(port_str)
+
+            processed_services.append({
+                'name': service.metadata.name,
+                'namespace': service.metadata.namespace,
+                'type': service_type,
+                'cluster_ip': cluster_ip,
+                'external_ip': external_ip,
+                'ports': ", ".join(ports),
+                'age': age_str,
+            })
 
         kubectl_command = {
             'get': "kubectl get namespaces",
@@ -116,9 +135,7 @@ def all_namespaces_page(request):
         }
 
         context = {
-            'namespaces': namespaces.items if namespaces else [],
             'processed_namespaces': processed_namespaces,
-            'services': services.items if services else [],
             'processed_services': processed_services,
             'kubectl_command': kubectl_command,
         }
@@ -313,6 +330,7 @@ def namespace_details_page(request, namespace_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('namespaces')
 def namespace_json_page(request, namespace_name):
     """
     Displays the JSON representation of a specific Namespace.
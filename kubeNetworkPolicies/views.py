@@ -5,11 +5,13 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-from appConfig.kubeconfig import list_network_policies, list_network_policies_for_all_namespaces
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import list_network_policies, list_network_policies_for_all_namespaces, iter_cached_items, list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('namespaces', 'networkpolicies')
 def all_network_policies_page(request):
     """
     Displays all NetworkPolicies across all namespaces in the selected Kubernetes cluster.
@@ -20,47 +22,46 @@ def all_network_policies_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
+        all_namespaces = list_cached_items(cluster, 'namespaces')
 
         # Get all NetworkPolicies across all namespaces
         try:
-            network_policies = cluster.networking_v1.list_network_policy_for_all_namespaces()
+            network_policies = iter_cached_items(cluster, 'networkpolicies')
         except ApiException as e:
             logger.error(f"Failed to retrieve NetworkPolicies: {e}")
-            network_policies = None
+            network_policies = []
 
         # Process network_policies to add age and other useful information
         processed_network_policies = []
-        if network_policies and network_policies.items:
-            for network_policy in network_policies.items:
-                creation_time = network_policy.metadata.creation_timestamp
-                if creation_time:
-                    age_timedelta = datetime.now(timezone.utc) - creation_time
-                    age_hours = age_timedelta.total_seconds() / 3600
-                    age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-                else:
-                    age_str = "N/A"
+        for network_policy in network_policies:
+            creation_time = network_policy.metadata.creation_timestamp
+            if creation_time:
+                age_timedelta = datetime.now(timezone.utc) - creation_time
+                age_hours = age_timedelta.total_seconds() / 3600
+                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+            else:
+                age_str = "N/A"
 
-                # Get policy types
-                policy_types = network_policy.spec.policy_types or []
-                policy_types_str = ", ".join(policy_types)
+            # Get policy types
+            policy_types = network_policy.spec.policy_types or []
+            policy_types_str = ", ".join(policy_types)
 
-                # Get pod selector
-                pod_selector = "All pods"
-                if network_policy.spec.pod_selector and network_policy.spec.pod_selector.match_labels:
-                    selector_parts = []
-                    for key, value in network_policy.spec.pod_selector.match_labels.items():
-                        selector_parts.append(f"{key}={value}")
-                    pod_selector = ", ".join(selector_parts)
+            # Get pod selector
+            pod_selector = "All pods"
+            if network_policy.spec.pod_selector and network_policy.spec.pod_selector.match_labels:
+                selector_parts = []
+                for key, value in network_policy.spec.pod_selector.match_labels.items():
+                    selector_parts.append(f"{key}={value}")
+                pod_selector = ", ".join(selector_parts)
 
-                processed_network_policies.append({
-                    'name': network_policy.metadata.name,
-                    'namespace': network_policy.metadata.namespace,
-                    'policy_types': policy_types_str,
-                    'pod_selector': pod_selector,
-                    'age': age_str,
-                    'details_url': f"/networkpolicies/{network_policy.metadata.namespace}/{network_policy.metadata.name}/",
-                })
+            processed_network_policies.append({
+                'name': network_policy.metadata.name,
+                'namespace': network_policy.metadata.namespace,
+                'policy_types': policy_types_str,
+                'pod_selector': pod_selector,
+                'age': age_str,
+                'details_url': f"/networkpolicies/{network_policy.metadata.namespace}/{network_policy.metadata.name}/",
+            })
 
         kubectl_command = {
             'get': "kubectl get networkpolicies --all-namespaces",
@@ -72,7 +73,6 @@ def all_network_policies_page(request):
 
         context = {
             'namespaces': all_namespaces,
-            'network_policies': network_policies.items if network_policies else [],
             'processed_network_policies': processed_network_policies,
             'kubectl_command': kubectl_command,
         }
@@ -259,6 +259,7 @@ def network_policy_details_page(request, namespace, network_policy_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('networkpolicies')
 def network_policy_json_page(request, namespace, network_policy_name):
     """
     Displays the JSON representation of a specific NetworkPolicy.
@@ -5,11 +5,13 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-from appConfig.kubeconfig import list_persistent_volumes, list_persistent_volume_claims
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import list_persistent_volumes, list_persistent_volume_claims, iter_cached_items, list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('persistentvolumes')
 def all_persistent_volumes_page(request):
     """
     Displays all PersistentVolumes in the selected Kubernetes cluster.
@@ -21,48 +23,47 @@ def all_persistent_volumes_page(request):
     try:
         # Get all PersistentVolumes
         try:
-            persistent_volumes = cluster.core_v1.list_persistent_volume()
+            persistent_volumes = iter_cached_items(cluster, 'persistentvolumes')
         except ApiException as e:
             logger.error(f"Failed to retrieve PersistentVolumes: {e}")
-            persistent_volumes = None
+            persistent_volumes = []
 
         # Process persistent_volumes to add age and other useful information
         processed_persistent_volumes = []
-        if persistent_volumes and persistent_volumes.items:
-            for pv in persistent_volumes.items:
-                creation_time = pv.metadata.creation_timestamp
-                if creation_time:
-                    age_timedelta = datetime.now(timezone.utc) - creation_time
-                    age_hours = age_timedelta.total_seconds() / 3600
-                    age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-                else:
-                    age_str = "N/A"
-
-                # Get capacity
-                capacity = "N/A"
-                if pv.spec.capacity and 'storage' in pv.spec.capacity:
-                    capacity = pv.spec.capacity['storage']
-
-                # Get access modes
-                access_modes = pv.spec.access_modes or []
-                access_modes_str = ", ".join(access_modes)
-
-                # Get claim reference
-                claim_ref = "N/A"
-                if pv.spec.claim_ref:
-                    claim_ref = f"{pv.spec.claim_ref.namespace}/{pv.spec.claim_ref.name}"
-
-                processed_persistent_volumes.append({
-                    'name': pv.metadata.name,
-                    'status': pv.status.phase,
-                    'capacity': capacity,
-                    'access_modes': access_modes_str,
-                    'reclaim_policy': pv.spec.persistent_volume_reclaim_policy,
-                    'storage_class': pv.spec.storage_class_name or "N/A",
-                    'claim': claim_ref,
-                    'age': age_str,
-                    'details_url': f"/persistentvolumes/{pv.metadata.name}/",
-                })
+        for pv in persistent_volumes:
+            creation_time = pv.metadata.creation_timestamp
+            if creation_time:
+                age_timedelta = datetime.now(timezone.utc) - creation_time
+                age_hours = age_timedelta.total_seconds() / 3600
+                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+            else:
+                age_str = "N/A"
+
+            # Get capacity
+            capacity = "N/A"
+            if pv.spec.capacity and 'storage' in pv.spec.capacity:
+                capacity = pv.spec.capacity['storage']
+
+            # Get access modes
+            access_modes = pv.spec.access_modes or []
+            access_modes_str = ", ".join(access_modes)
+
+            # Get claim reference
+            claim_ref = "N/A"
+            if pv.spec.claim_ref:
+                claim_ref = f"{pv.spec.claim_ref.namespace}/{pv.spec.claim_ref.name}"
+
+            processed_persistent_volumes.append({
+                'name': pv.metadata.name,
+                'status': pv.status.phase,
+                'capacity': capacity,
+                'access_modes': access_modes_str,
+                'reclaim_policy': pv.spec.persistent_volume_reclaim_policy,
+                'storage_class': pv.spec.storage_class_name or "N/A",
+                'claim': claim_ref,
+                'age': age_str,
+                'details_url': f"/persistentvolumes/{pv.metadata.name}/",
+            })
 
         kubectl_command = {
             'get': "kubectl get pv",
@@ -73,7 +74,6 @@ def all_persistent_volumes_page(request):
         }
 
         context = {
-            'persistent_volumes': persistent_volumes.items if persistent_volumes else [],
             'processed_persistent_volumes': processed_persistent_volumes,
             'kubectl_command': kubectl_command,
         }
@@ -180,6 +180,7 @@ def persistent_volume_details_page(request, pv_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('persistentvolumes')
 def persistent_volume_json_page(request, pv_name):
     """
     Displays the JSON representation of a specific PersistentVolume.
@@ -217,6 +218,7 @@ def persistent_volume_json_page(request, pv_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('namespaces', 'persistentvolumeclaims')
 def all_persistent_volume_claims_page(request):
     """
     Displays all PersistentVolumeClaims across all namespaces in the selected Kubernetes cluster.
@@ -227,50 +229,49 @@ def all_persistent_volume_claims_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
+        all_namespaces = list_cached_items(cluster, 'namespaces')
 
         # Get all PersistentVolumeClaims across all namespaces
         try:
-            pvcs = cluster.core_v1.list_persistent_volume_claim_for_all_namespaces()
+            pvcs = iter_cached_items(cluster, 'persistentvolumeclaims')
         except ApiException as e:
             logger.error(f"Failed to retrieve PersistentVolumeClaims: {e}")
-            pvcs = None
+            pvcs = []
 
         # Process pvcs to add age and other useful information
         processed_pvcs = []
-        if pvcs and pvcs.items:
-            for pvc in pvcs.items:
-                creation_time = pvc.metadata.creation_timestamp
-                if creation_time:
-                    age_timedelta = datetime.now(timezone.utc) - creation_time
-                    age_hours = age_timedelta.total_seconds() / 3600
-                    age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-                else:
-                    age_str = "N/A"
-
-                # Get capacity
-                capacity = "N/A"
-                if pvc.status and pvc.status.capacity and 'storage' in pvc.status.capacity:
-                    capacity = pvc.status.capacity['storage']
-
-                # Get access modes
-                access_modes = pvc.spec.access_modes or []
-                access_modes_str = ", ".join(access_modes)
-
-                # Get volume name
-                volume_name = pvc.spec.volume_name or "N/A"
-
-                processed_pvcs.append({
-                    'name': pvc.metadata.name,
-                    'namespace': pvc.metadata.namespace,
-                    'status': pvc.status.phase,
-                    'volume': volume_name,
-                    'capacity': capacity,
-                    'access_modes': access_modes_str,
-                    'storage_class': pvc.spec.storage_class_name or "N/A",
-                    'age': age_str,
-                    'details_url': f"/persistentvolumeclaims/{pvc.metadata.namespace}/{pvc.metadata.name}/",
-                })
+        for pvc in pvcs:
+            creation_time = pvc.metadata.creation_timestamp
+            if creation_time:
+                age_timedelta = datetime.now(timezone.utc) - creation_time
+                age_hours = age_timedelta.total_seconds() / 3600
+                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+            else:
+                age_str = "N/A"
+
+            # Get capacity
+            capacity = "N/A"
+            if pvc.status and pvc.status.capacity and 'storage' in pvc.status.capacity:
+                capacity = pvc.status.capacity['storage']
+
+            # Get access modes
+            access_modes = pvc.spec.access_modes or []
+            access_modes_str = ", ".join(access_modes)
+
+            # Get volume name
+            volume_name = pvc.spec.volume_name or "N/A"
+
+            processed_pvcs.append({
+                'name': pvc.metadata.name,
+                'namespace': pvc.metadata.namespace,
+                'status': pvc.status.phase,
+                'volume': volume_name,
+                'capacity': capacity,
+                'access_modes': access_modes_str,
+                'storage_class': pvc.spec.storage_class_name or "N/A",
+                'age': age_str,
+                'details_url': f"/persistentvolumeclaims/{pvc.metadata.namespace}/{pvc.metadata.name}/",
+            })
 
         kubectl_command = {
             'get': "kubectl get pvc --all-namespaces",
@@ -282,7 +283,6 @@ def all_persistent_volume_claims_page(request):
 
         context = {
             'namespaces': all_namespaces,
-            'pvcs': pvcs.items if pvcs else [],
             'processed_pvcs': processed_pvcs,
             'kubectl_command': kubectl_command,
         }
@@ -400,6 +400,7 @@ def persistent_volume_claim_details_page(request, namespace, pvc_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('persistentvolumeclaims')
 def persistent_volume_claim_json_page(request, namespace, pvc_name):
     """
     Displays the JSON representation of a specific PersistentVolumeClaim.
@@ -2,89 +2,81 @@
 
 import json
 
-from django.http import StreamingHttpResponse, HttpResponse
+from django.http import StreamingHttpResponse, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect
 from django.utils.encoding import escape_uri_path
-from kubernetes.client import ApiException
 
-from appConfig.settings import logger
-from appConfig.utils import get_cluster_client
+from appConfig.asyncclient import API_EXCEPTIONS, get_async_client
+from appConfig.conditional import conditional_on_lists
+from appConfig.podtable import aget_pod_table
+from appConfig.settings import logger, KUBE_METRICS_SAMPLER_ENABLED
+from appConfig.tabulator import atable_response
+from appConfig.utils import aget_cluster_client, get_cluster_client
 
 
 def all_pods_page(request):
     """
     Displays all pods across all namespaces in the selected Kubernetes cluster.
-    Calculates how many containers are running in each pod and determines the maximum container count.
+    The table loads its rows page by page from all_pods_data.
     """
     cluster, error = get_cluster_client(request)
     if error:
         return HttpResponse(error, status=500)
 
+    kubectl_command = {
+        'get': "kubectl get pods --all-namespaces",
+        'yaml': "kubectl get pods --all-namespaces -o yaml",
+        'describe': "kubectl describe pods --all-namespaces",
+        'logs': "kubectl logs <pod-name> -n <namespace>",
+        'exec': "kubectl exec -it <pod-name> -n <namespace> -- /bin/bash",
+        'port_forward': "kubectl port-forward <pod-name> 8080:80 -n <namespace>",
+        'delete': "kubectl delete pod <pod-name> -n <namespace>",
+        'edit': "kubectl edit pod <pod-name> -n <namespace>",
+        'events': "kubectl get events --all-namespaces",
+        'metrics': "kubectl top pods --all-namespaces",
+    }
+
+    context = {
+        'kubectl_command': kubectl_command,
+    }
+
+    return render(request, 'kubePods/all-pods.html', context)
+
+
+@conditional_on_lists('pods')
+async def all_pods_data(request):
+    """
+    Returns one page of the pods table as JSON for Tabulator's remote mode.
+    """
+    cluster, error = await aget_cluster_client(request)
+    if error:
+        return JsonResponse({'error': error}, status=500)
+
     try:
-        # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
-
-        # Get all pods across all namespaces
-        pods = cluster.core_v1.list_pod_for_all_namespaces().items
-
-        max_container_count = 0
-        for pod in pods:
-            # Total containers for the pod
-            container_count = len(pod.spec.containers) if pod.spec.containers else 0
-            setattr(pod, "container_count", container_count)
-            if container_count > max_container_count:
-                max_container_count = container_count
-
-            # Count running containers based on container statuses
-            running_container_count = 0
-            if pod.status.container_statuses:
-                for status in pod.status.container_statuses:
-                    if status.ready:
-                        running_container_count += 1
-            setattr(pod, "running_container_count", running_container_count)
-
-        kubectl_command = {
-            'get': "kubectl get pods --all-namespaces",
-            'yaml': "kubectl get pods --all-namespaces -o yaml",
-            'describe': "kubectl describe pods --all-namespaces",
-            'logs': "kubectl logs <pod-name> -n <namespace>",
-            'exec': "kubectl exec -it <pod-name> -n <namespace> -- /bin/bash",
-            'port_forward': "kubectl port-forward <pod-name> 8080:80 -n <namespace>",
-            'delete': "kubectl delete pod <pod-name> -n <namespace>",
-            'edit': "kubectl edit pod <pod-name> -n <namespace>",
-            'events': "kubectl get events --all-namespaces",
-            'metrics': "kubectl top pods --all-namespaces",
-        }
-
-        context = {
-            'namespaces': all_namespaces,
-            'pods': pods,
-            'kubectl_command': kubectl_command,
-            'max_container_count': max_container_count,
-        }
-
-        return render(request, 'kubePods/all-pods.html', context)
-
-    except ApiException as e:
+        # The columnar pod table is shared by all requests until the pods change
+        pod_table = await aget_pod_table(cluster)
+        return await atable_response(request, pod_table)
+    except API_EXCEPTIONS as e:
         error_message = f"API Error: {e.reason or 'An unknown API error occurred.'}"
-        logger.error(f"API Exception in all_pods_page: {error_message}")
-        return HttpResponse(error_message, status=e.status if e.status else 500)
+        logger.error(f"API Exception in all_pods_data: {error_message}")
+        return JsonResponse({'error': error_message}, status=e.status if e.status else 500)
     except Exception as e:
         error_message = f"Unexpected Error: {str(e)}"
-        logger.error(f"Unexpected Exception in all_pods_page: {error_message}")
-        return HttpResponse(error_message, status=500)
+        logger.error(f"Unexpected Exception in all_pods_data: {error_message}")
+        return JsonResponse({'error': error_message}, status=500)
 
-def pod_details_page(request, namespace, pod_name):
+async def pod_details_page(request, namespace, pod_name):
     """
     Displays detailed information about a specific pod.
     """
-    cluster, error = get_cluster_client(request)
+    cluster, error = await aget_cluster_client(request)
     if error:
         return HttpResponse(error, status=500)
 
     try:
-        pod = cluster.core_v1.read_namespaced_pod(pod_name, namespace)
-    except ApiException as e:
+        async_cluster = await get_async_client(cluster)
+        pod = await async_cluster.core_v1.read_namespaced_pod(pod_name, namespace)
+    except API_EXCEPTIONS as e:
         if e.status == 404:
             return HttpResponse("Pod not found", status=404)
         else:
@@ -186,20 +178,22 @@ def pod_details_page(request, namespace, pod_name):
 
     return render(request, 'kubePods/pod-details.html', context)
 
-def pod_json_page(request, namespace, pod_name):
+@conditional_on_lists('pods')
+async def pod_json_page(request, namespace, pod_name):
     """
     Displays the JSON representation of a specific pod. Optionally allows downloading the JSON.
     """
-    cluster, error = get_cluster_client(request)
+    cluster, error = await aget_cluster_client(request)
     if error:
         return HttpResponse(error, status=500)
 
     try:
-        pod = cluster.core_v1.read_namespaced_pod(pod_name, namespace)
-        api_client = cluster.core_v1.api_client
+        async_cluster = await get_async_client(cluster)
+        pod = await async_cluster.core_v1.read_namespaced_pod(pod_name, namespace)
+        api_client = async_cluster.api_client
         serialized_pod = api_client.sanitize_for_serialization(pod)
         pod_json = json.dumps(serialized_pod, indent=4)
-    except ApiException as e:
+    except API_EXCEPTIONS as e:
         if e.status == 404:
             return HttpResponse("Pod not found", status=404)
         else:
@@ -234,4 +228,23 @@ def download_pod_json(request, namespace, pod_name):
     Provides a downloadable JSON file of a specific pod.
     """
     # Redirect to pod_json_page with download parameter
-    return redirect(f"/pods/{namespace}/{pod_name}/json/?download=true")
\ No newline at end of file
+    return redirect(f"/pods/{namespace}/{pod_name}/json/?download=true")
+
+def pod_metrics_history(request, namespace, pod_name):
+    """
+    Returns the sampled CPU (millicores) and memory (MiB) history of a pod for its sparklines.
+
+    The data comes from the cluster's background metrics sampler, so polling this endpoint
+    does not call the metrics API.
+    """
+    if not KUBE_METRICS_SAMPLER_ENABLED:
+        return JsonResponse({'error': 'Metrics history is disabled.'}, status=404)
+    cluster, error = get_cluster_client(request)
+    if error:
+        return JsonResponse({'error': error}, status=400)
+    sampler = cluster.get_metrics_sampler()
+    history = sampler.pods.history((namespace, pod_name))
+    if history is None:
+        history = {'timestamps': [], 'cpu': [], 'ram': []}
+    history['interval'] = sampler.interval
+    return JsonResponse(history)
@@ -5,11 +5,13 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-from appConfig.kubeconfig import list_secrets, list_secrets_for_all_namespaces, read_namespaced_secret
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import list_secrets, read_namespaced_secret, list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('namespaces', 'secrets')
 def all_secrets_page(request):
     """
     Displays all Secrets across all namespaces in the selected Kubernetes cluster.
@@ -20,16 +22,18 @@ def all_secrets_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
+        all_namespaces = list_cached_items(cluster, 'namespaces')
 
         # Get all Secrets across all namespaces
-        secrets = list_secrets_for_all_namespaces(cluster)
-        if not secrets:
-            secrets = {"items": []}
+        try:
+            secrets = list_cached_items(cluster, 'secrets')
+        except ApiException as e:
+            logger.error(f"Failed to retrieve Secrets: {e}")
+            secrets = []
 
         # Filter out service account tokens and other system secrets
         filtered_secrets = []
-        for secret in secrets.items:
+        for secret in secrets:
             # Skip service account tokens and other system secrets
             if secret.type not in ["kubernetes.io/service-account-token", "bootstrap.kubernetes.io/token"]:
                 filtered_secrets.append(secret)
@@ -138,6 +142,7 @@ def secret_details_page(request, namespace, secret_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('secrets')
 def secret_json_page(request, namespace, secret_name):
     """
     Displays the JSON representation of a specific Secret.
@@ -5,11 +5,13 @@ from django.http import HttpResponse
 from django.shortcuts import render
 from kubernetes.client import ApiException
 
-# No direct functions for StatefulSets in kubeconfig.py, using the API directly
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import iter_cached_items, list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('namespaces', 'statefulsets')
 def all_statefulsets_page(request):
     """
     Displays all StatefulSets across all namespaces in the selected Kubernetes cluster.
@@ -20,41 +22,40 @@ def all_statefulsets_page(request):
 
     try:
         # Get all namespaces
-        all_namespaces = cluster.core_v1.list_namespace().items
+        all_namespaces = list_cached_items(cluster, 'namespaces')
 
         # Get all StatefulSets across all namespaces
         try:
-            statefulsets = cluster.apps_v1.list_stateful_set_for_all_namespaces()
+            statefulsets = iter_cached_items(cluster, 'statefulsets')
         except ApiException as e:
             logger.error(f"Failed to retrieve StatefulSets: {e}")
-            statefulsets = None
+            statefulsets = []
 
         # Process statefulsets to add age and other useful information
         processed_statefulsets = []
-        if statefulsets and statefulsets.items:
-            for statefulset in statefulsets.items:
-                creation_time = statefulset.metadata.creation_timestamp
-                if creation_time:
-                    age_timedelta = datetime.now(timezone.utc) - creation_time
-                    age_hours = age_timedelta.total_seconds() / 3600
-                    age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
-                else:
-                    age_str = "N/A"
-
-                # Calculate readiness
-                ready_replicas = statefulset.status.ready_replicas or 0
-                replicas = statefulset.status.replicas or 0
-                readiness = f"{ready_replicas}/{replicas}"
-
-                processed_statefulsets.append({
-                    'name': statefulset.metadata.name,
-                    'namespace': statefulset.metadata.namespace,
-                    'replicas': replicas,
-                    'ready': ready_replicas,
-                    'readiness': readiness,
-                    'age': age_str,
-                    'details_url': f"/statefulsets/{statefulset.metadata.namespace}/{statefulset.metadata.name}/",
-                })
+        for statefulset in statefulsets:
+            creation_time = statefulset.metadata.creation_timestamp
+            if creation_time:
+                age_timedelta = datetime.now(timezone.utc) - creation_time
+                age_hours = age_timedelta.total_seconds() / 3600
+                age_str = f"{int(age_hours)}h" if age_hours < 24 else f"{int(age_hours / 24)}d"
+            else:
+                age_str = "N/A"
+
+            # Calculate readiness
+            ready_replicas = statefulset.status.ready_replicas or 0
+            replicas = statefulset.status.replicas or 0
+            readiness = f"{ready_replicas}/{replicas}"
+
+            processed_statefulsets.append({
+                'name': statefulset.metadata.name,
+                'namespace': statefulset.metadata.namespace,
+                'replicas': replicas,
+                'ready': ready_replicas,
+                'readiness': readiness,
+                'age': age_str,
+                'details_url': f"/statefulsets/{statefulset.metadata.namespace}/{statefulset.metadata.name}/",
+            })
 
         kubectl_command = {
             'get': "kubectl get statefulsets --all-namespaces",
@@ -68,7 +69,6 @@ def all_statefulsets_page(request):
 
         context = {
             'namespaces': all_namespaces,
-            'statefulsets': statefulsets.items if statefulsets else [],
             'processed_statefulsets': processed_statefulsets,
             'kubectl_command': kubectl_command,
         }
@@ -218,6 +218,7 @@ def statefulset_details_page(request, namespace, statefulset_name):
         return HttpResponse(error_message, status=500)
 
 
+@conditional_on_lists('statefulsets')
 def statefulset_json_page(request, namespace, statefulset_name):
     """
     Displays the JSON representation of a specific StatefulSet.
@@ -5,10 +5,13 @@ from django.shortcuts import render
 from django.http import JsonResponse
 from kubernetes.client.exceptions import ApiException
 
+from appConfig.conditional import conditional_on_lists
+from appConfig.kubeconfig import list_cached_items
 from appConfig.settings import logger
 from appConfig.utils import get_cluster_client
 
 
+@conditional_on_lists('storageclasses')
 def all_storage_classes_page(request):
     """
     Renders the page displaying all storage classes.
@@ -20,8 +23,8 @@ def all_storage_classes_page(request):
 
         # Retrieve storage classes
         try:
-            storage_classes = cluster.storage_v1.list_storage_class()
-            logger.info(f"Retrieved {len(storage_classes.items)} storage classes")
+            storage_classes = list_cached_items(cluster, 'storageclasses')
+            logger.info(f"Retrieved {len(storage_classes)} storage classes")
         except ApiException as e:
             logger.error(f"Failed to retrieve storage classes: {e}")
             return render(request, 'kubeStorageClasses/all_storage_classes.html', 
@@ -29,7 +32,7 @@ def all_storage_classes_page(request):
 
         # Process storage classes
         all_storage_classes_data = []
-        for sc in storage_classes.items:
+        for sc in storage_classes:
             name = sc.metadata.name
             provisioner = sc.provisioner
             reclaim_policy = sc.reclaim_policy or "Delete"
@@ -45,9 +48,6 @@ def all_storage_classes_page(request):
                 'details_url': f"/storageclasses/{name}/",
             })
 
-        # Convert to JSON for JavaScript
-        storage_classes_data_json = json.dumps(all_storage_classes_data)
-
         # Kubectl commands
         kubectl_commands = {
             'get_storage_classes': 'kubectl get storageclasses',
@@ -58,7 +58,6 @@ def all_storage_classes_page(request):
 
         return render(request, 'kubeStorageClasses/all_storage_classes.html', {
             'storage_classes_data': all_storage_classes_data,
-            'storage_classes_data_json': storage_classes_data_json,
             'kubectl_commands': kubectl_commands,
         })
 
@@ -124,6 +123,7 @@ def storage_class_details_page(request, storage_class_name):
                       {'error': f"An error occurred: {e}"})
 
 
+@conditional_on_lists('storageclasses')
 def storage_class_json_page(request, storage_class_name):
     """
     Returns the JSON representation of a storage class.
@@ -1,3 +1,20 @@
+// Tabulator table whose rows are paged, sorted and filtered by a JSON endpoint.
+// Defined outside DOMContentLoaded so page scripts can call it from their own listeners.
+window.createRemoteTable = function (selector, ajaxURL, options) {
+    return new Tabulator(selector, Object.assign({
+        ajaxURL: ajaxURL,
+        layout: "fitColumns",
+        responsiveLayout: "collapse",
+        pagination: true,
+        paginationMode: "remote",
+        sortMode: "remote",
+        filterMode: "remote",
+        paginationSize: 25,
+        paginationSizeSelector: [10, 25, 50, 100],
+        paginationCounter: "rows",
+    }, options));
+};
+
 document.addEventListener("DOMContentLoaded", function () {
     // Initialize Bootstrap Tooltips
     var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
@@ -155,7 +172,19 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     });
     
-    // Initialize WebSocket for real-time updates if available
+    // Initialize WebSocket for real-time updates if available.
+    // The server sends a snapshot followed by ADDED/MODIFIED/DELETED deltas; the last seen
+    // resourceVersion is sent on reconnect so only missed changes are replayed.
+    const watchState = {
+        resourceVersion: null,
+        resources: new Map(),
+    };
+
+    function resourceKey(resource) {
+        const metadata = resource.metadata || {};
+        return `${metadata.namespace || ''}/${metadata.name}`;
+    }
+
     function initWebSocket() {
         // Check if the page has a data attribute for real-time updates
         const realTimeContainer = document.querySelector('[data-realtime="true"]');
@@ -170,23 +199,22 @@ document.addEventListener("DOMContentLoaded", function () {
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
         const wsUrl = `${protocol}//${window.location.host}/ws/${resourceType}/`;
         const socket = new WebSocket(wsUrl);
+        let snapshotComplete = true;
         
         // Connection opened
         socket.addEventListener('open', (event) => {
             console.log('WebSocket connected for', resourceType);
-            // Send initial message with namespace filter if applicable
+            const message = {
+                action: 'subscribe',
+                resourceType: resourceType,
+            };
             if (namespace) {
-                socket.send(JSON.stringify({
-                    action: 'subscribe',
-                    resourceType: resourceType,
-                    namespace: namespace
-                }));
-            } else {
-                socket.send(JSON.stringify({
-                    action: 'subscribe',
-                    resourceType: resourceType
-                }));
+                message.namespace = namespace;
             }
+            if (watchState.resourceVersion) {
+                message.resourceVersion = watchState.resourceVersion;
+            }
+            socket.send(JSON.stringify(message));
         });
         
         // Listen for messages
@@ -195,8 +223,33 @@ document.addEventListener("DOMContentLoaded", function () {
                 const data = JSON.parse(event.data);
                 
                 // Handle different types of updates
-                if (data.type === 'update' && data.resourceType === resourceType) {
-                    updateResourceDisplay(data.resources);
+                if (data.type === 'snapshot') {
+                    if (snapshotComplete) {
+                        watchState.resources.clear();
+                        snapshotComplete = false;
+                    }
+                    data.resources.forEach(resource => watchState.resources.set(resourceKey(resource), resource));
+                    watchState.resourceVersion = data.resourceVersion;
+                    if (data.complete) {
+                        snapshotComplete = true;
+                        updateResourceDisplay(Array.from(watchState.resources.values()));
+                    }
+                } else if (data.type === 'delta') {
+                    const key = resourceKey(data.resource);
+                    if (data.eventType === 'DELETED') {
+                        watchState.resources.delete(key);
+                    } else {
+                        watchState.resources.set(key, data.resource);
+                    }
+                    watchState.resourceVersion = data.resourceVersion;
+                    document.dispatchEvent(new CustomEvent('kube:delta', {detail: data}));
+                    updateResourceDisplay(Array.from(watchState.resources.values()));
+                } else if (data.type === 'bookmark') {
+                    watchState.resourceVersion = data.resourceVersion;
+                } else if (data.type === 'resync') {
+                    // Our resourceVersion expired; a fresh snapshot follows
+                    watchState.resourceVersion = null;
+                    snapshotComplete = true;
                 } else if (data.type === 'error') {
                     console.error('WebSocket error:', data.message);
                 }
@@ -208,7 +261,7 @@ document.addEventListener("DOMContentLoaded", function () {
         // Connection closed
         socket.addEventListener('close', (event) => {
             console.log('WebSocket disconnected');
-            // Attempt to reconnect after a delay
+            // Attempt to reconnect after a delay, resuming from the last resourceVersion
             setTimeout(initWebSocket, 5000);
         });
         
@@ -221,11 +274,8 @@ document.addEventListener("DOMContentLoaded", function () {
     
     // Function to update resource display based on WebSocket data
     function updateResourceDisplay(resources) {
-        // This function will be implemented based on the specific resource type
-        // and how it's displayed in the UI
-        console.log('Received resource update:', resources);
-        
-        // Example implementation for updating a Tabulator table
+        // Pages with a local table named #resources-table get the full current list;
+        // other pages can listen for the 'kube:delta' document event instead.
         const table = Tabulator.findTable('#resources-table')[0];
         if (table) {
             table.replaceData(resources);